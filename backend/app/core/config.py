@@ -1,14 +1,68 @@
 import os
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = os.getenv("DATABASE_URL")
+    # Асинхронный движок (asyncpg + AsyncSession) и асинхронные версии эндпоинтов
+    DB_ASYNC: bool = False
+    
+    # Пул соединений (на один воркер)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 300
+    # Проверка соединения при каждой выдаче из пула (лишний запрос на каждую выдачу)
+    DB_POOL_PRE_PING: bool = False
+    # Без DB_POOL_PRE_PING: проверка только после простоя дольше N секунд, 0 - без проверки
+    DB_POOL_PING_IDLE_SECONDS: int = 30
+    # Совместимость с PgBouncer в режиме transaction: без серверных prepared statements
+    DB_PGBOUNCER: bool = False
     
     # JWT
     SECRET_KEY: str = "your-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    
+    # Пароли: bcrypt, argon2 (нужен пакет argon2-cffi) или pbkdf2_sha256
+    PASSWORD_HASH_SCHEME: str = "bcrypt"
+    # Стоимость (log2 раундов для bcrypt, раунды для pbkdf2/argon2); None - по умолчанию passlib
+    PASSWORD_HASH_ROUNDS: Optional[int] = None
+    # Потоки для хеширования (0 - по числу ядер) и предел ожидающих проверок
+    PASSWORD_HASH_WORKERS: int = 0
+    PASSWORD_HASH_MAX_PENDING: int = 32
+    
+    # Кеш версий токенов пользователей (отзыв access-токенов доходит до воркеров за TTL)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000
+    
+    # Availability
+    # Проверять занятость по индексу room_nights вместо сканирования бронирований
+    USE_OCCUPANCY_INDEX: bool = True
+    
+    # Кеш ответов публичных эндпоинтов отелей: memory или redis (нужен пакет redis и RESPONSE_CACHE_URL)
+    RESPONSE_CACHE_BACKEND: str = "memory"
+    RESPONSE_CACHE_URL: Optional[str] = None
+    RESPONSE_CACHE_TTL_SECONDS: int = 300
+    RESPONSE_CACHE_MAX_ENTRIES: int = 10000
+    
+    # Поиск отелей по тексту: минимальная схожесть слов (pg_trgm) для совпадения с опечаткой
+    SEARCH_SIMILARITY_THRESHOLD: float = 0.4
+    
+    # Метрики: /metrics только для локальных клиентов, если не разрешено явно;
+    # заголовок Server-Timing с временем ответа и БД в каждом ответе
+    METRICS_ALLOW_REMOTE: bool = False
+    SERVER_TIMING_HEADER: bool = True
+    
+    # Лог медленных запросов (None - выключен), EXPLAIN (ANALYZE, BUFFERS) для медленных SELECT
+    SLOW_QUERY_MS: Optional[float] = None
+    SLOW_REQUEST_MS: Optional[float] = None
+    SLOW_QUERY_EXPLAIN: bool = False
+    # Профилирование запроса cProfile по заголовку от администратора; пустая строка - выключено
+    PROFILE_HEADER: str = "X-Profile"
+    PROFILE_TOP_FUNCTIONS: int = 40
     
     class Config:
         env_file = ".env"
@@ -1,22 +1,23 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 import time
+import uuid
 import logging
 
 from app.core.config import settings
+from app.core.instrumentation import instrument_queries
+from app.core.pool import PoolMetrics, instrument_pool, install_idle_ping, timed_pool_class
 
 logger = logging.getLogger(__name__)
 
 # Retry логика для подключения к БД
-def create_engine_with_retry(database_url, max_retries=5, delay=5):
+def create_engine_with_retry(database_url, max_retries=5, delay=5, **engine_options):
     for attempt in range(max_retries):
         try:
-            engine = create_engine(
-                database_url,
-                pool_pre_ping=True,  # Проверяет соединение перед использованием
-                pool_recycle=300,    # Переподключается каждые 5 минут
-            )
+            engine = create_engine(database_url, **engine_options)
             # Тестируем соединение
             with engine.connect() as conn:
                 pass
@@ -31,16 +32,77 @@ def create_engine_with_retry(database_url, max_retries=5, delay=5):
                 logger.error("💥 All database connection attempts failed")
                 raise
 
+# Параметры пула из настроек
+def get_pool_options():
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+# Подключает статистику пула и запросов и проверку простаивающих соединений
+def configure_pool(engine, metrics):
+    instrument_pool(engine, metrics)
+    instrument_queries(engine)
+    if not settings.DB_POOL_PRE_PING and settings.DB_POOL_PING_IDLE_SECONDS > 0:
+        install_idle_ping(engine, settings.DB_POOL_PING_IDLE_SECONDS)
+
+# Приводит URL синхронного драйвера к asyncpg
+def get_async_database_url(database_url):
+    url = make_url(database_url).set(drivername="postgresql+asyncpg")
+    # asyncpg не понимает sslmode, вместо него используется ssl
+    if "sslmode" in url.query:
+        url = url.difference_update_query(["sslmode"]).update_query_dict({"ssl": url.query["sslmode"]})
+    if settings.DB_PGBOUNCER:
+        # PgBouncer в режиме transaction не переносит кеш prepared statements между соединениями
+        url = url.update_query_dict({"prepared_statement_cache_size": "0"})
+    return url
+
+pool_metrics = {"sync": PoolMetrics(), "async": PoolMetrics()}
+
 # Создаем engine с retry логикой
-engine = create_engine_with_retry(settings.DATABASE_URL)
+engine = create_engine_with_retry(
+    settings.DATABASE_URL,
+    poolclass=timed_pool_class(QueuePool, pool_metrics["sync"]),
+    **get_pool_options()
+)
+configure_pool(engine, pool_metrics["sync"])
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Асинхронный engine создается только если он включен в настройках
+async_engine = None
+AsyncSessionLocal = None
+if settings.DB_ASYNC:
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+    connect_args = {}
+    if settings.DB_PGBOUNCER:
+        connect_args = {
+            "statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+    async_engine = create_async_engine(
+        get_async_database_url(settings.DATABASE_URL),
+        connect_args=connect_args,
+        poolclass=timed_pool_class(AsyncAdaptedQueuePool, pool_metrics["async"]),
+        **get_pool_options()
+    )
+    configure_pool(async_engine.sync_engine, pool_metrics["async"])
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
-# Dependency для получения сессии БД
+# Dependency для получения сессии БД (соединение из пула берется при первом запросе)
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Dependency для получения асинхронной сессии БД
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
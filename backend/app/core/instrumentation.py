@@ -0,0 +1,147 @@
+"""Учет SQL-запросов в рамках HTTP-запроса.
+
+Middleware создает RequestStats и кладет его в contextvar; обработчики событий
+before/after_cursor_execute engine добавляют к нему число запросов и время в БД.
+Возвращенные строки не считаются: cursor.rowcount у SELECT в asyncpg всегда -1,
+а в psycopg2 достоверен только после чтения всего результата.
+
+Контекст копируется в потоки threadpool (синхронные эндпоинты) и в greenlet
+асинхронного engine, а сам объект общий, поэтому учитываются запросы из любого режима.
+Запросы вне HTTP-запроса (старт, фоновые задачи) не считаются.
+
+Запросы дольше SLOW_QUERY_MS пишутся в лог с текстом SQL, типами параметров (без значений)
+и маршрутом, а при SLOW_QUERY_EXPLAIN - и с планом EXPLAIN (ANALYZE, BUFFERS). План
+строится повторным выполнением запроса в savepoint на том же соединении, поэтому
+только для SELECT и ценой удвоения времени медленных запросов.
+"""
+import logging
+import re
+import time
+from contextvars import ContextVar, Token
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Изменяющие данные CTE: такой WITH-запрос нельзя выполнять повторно ради плана
+_DATA_MODIFYING = re.compile(r"\b(INSERT\s+INTO|DELETE\s+FROM|UPDATE\s+\S+\s+SET)\b", re.IGNORECASE)
+
+class RequestStats:
+    """Работа с БД в одном HTTP-запросе"""
+    __slots__ = ("scope", "queries", "db_time", "slowest_query", "slowest_query_time")
+
+    def __init__(self, scope: Dict[str, Any]):
+        self.scope = scope
+        self.queries = 0
+        self.db_time = 0.0
+        self.slowest_query: Optional[str] = None
+        self.slowest_query_time = 0.0
+
+    @property
+    def route(self) -> str:
+        """Метод и шаблон пути маршрута (или путь, если маршрут еще не выбран)"""
+        route = self.scope.get("route")
+        return f'{self.scope.get("method")} {getattr(route, "path", None) or self.scope.get("path")}'
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+def start_request(scope: Dict[str, Any]) -> Token:
+    return _request_stats.set(RequestStats(scope))
+
+def finish_request(token: Token) -> RequestStats:
+    stats = _request_stats.get()
+    _request_stats.reset(token)
+    return stats
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _request_stats.get()
+
+def _compact(statement: str) -> str:
+    return " ".join(statement.split())
+
+def _value_shape(value: Any) -> str:
+    if value is None:
+        return "NULL"
+    if isinstance(value, (list, tuple, str, bytes)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+def parameter_shapes(parameters: Any, executemany: bool = False) -> Any:
+    """Типы и длины параметров без самих значений (в лог не попадают пароли и персональные данные)"""
+    if executemany:
+        rows = list(parameters)
+        return f"{len(rows)} x {parameter_shapes(rows[0]) if rows else '-'}"
+    if isinstance(parameters, dict):
+        return {name: _value_shape(value) for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_value_shape(value) for value in parameters]
+    return _value_shape(parameters)
+
+def _explainable(statement: str, context) -> bool:
+    if not statement.lstrip()[:6].upper().startswith(("SELECT", "WITH")):
+        return False
+    if context is not None and context.execution_options.get("stream_results"):
+        # Результаты серверного курсора еще не прочитаны, второй запрос на соединении им помешает
+        return False
+    return not _DATA_MODIFYING.search(statement)
+
+def explain_analyze(conn, statement: str, parameters) -> str:
+    """План выполнения запроса; ошибка EXPLAIN откатывается к savepoint и не ломает транзакцию"""
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            cursor.execute("EXPLAIN (ANALYZE, BUFFERS) " + statement, parameters)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+        except Exception as exc:
+            cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            plan = f"EXPLAIN failed: {exc}"
+        cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+        return plan
+    finally:
+        cursor.close()
+
+def _log_slow_query(conn, statement: str, parameters, context, executemany: bool,
+                    elapsed: float, stats: Optional[RequestStats]) -> None:
+    message = "Slow query %.1f ms in %s: %s; parameters: %s"
+    args = [elapsed * 1000, stats.route if stats is not None else "-",
+            _compact(statement), parameter_shapes(parameters, executemany)]
+    if settings.SLOW_QUERY_EXPLAIN and not executemany and _explainable(statement, context):
+        try:
+            plan = explain_analyze(conn, statement, parameters)
+        except Exception as exc:
+            plan = f"EXPLAIN failed: {exc}"
+        message += "\n%s"
+        args.append(plan)
+    logger.warning(message, *args)
+
+def instrument_queries(engine) -> None:
+    """Подключает учет запросов к engine (для async engine передается sync_engine)"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        stats = _request_stats.get()
+        if settings.SLOW_QUERY_MS is not None and elapsed * 1000 >= settings.SLOW_QUERY_MS:
+            _log_slow_query(conn, statement, parameters, context, executemany, elapsed, stats)
+        if stats is None:
+            return
+        stats.queries += 1
+        stats.db_time += elapsed
+        if elapsed > stats.slowest_query_time:
+            stats.slowest_query = statement
+            stats.slowest_query_time = elapsed
+
+    @event.listens_for(engine, "handle_error")
+    def _on_error(exception_context):
+        # after_cursor_execute не вызывается для упавшего запроса
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("query_started"):
+            connection.info["query_started"].pop()
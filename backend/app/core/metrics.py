@@ -0,0 +1,111 @@
+import threading
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# Границы бакетов по умолчанию (секунды)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Histogram:
+    """Потокобезопасная гистограмма с фиксированными бакетами"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> Dict[str, object]:
+        """Кумулятивные счетчики по бакетам, как в Prometheus"""
+        with self._lock:
+            counts = list(self._counts)
+            total_sum = self._sum
+            total_count = self._count
+
+        cumulative = {}
+        running = 0
+        for bound, count in zip(self.buckets, counts):
+            running += count
+            cumulative[str(bound)] = running
+        cumulative["+Inf"] = total_count
+        return {"buckets": cumulative, "count": total_count, "sum": total_sum}
+
+# Границы бакетов для числа SQL-запросов на HTTP-запрос
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in labels.items()
+    )
+    return "{" + ",".join(escaped) + "}"
+
+def histogram_lines(name: str, help_text: str, series: Iterable[Tuple[Dict[str, str], Histogram]]) -> List[str]:
+    """Гистограммы в текстовом формате Prometheus (по одной на набор меток)"""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for labels, histogram in series:
+        snapshot = histogram.snapshot()
+        for bound, count in snapshot["buckets"].items():
+            lines.append(f"{name}_bucket{_format_labels({**labels, 'le': bound})} {count}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {snapshot['sum']}")
+        lines.append(f"{name}_count{_format_labels(labels)} {snapshot['count']}")
+    return lines
+
+def counter_lines(name: str, help_text: str, series: Iterable[Tuple[Dict[str, str], float]]) -> List[str]:
+    """Счетчики в текстовом формате Prometheus"""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+    for labels, value in series:
+        lines.append(f"{name}{_format_labels(labels)} {value}")
+    return lines
+
+class RouteMetrics:
+    """Статистика одного маршрута с одним кодом ответа"""
+
+    def __init__(self):
+        self.duration = Histogram()
+        self.db_duration = Histogram()
+        self.queries = Histogram(QUERY_COUNT_BUCKETS)
+
+class RequestMetrics:
+    """Время ответа и работа с БД по маршрутам (шаблон пути, а не конкретный URL)"""
+
+    def __init__(self):
+        self._routes: Dict[Tuple[str, str, str], RouteMetrics] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, method: str, route: str, status: int, duration: float,
+                queries: int, db_time: float) -> None:
+        key = (method, route, str(status))
+        with self._lock:
+            metrics = self._routes.get(key)
+            if metrics is None:
+                metrics = self._routes[key] = RouteMetrics()
+        metrics.duration.observe(duration)
+        metrics.db_duration.observe(db_time)
+        metrics.queries.observe(queries)
+
+    def prometheus_lines(self) -> List[str]:
+        with self._lock:
+            routes = [
+                ({"method": method, "route": route, "status": status}, metrics)
+                for (method, route, status), metrics in sorted(self._routes.items())
+            ]
+        return (
+            histogram_lines("http_request_duration_seconds", "HTTP request latency",
+                            [(labels, metrics.duration) for labels, metrics in routes])
+            + histogram_lines("http_request_db_duration_seconds", "Time spent in SQL statements per HTTP request",
+                              [(labels, metrics.db_duration) for labels, metrics in routes])
+            + histogram_lines("http_request_db_queries", "SQL statements executed per HTTP request",
+                              [(labels, metrics.queries) for labels, metrics in routes])
+        )
+
+request_metrics = RequestMetrics()
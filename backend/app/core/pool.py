@@ -0,0 +1,108 @@
+import time
+from typing import Any, Dict, List
+
+from sqlalchemy import event, exc
+
+from app.core.metrics import Histogram, counter_lines, histogram_lines
+
+class PoolMetrics:
+    """Статистика пула соединений одного engine"""
+
+    def __init__(self):
+        self.checkout_wait = Histogram()
+        self.connect_latency = Histogram()
+        self.checkouts = 0
+        self.invalidations = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "checkouts": self.checkouts,
+            "invalidations": self.invalidations,
+            "checkout_wait_seconds": self.checkout_wait.snapshot(),
+            "connect_latency_seconds": self.connect_latency.snapshot(),
+        }
+
+def instrument_pool(engine, metrics: PoolMetrics) -> None:
+    """Подключает сбор статистики к событиям пула (для async engine передается sync_engine)"""
+
+    @event.listens_for(engine, "do_connect")
+    def _before_connect(dialect, conn_rec, cargs, cparams):
+        conn_rec.info["connect_started"] = time.perf_counter()
+
+    @event.listens_for(engine, "connect")
+    def _after_connect(dbapi_connection, connection_record):
+        started = connection_record.info.pop("connect_started", None)
+        if started is not None:
+            metrics.connect_latency.observe(time.perf_counter() - started)
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.checkouts += 1
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.invalidations += 1
+
+def timed_pool_class(pool_class, metrics: PoolMetrics):
+    """Подкласс пула, измеряющий ожидание соединения при каждой выдаче.
+
+    Сессия берет соединение при первом запросе, поэтому запросы без обращения
+    к БД не занимают пул, а ожидание все равно попадает в checkout_wait.
+    """
+
+    class TimedPool(pool_class):
+        def connect(self):
+            started = time.perf_counter()
+            try:
+                return super().connect()
+            finally:
+                metrics.checkout_wait.observe(time.perf_counter() - started)
+
+    # В /health/pool остается имя исходного класса пула
+    TimedPool.__name__ = TimedPool.__qualname__ = pool_class.__name__
+    return TimedPool
+
+def install_idle_ping(engine, idle_seconds: int) -> None:
+    """Проверяет соединение при выдаче, только если оно простаивало дольше idle_seconds.
+
+    В отличие от pool_pre_ping не добавляет лишний запрос к каждой выдаче соединения.
+    """
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        connection_record.info["last_checkin"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        last_checkin = connection_record.info.get("last_checkin")
+        if last_checkin is None or time.monotonic() - last_checkin < idle_seconds:
+            return
+        try:
+            engine.dialect.do_ping(dbapi_connection)
+        except Exception:
+            # Пул отбросит соединение и выдаст новое
+            raise exc.DisconnectionError()
+
+def pool_status(engine) -> Dict[str, Any]:
+    """Текущее состояние пула: размер, занятые и overflow-соединения"""
+    pool = engine.pool
+    status = {"pool_class": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        if callable(method):
+            status[name] = method()
+    return status
+
+def pool_prometheus_lines(pools: Dict[str, PoolMetrics]) -> List[str]:
+    """Статистика пулов в текстовом формате Prometheus, метка pool - sync или async"""
+    series = [({"pool": name}, metrics) for name, metrics in pools.items()]
+    return (
+        histogram_lines("db_pool_checkout_wait_seconds", "Time waiting for a pooled connection",
+                        [(labels, metrics.checkout_wait) for labels, metrics in series])
+        + histogram_lines("db_pool_connect_latency_seconds", "Time to open a new database connection",
+                          [(labels, metrics.connect_latency) for labels, metrics in series])
+        + counter_lines("db_pool_checkouts_total", "Connections checked out of the pool",
+                        [(labels, metrics.checkouts) for labels, metrics in series])
+        + counter_lines("db_pool_invalidations_total", "Pooled connections invalidated",
+                        [(labels, metrics.invalidations) for labels, metrics in series])
+    )
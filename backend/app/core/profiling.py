@@ -0,0 +1,84 @@
+"""Профилирование отдельного запроса по заголовку.
+
+Middleware создает RequestProfile для запроса с заголовком PROFILE_HEADER от администратора,
+а обертка эндпоинтов (profile_endpoints) выполняет тело эндпоинта под cProfile в том
+потоке, где оно работает: синхронные эндпоинты - в потоке threadpool, асинхронные - в
+event loop (тогда в профиль попадают и другие корутины, выполнявшиеся во время await).
+Отчет (функции по суммарному времени) пишется в лог. В процессе профилируется не больше
+одного запроса одновременно: cProfile - один на поток, остальные запросы выполняются без него.
+"""
+import cProfile
+import functools
+import inspect
+import io
+import pstats
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Iterable, List, Optional
+
+from fastapi.routing import APIRoute
+
+class RequestProfile:
+    """Профили cProfile всех частей одного запроса"""
+
+    def __init__(self):
+        self.profiles: List[cProfile.Profile] = []
+
+    @contextmanager
+    def run(self):
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            self.profiles.append(profile)
+
+    def report(self, limit: int) -> str:
+        if not self.profiles:
+            return "no endpoint code was profiled"
+        stream = io.StringIO()
+        stats = pstats.Stats(*self.profiles, stream=stream)
+        stats.sort_stats("cumulative").print_stats(limit)
+        return stream.getvalue()
+
+_active = threading.Lock()
+_request_profile: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+
+def start_profile() -> Optional[Token]:
+    """Включает профилирование текущего запроса; None, если уже профилируется другой запрос"""
+    if not _active.acquire(blocking=False):
+        return None
+    return _request_profile.set(RequestProfile())
+
+def finish_profile(token: Token) -> RequestProfile:
+    profile = _request_profile.get()
+    _request_profile.reset(token)
+    _active.release()
+    return profile
+
+def _profiled(endpoint):
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            profile = _request_profile.get()
+            if profile is None:
+                return await endpoint(*args, **kwargs)
+            with profile.run():
+                return await endpoint(*args, **kwargs)
+    else:
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            profile = _request_profile.get()
+            if profile is None:
+                return endpoint(*args, **kwargs)
+            with profile.run():
+                return endpoint(*args, **kwargs)
+    return wrapper
+
+def profile_endpoints(routes: Iterable) -> None:
+    """Оборачивает эндпоинты маршрутов; вызывается после подключения всех роутеров"""
+    for route in routes:
+        if isinstance(route, APIRoute):
+            route.dependant.call = _profiled(route.dependant.call)
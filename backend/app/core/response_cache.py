@@ -0,0 +1,118 @@
+import hashlib
+import threading
+from typing import Optional, Tuple
+
+from fastapi import Request, Response
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+class MemoryCacheBackend:
+    """In-process LRU-кеш (по умолчанию, отдельный на каждый воркер)"""
+
+    def __init__(self, max_entries: int):
+        self._cache = TTLCache(max_size=max_entries)
+        # Счетчики версий хранятся отдельно, чтобы их не вытеснили записи
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._cache.get(key)
+
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        self._cache.set(key, value, ttl=ttl)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._versions[key] = self._versions.get(key, 0) + 1
+            return self._versions[key]
+
+    def get_int(self, key: str) -> int:
+        return self._versions.get(key, 0)
+
+class RedisCacheBackend:
+    """Общий для всех воркеров кеш в Redis (нужен пакет redis)"""
+
+    def __init__(self, url: Optional[str], client=None):
+        if client is None:
+            try:
+                import redis
+            except ImportError:
+                raise RuntimeError("RESPONSE_CACHE_BACKEND=redis requires the redis package (pip install redis)")
+            if not url:
+                raise RuntimeError("RESPONSE_CACHE_BACKEND=redis requires RESPONSE_CACHE_URL")
+            client = redis.Redis.from_url(url)
+        self._client = client
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._client.get(key)
+
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        self._client.set(key, value, ex=ttl)
+
+    def incr(self, key: str) -> int:
+        return self._client.incr(key)
+
+    def get_int(self, key: str) -> int:
+        value = self._client.get(key)
+        return int(value) if value else 0
+
+class CachedResponse:
+    def __init__(self, etag: str, body: bytes):
+        self.etag = etag
+        self.body = body
+
+    def to_response(self, request: Request) -> Response:
+        """Отдает 304, если клиент прислал актуальный ETag"""
+        headers = {"ETag": self.etag, "Cache-Control": "no-cache"}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            if "*" in candidates or self.etag in candidates:
+                return Response(status_code=304, headers=headers)
+        return Response(content=self.body, media_type="application/json", headers=headers)
+
+class ResponseCache:
+    """Кеш готовых JSON-ответов с инвалидацией по пространствам имен.
+
+    У каждого пространства (например, hotel:<id>) есть счетчик версии, входящий в ключ.
+    Инвалидация увеличивает счетчик, и старые записи просто перестают читаться до истечения TTL.
+    """
+
+    def __init__(self, backend, ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+
+    def _key(self, namespace: str, key: str) -> str:
+        version = self.backend.get_int(f"version:{namespace}")
+        return f"response:{namespace}:v{version}:{key}"
+
+    def get(self, namespace: str, key: str) -> Tuple[Optional[CachedResponse], str]:
+        """Возвращает запись (или None) и версионированный ключ для последующего set.
+
+        Ключ фиксируется до чтения из БД: если между чтением и записью в кеш произойдет
+        инвалидация, устаревший ответ сохранится под старой версией и не будет прочитан.
+        """
+        slot = self._key(namespace, key)
+        packed = self.backend.get(slot)
+        if packed is None:
+            return None, slot
+        etag, _, body = packed.partition(b"\n")
+        return CachedResponse(etag.decode(), body), slot
+
+    def set(self, slot: str, body: bytes) -> CachedResponse:
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        self.backend.set(slot, etag.encode() + b"\n" + body, self.ttl)
+        return CachedResponse(etag, body)
+
+    def invalidate(self, namespace: str) -> None:
+        self.backend.incr(f"version:{namespace}")
+
+def build_response_cache() -> ResponseCache:
+    if settings.RESPONSE_CACHE_BACKEND == "redis":
+        backend = RedisCacheBackend(settings.RESPONSE_CACHE_URL)
+    else:
+        backend = MemoryCacheBackend(settings.RESPONSE_CACHE_MAX_ENTRIES)
+    return ResponseCache(backend, ttl=settings.RESPONSE_CACHE_TTL_SECONDS)
+
+response_cache = build_response_cache()
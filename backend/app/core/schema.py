@@ -0,0 +1,108 @@
+"""Обновление схемы существующих баз при старте приложения.
+
+create_all создает только отсутствующие таблицы (вместе с их индексами), а init-scripts
+выполняются только на пустом томе PostgreSQL. Изменения уже существующих таблиц -
+колонки, ограничения, индексы и расширения - перечислены в SCHEMA_UPGRADES, как и
+заполнение новых производных таблиц (индекс занятости, счетчики популярности)
+из уже существующих бронирований.
+
+У каждого изменения есть проверка: DDL выполняется, только если изменение еще не
+применено, поэтому обычный старт не берет блокировок на таблицы. Все выполняется
+в одной транзакции под advisory-блокировкой: воркеры не обновляют схему одновременно.
+"""
+import logging
+from typing import NamedTuple, Tuple, Union
+
+from sqlalchemy import text
+from sqlalchemy.sql import Executable
+
+from app.modules.bookings.models import ACTIVE_BOOKING_STATUSES
+from app.modules.bookings.occupancy import room_nights_backfill_statement
+from app.modules.hotels.popularity import POPULAR_BOOKING_STATUSES, destination_popularity_rebuild_statements
+
+logger = logging.getLogger(__name__)
+
+# Ключ pg_advisory_xact_lock обновления схемы
+SCHEMA_LOCK_KEY = 7_316_224
+
+class SchemaUpgrade(NamedTuple):
+    description: str
+    check: str                    # SELECT, возвращающий true, если изменение уже применено
+    statements: Tuple[Union[str, Executable], ...]
+
+def index_upgrade(name: str, statement: str) -> SchemaUpgrade:
+    return SchemaUpgrade(f"index {name}", f"SELECT to_regclass('{name}') IS NOT NULL", (statement,))
+
+def not_null_created_at(table: str) -> SchemaUpgrade:
+    """created_at обязателен: по (created_at, id) строятся курсоры страниц"""
+    return SchemaUpgrade(
+        f"{table}.created_at NOT NULL",
+        "SELECT NOT EXISTS (SELECT 1 FROM information_schema.columns "
+        f"WHERE table_schema = current_schema() AND table_name = '{table}' "
+        "AND column_name = 'created_at' AND is_nullable = 'YES')",
+        (
+            f"UPDATE {table} SET created_at = COALESCE(updated_at, CURRENT_TIMESTAMP) WHERE created_at IS NULL",
+            f"ALTER TABLE {table} ALTER COLUMN created_at SET DEFAULT CURRENT_TIMESTAMP, "
+            "ALTER COLUMN created_at SET NOT NULL",
+        )
+    )
+
+def backfill_upgrade(table: str, statuses: Tuple[str, ...], statements) -> SchemaUpgrade:
+    """Заполнение пустой производной таблицы, если есть бронирования в статусах statuses"""
+    status_list = ", ".join(f"'{status}'" for status in statuses)
+    return SchemaUpgrade(
+        f"backfill {table}",
+        f"SELECT EXISTS (SELECT 1 FROM {table}) "
+        f"OR NOT EXISTS (SELECT 1 FROM bookings WHERE status IN ({status_list}))",
+        tuple(statements)
+    )
+
+SCHEMA_UPGRADES = [
+    # Версия токенов пользователя: выход на всех устройствах отзывает выданные access-токены
+    SchemaUpgrade(
+        "users.token_version",
+        "SELECT EXISTS (SELECT 1 FROM information_schema.columns "
+        "WHERE table_schema = current_schema() AND table_name = 'users' AND column_name = 'token_version')",
+        ("ALTER TABLE users ADD COLUMN IF NOT EXISTS token_version integer NOT NULL DEFAULT 0",)
+    ),
+    # Таблицы моделей на app.shared.models.BaseModel
+    *(not_null_created_at(table) for table in ("users", "hotels", "room_types", "rooms", "bookings", "payments", "pricing")),
+    # Постраничная выдача по (created_at, id)
+    index_upgrade("idx_users_created", "CREATE INDEX IF NOT EXISTS idx_users_created ON users (created_at, id)"),
+    index_upgrade("idx_bookings_guest_created",
+                  "CREATE INDEX IF NOT EXISTS idx_bookings_guest_created ON bookings (guest_id, created_at, id)"),
+    index_upgrade("idx_bookings_room_created",
+                  "CREATE INDEX IF NOT EXISTS idx_bookings_room_created ON bookings (room_id, created_at, id)"),
+    # Текстовый поиск: расширение нужно до триграммных индексов
+    SchemaUpgrade(
+        "extension pg_trgm",
+        "SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')",
+        ("CREATE EXTENSION IF NOT EXISTS pg_trgm",)
+    ),
+    *(index_upgrade(f"idx_hotels_{column}_trgm",
+                    f"CREATE INDEX IF NOT EXISTS idx_hotels_{column}_trgm ON hotels USING gin ({column} gin_trgm_ops)")
+      for column in ("name", "city", "country", "description")),
+    # Фильтр удобств amenities @> ...
+    index_upgrade("idx_hotels_amenities",
+                  "CREATE INDEX IF NOT EXISTS idx_hotels_amenities ON hotels USING gin (amenities jsonb_path_ops)"),
+    index_upgrade("idx_room_types_amenities",
+                  "CREATE INDEX IF NOT EXISTS idx_room_types_amenities ON room_types USING gin (amenities jsonb_path_ops)"),
+    # Поиск рядом с точкой
+    index_upgrade("idx_hotels_location_gist",
+                  "CREATE INDEX IF NOT EXISTS idx_hotels_location_gist ON hotels USING gist (point(longitude, latitude))"),
+    # Без заполненного индекса занятости существующие бронирования считались бы свободными
+    backfill_upgrade("room_nights", ACTIVE_BOOKING_STATUSES, (room_nights_backfill_statement(),)),
+    # Популярные направления читаются только из счетчиков
+    backfill_upgrade("destination_popularity", POPULAR_BOOKING_STATUSES, destination_popularity_rebuild_statements()),
+]
+
+def upgrade_schema(engine) -> None:
+    """Применяет недостающие изменения SCHEMA_UPGRADES; вызывается после create_all"""
+    with engine.begin() as connection:
+        connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": SCHEMA_LOCK_KEY})
+        for upgrade in SCHEMA_UPGRADES:
+            if connection.execute(text(upgrade.check)).scalar():
+                continue
+            logger.info("Upgrading schema: %s", upgrade.description)
+            for statement in upgrade.statements:
+                connection.execute(text(statement) if isinstance(statement, str) else statement)
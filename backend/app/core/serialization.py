@@ -0,0 +1,106 @@
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Dict, Mapping, Optional, Tuple, Type, Union, get_args, get_origin
+from uuid import UUID
+
+import orjson
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+@lru_cache(maxsize=None)
+def _type_adapter(response_type: Any) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+def dump_json(response_type: Any, value: Any) -> bytes:
+    """Валидирует ORM-объекты по схеме ответа и сериализует их в JSON"""
+    adapter = _type_adapter(response_type)
+    return adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+
+_MISSING = object()
+
+def _nested_model(annotation: Any) -> Tuple[Optional[Type[BaseModel]], bool]:
+    """Вложенная схема поля (Model, Optional[Model], List[Model]) и признак списка"""
+    origin = get_origin(annotation)
+    if origin is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        return _nested_model(args[0]) if len(args) == 1 else (None, False)
+    if origin is list:
+        args = get_args(annotation)
+        model = _nested_model(args[0])[0] if args else None
+        return model, model is not None
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+    return None, False
+
+def _scalar_cast(annotation: Any) -> Optional[type]:
+    """int/float-поля приводятся явно: агрегаты SQL приходят как Decimal"""
+    if get_origin(annotation) is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        annotation = args[0] if len(args) == 1 else None
+    return annotation if annotation in (int, float) else None
+
+@lru_cache(maxsize=None)
+def _response_fields(model: Type[BaseModel]):
+    return tuple(
+        (name, field, _scalar_cast(field.annotation), *_nested_model(field.annotation))
+        for name, field in model.model_fields.items()
+    )
+
+def _to_primitive(model: Type[BaseModel], obj: Any, memo: Dict[Tuple[type, int], Any]) -> Any:
+    if obj is None:
+        return None
+    # Один и тот же номер/отель встречается во многих бронированиях списка
+    memo_key = (model, id(obj))
+    if memo_key in memo:
+        return memo[memo_key]
+
+    is_mapping = isinstance(obj, Mapping)
+    result = {}
+    for name, field, cast, nested, many in _response_fields(model):
+        value = obj.get(name, _MISSING) if is_mapping else getattr(obj, name, _MISSING)
+        if value is _MISSING:
+            value = field.get_default(call_default_factory=True)
+        if cast is not None and value is not None and type(value) is not cast:
+            value = cast(value)
+        elif nested is not None and value is not None:
+            value = [_to_primitive(nested, item, memo) for item in value] if many \
+                else _to_primitive(nested, value, memo)
+        result[name] = value
+    memo[memo_key] = result
+    return result
+
+def _orjson_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    # asyncpg возвращает собственный подкласс UUID, который orjson не знает
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError
+
+def fast_dump_json(response_type: Any, value: Any) -> bytes:
+    """Сериализует ORM-объекты или готовые словари по полям схемы ответа без валидации.
+
+    Данные уже прошли ограничения БД, поэтому модели pydantic не создаются:
+    поля схемы читаются напрямую и отдаются в orjson. Лишние ключи словарей
+    отбрасываются, отсутствующие берутся из значений по умолчанию схемы.
+    """
+    model, many = _nested_model(response_type)
+    if model is None:
+        return dump_json(response_type, value)
+    memo = {}
+    content = [_to_primitive(model, item, memo) for item in value] if many \
+        else _to_primitive(model, value, memo)
+    # OPT_UTC_Z: UTC как "Z", так же как в pydantic
+    return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_UTC_Z)
+
+def json_response(
+    response_type: Any,
+    value: Any,
+    headers: Optional[Mapping[str, str]] = None
+) -> Response:
+    """Готовый JSON-ответ для больших списков.
+
+    FastAPI не валидирует возвращенный Response повторно, поэтому response_model
+    у маршрута остается только для документации.
+    """
+    return Response(content=fast_dump_json(response_type, value), media_type="application/json", headers=headers)
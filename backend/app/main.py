@@ -1,13 +1,22 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, PlainTextResponse
+import logging
+import time
 import urllib.parse
 
-from app.core.database import engine
+from app.core.config import settings
+from app.core.database import engine, async_engine, pool_metrics
+from app.core.instrumentation import finish_request, start_request
+from app.core.metrics import request_metrics
+from app.core.pool import pool_prometheus_lines, pool_status
+from app.core.profiling import finish_profile, profile_endpoints, start_profile
+from app.core.schema import upgrade_schema
 from app.shared.models import Base
 from app.modules.auth.models import User
 from app.modules.hotels.models import Hotel, RoomType, Room, Pricing
 from app.modules.bookings.models import Booking, Payment
+from app.modules.auth.dependencies import is_admin_token
 
 # Импортируем роутеры
 from app.modules.auth.routes import router as auth_router
@@ -15,13 +24,18 @@ from app.modules.users.routes import router as users_router
 from app.modules.hotels.routes import router as hotels_router
 from app.modules.bookings.routes import router as bookings_router
 
-# Создаем таблицы
+logger = logging.getLogger(__name__)
+
+# Создаем таблицы и обновляем схему уже существующих
 Base.metadata.create_all(bind=engine)
+upgrade_schema(engine)
 
 app = FastAPI(
     title="Hotel Booking System API",
     description="Система управления бронированием номеров в отелях",
-    version="1.0.0"
+    version="1.0.0",
+    # Остальные ответы (словари и модели) сериализуются через orjson вместо json.dumps
+    default_response_class=ORJSONResponse
 )
 
 # Настройка CORS
@@ -55,6 +69,67 @@ async def url_decode_middleware(request: Request, call_next):
             content={"detail": f"Internal server error: {str(exc)}"}
         )
 
+def record_request(request: Request, status_code: int, duration: float, stats, profile) -> None:
+    """Метрики маршрута, лог медленного запроса и отчет профилировщика"""
+    # Шаблон пути маршрута, а не URL: число серий не растет с числом отелей
+    route = request.scope.get("route")
+    request_metrics.observe(
+        request.method, getattr(route, "path", "unmatched"), status_code,
+        duration, stats.queries, stats.db_time
+    )
+    if settings.SLOW_REQUEST_MS is not None and duration * 1000 >= settings.SLOW_REQUEST_MS:
+        logger.warning(
+            "Slow request %s (%s) %d in %.1f ms: %d queries, %.1f ms in DB; slowest query %.1f ms: %s",
+            stats.route, request.url.path, status_code, duration * 1000,
+            stats.queries, stats.db_time * 1000, stats.slowest_query_time * 1000,
+            " ".join((stats.slowest_query or "-").split())
+        )
+    if profile is not None:
+        logger.warning("Profile of %s (%s) %d in %.1f ms:\n%s", stats.route, request.url.path,
+                       status_code, duration * 1000, profile.report(settings.PROFILE_TOP_FUNCTIONS))
+
+# Время ответа, число SQL-запросов и время в БД по маршрутам (подключен после
+# url_decode_middleware, поэтому внешний и учитывает его). Здесь же лог медленных
+# запросов и профилирование по заголовку PROFILE_HEADER для администраторов
+@app.middleware("http")
+async def request_timing_middleware(request: Request, call_next):
+    profile_token = None
+    if settings.PROFILE_HEADER and request.headers.get(settings.PROFILE_HEADER) \
+            and is_admin_token(request.headers.get("authorization")):
+        profile_token = start_profile()
+        if profile_token is None:
+            logger.warning("Profiling of %s %s skipped: another request is being profiled",
+                           request.method, request.url.path)
+
+    token = start_request(request.scope)
+    started = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        stats = finish_request(token)
+        profile = finish_profile(profile_token) if profile_token is not None else None
+
+    if settings.SERVER_TIMING_HEADER:
+        # Заголовки уходят до тела: у потоковых ответов (выгрузки) это время до начала ответа
+        response.headers["Server-Timing"] = (
+            f'app;dur={(time.perf_counter() - started) * 1000:.1f}, '
+            f'db;dur={stats.db_time * 1000:.1f};desc="{stats.queries} queries"'
+        )
+
+    # Тело отдается уже после возврата из middleware, а запросы потоковых эндпоинтов
+    # выполняются во время его отправки (в том же RequestStats): учет - после тела
+    body_iterator = response.body_iterator
+
+    async def record_after_body():
+        try:
+            async for chunk in body_iterator:
+                yield chunk
+        finally:
+            record_request(request, response.status_code, time.perf_counter() - started, stats, profile)
+
+    response.body_iterator = record_after_body()
+    return response
+
 # Глобальный обработчик ошибок
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -63,6 +138,18 @@ async def global_exception_handler(request: Request, exc: Exception):
         content={"detail": f"Internal server error: {str(exc)}"}
     )
 
+# Асинхронные версии эндпоинтов подключаются первыми и перекрывают синхронные
+if settings.DB_ASYNC:
+    from app.modules.auth.async_routes import router as auth_async_router
+    from app.modules.users.async_routes import router as users_async_router
+    from app.modules.hotels.async_routes import router as hotels_async_router
+    from app.modules.bookings.async_routes import router as bookings_async_router
+
+    app.include_router(auth_async_router, prefix="/api/auth", tags=["authentication"])
+    app.include_router(users_async_router, prefix="/api/users", tags=["users"])
+    app.include_router(hotels_async_router, prefix="/api/hotels", tags=["hotels"])
+    app.include_router(bookings_async_router, prefix="/api/bookings", tags=["bookings"])
+
 # Подключаем роутеры
 app.include_router(auth_router, prefix="/api/auth", tags=["authentication"])
 app.include_router(users_router, prefix="/api/users", tags=["users"])
@@ -75,4 +162,28 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+@app.get("/health/pool")
+async def pool_health():
+    """Состояние и статистика пулов соединений с БД"""
+    pools = {"sync": {**pool_status(engine), **pool_metrics["sync"].snapshot()}}
+    if async_engine is not None:
+        pools["async"] = {**pool_status(async_engine.sync_engine), **pool_metrics["async"].snapshot()}
+    return pools
+
+LOCAL_CLIENTS = {"127.0.0.1", "::1", "localhost"}
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    """Метрики запросов и пулов соединений в текстовом формате Prometheus"""
+    if not settings.METRICS_ALLOW_REMOTE and (request.client is None or request.client.host not in LOCAL_CLIENTS):
+        return JSONResponse(status_code=404, content={"detail": "Not Found"})
+    pools = {"sync": pool_metrics["sync"]}
+    if async_engine is not None:
+        pools["async"] = pool_metrics["async"]
+    lines = request_metrics.prometheus_lines() + pool_prometheus_lines(pools)
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
+
+# Обертка для профилирования - после объявления всех эндпоинтов
+profile_endpoints(app.routes)
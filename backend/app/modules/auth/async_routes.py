@@ -0,0 +1,105 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_async_db
+from . import async_services, schemas
+from .dependencies import get_current_active_user
+from .models import User
+from .passwords import PasswordHasherBusy
+from .services import invalidate_principal
+from .tokens import InvalidRefreshToken
+
+# Асинхронные версии эндпоинтов (подключаются при DB_ASYNC)
+router = APIRouter()
+
+@router.post("/register", response_model=schemas.UserResponse)
+async def register_user(
+    user_data: schemas.UserCreate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    # Check if user already exists
+    db_user = await async_services.get_user_by_email(db, email=user_data.email)
+    if db_user:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
+    
+    try:
+        return await async_services.create_user(db=db, user_data=user_data)
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many password checks in progress, try again later",
+            headers={"Retry-After": "1"},
+        )
+
+@router.post("/login", response_model=schemas.Token)
+async def login_user(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        user = await async_services.authenticate_user(db, form_data.username, form_data.password)
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many password checks in progress, try again later",
+            headers={"Retry-After": "1"},
+        )
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    return await async_services.issue_tokens(db, user)
+
+@router.post("/refresh", response_model=schemas.Token)
+async def refresh_tokens(
+    request_data: schemas.RefreshTokenRequest,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Новая пара токенов по refresh-токену (старый refresh-токен больше не действует)"""
+    try:
+        return await async_services.rotate_refresh_token(db, request_data.refresh_token)
+    except InvalidRefreshToken:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    request_data: schemas.RefreshTokenRequest,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Отзывает refresh-токен этого устройства (вместе с его цепочкой ротаций)"""
+    try:
+        await async_services.revoke_refresh_token(db, request_data.refresh_token)
+    except InvalidRefreshToken:
+        pass
+
+@router.post("/logout-all", status_code=status.HTTP_204_NO_CONTENT)
+async def logout_all(
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Выход на всех устройствах: отзываются все access- и refresh-токены пользователя"""
+    await async_services.revoke_user_tokens(db, current_user.id)
+    await db.commit()
+    invalidate_principal(current_user.id)
+
+@router.get("/me", response_model=schemas.UserResponse)
+async def read_users_me(
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # В current_user только данные из токена - профиль читаем из БД
+    user = await async_services.get_user(db, current_user.id)
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
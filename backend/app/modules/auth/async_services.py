@@ -0,0 +1,93 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+from uuid import UUID
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import User
+from .schemas import UserCreate
+from .passwords import hash_password, run_bounded_async, verify_and_update
+from .services import token_response
+from .tokens import (
+    InvalidRefreshToken, bump_token_version_statement, expired_refresh_tokens_delete,
+    insert_refresh_token_statement, matches, new_refresh_token, parse_refresh_token,
+    refresh_family_delete, refresh_token_for_update_statement, user_refresh_tokens_delete
+)
+
+# Асинхронные версии сервисов аутентификации (DB_ASYNC)
+async def get_user(db: AsyncSession, user_id: UUID) -> Optional[User]:
+    return await db.get(User, user_id)
+
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalars().first()
+
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
+    """Проверяет пароль в пуле хеширования; устаревший хеш заменяется новым"""
+    user = await get_user_by_email(db, email)
+    is_valid, new_hash = await run_bounded_async(verify_and_update, password, user.password_hash if user else None)
+    if not is_valid:
+        return None
+    if new_hash:
+        user.password_hash = new_hash
+        await db.commit()
+        await db.refresh(user)
+    return user
+
+async def create_user(db: AsyncSession, user_data: UserCreate) -> User:
+    hashed_password = await run_bounded_async(hash_password, user_data.password)
+    db_user = User(
+        email=user_data.email,
+        password_hash=hashed_password,
+        first_name=user_data.first_name,
+        last_name=user_data.last_name,
+        phone=user_data.phone,
+        role=user_data.role
+    )
+    db.add(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    return db_user
+
+async def issue_tokens(db: AsyncSession, user: User) -> Dict[str, Any]:
+    """Access-токен и refresh-токен новой цепочки (после входа по паролю)"""
+    refresh_token, row = new_refresh_token(user.id)
+    await db.execute(expired_refresh_tokens_delete(user.id))
+    await db.execute(insert_refresh_token_statement(row))
+    await db.commit()
+    return token_response(user, refresh_token)
+
+async def rotate_refresh_token(db: AsyncSession, token: str) -> Dict[str, Any]:
+    """Обменивает refresh-токен на новую пару; повторный обмен отзывает всю цепочку"""
+    token_id, secret = parse_refresh_token(token)
+    stored = (await db.execute(refresh_token_for_update_statement(token_id))).scalar_one_or_none()
+    if not matches(stored, secret):
+        await db.rollback()
+        raise InvalidRefreshToken("Unknown refresh token")
+    
+    user = await db.get(User, stored.user_id)
+    if stored.used_at is not None or stored.expires_at <= datetime.utcnow() or not user or not user.is_active:
+        await db.execute(refresh_family_delete(stored.family_id))
+        await db.commit()
+        raise InvalidRefreshToken("Refresh token is expired or revoked")
+    
+    stored.used_at = datetime.utcnow()
+    refresh_token, row = new_refresh_token(user.id, stored.family_id)
+    await db.execute(expired_refresh_tokens_delete(user.id))
+    await db.execute(insert_refresh_token_statement(row))
+    response = token_response(user, refresh_token)
+    await db.commit()
+    return response
+
+async def revoke_refresh_token(db: AsyncSession, token: str) -> None:
+    """Выход на одном устройстве: отзывает цепочку предъявленного токена"""
+    token_id, secret = parse_refresh_token(token)
+    stored = (await db.execute(refresh_token_for_update_statement(token_id))).scalar_one_or_none()
+    if matches(stored, secret):
+        await db.execute(refresh_family_delete(stored.family_id))
+    await db.commit()
+
+async def revoke_user_tokens(db: AsyncSession, user_id: UUID) -> None:
+    """Выход на всех устройствах: access-токены отклоняются, refresh-токены удаляются (без коммита)"""
+    await db.execute(bump_token_version_statement(user_id))
+    await db.execute(user_refresh_tokens_delete(user_id))
@@ -1,44 +1,91 @@
+from typing import Optional
+from uuid import UUID
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
+from app.core.database import get_db, get_async_db
 from app.core.config import settings
 from .models import User
 from .schemas import TokenData
+from .services import cache_token_version, get_cached_token_version, principal_from_claims, token_version_statement
 
 security = HTTPBearer()
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
+def _decode_token(token: str) -> tuple:
     try:
         payload = jwt.decode(
-            credentials.credentials, 
+            token, 
             settings.SECRET_KEY, 
             algorithms=[settings.ALGORITHM]
         )
         user_id: str = payload.get("sub")
         if user_id is None:
-            raise credentials_exception
+            raise _credentials_exception()
         token_data = TokenData(user_id=user_id)
     except JWTError:
-        raise credentials_exception
-    
-    user = db.query(User).filter(User.id == token_data.user_id).first()
-    if user is None:
-        raise credentials_exception
-    return user
+        raise _credentials_exception()
+    return token_data.user_id, payload
+
+def is_admin_token(authorization: Optional[str]) -> bool:
+    """Заголовок Authorization с действующим токеном администратора.
+
+    Проверяются только подпись, срок и claims, без версии токенов в БД: годится
+    для служебных функций вроде профилирования, но не для доступа к данным.
+    """
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    try:
+        _, claims = _decode_token(token)
+    except HTTPException:
+        return False
+    return claims.get("role") == "admin" and claims.get("active", True)
+
+def _principal(user_id, claims: dict, version) -> User:
+    """Пользователь из claims, если токен выдан для текущей версии токенов пользователя"""
+    if version is None or claims.get("ver", 0) != version:
+        raise _credentials_exception()
+    return principal_from_claims(user_id, claims)
+
+# Роль и активность берутся из токена; из БД (через кеш) читается только версия токенов.
+# Синхронная версия выполняется в пуле потоков и не блокирует event loop
+def _get_current_user_sync(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> User:
+    user_id, claims = _decode_token(credentials.credentials)
+    version = get_cached_token_version(user_id)
+    if version is None:
+        version = db.execute(token_version_statement(user_id)).scalar()
+        if version is not None:
+            cache_token_version(user_id, version)
+    return _principal(user_id, claims, version)
+
+async def _get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    user_id, claims = _decode_token(credentials.credentials)
+    version = get_cached_token_version(user_id)
+    if version is None:
+        version = (await db.execute(token_version_statement(user_id))).scalar()
+        if version is not None:
+            cache_token_version(user_id, version)
+    return _principal(user_id, claims, version)
+
+get_current_user = _get_current_user_async if settings.DB_ASYNC else _get_current_user_sync
 
 async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
-    return current_user
\ No newline at end of file
+    return current_user
@@ -1,4 +1,6 @@
-from sqlalchemy import Column, String, Boolean, DateTime
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Index, Integer, LargeBinary
+from sqlalchemy.dialects.postgresql import ENUM, UUID
+from app.core.database import Base
 from app.shared.models import BaseModel
 
 class User(BaseModel):
@@ -9,5 +11,21 @@ class User(BaseModel):
     first_name = Column(String(100), nullable=False)
     last_name = Column(String(100), nullable=False)
     phone = Column(String(20))
-    role = Column(String(20), nullable=False, default='guest')  # 'guest', 'hotel_manager', 'admin'
-    is_active = Column(Boolean, default=True)
\ No newline at end of file
+    role = Column(ENUM('guest', 'hotel_manager', 'admin', name='user_role'), nullable=False, default='guest')  # 'guest', 'hotel_manager', 'admin'
+    is_active = Column(Boolean, default=True)
+    # Увеличивается при смене роли/блокировке/выходе со всех устройств: старые access-токены отклоняются
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
+    
+    # Постраничная выдача по (created_at, id)
+    __table_args__ = (Index('idx_users_created', 'created_at', 'id'),)
+
+class RefreshToken(Base):
+    """Refresh-токен: хранится только sha256 секрета, family_id связывает цепочку ротаций"""
+    __tablename__ = "refresh_tokens"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    family_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    token_hash = Column(LargeBinary(32), nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    used_at = Column(DateTime)  # Токен уже обменян; повторное предъявление отзывает всю цепочку
@@ -0,0 +1,88 @@
+"""Хеширование паролей с настраиваемой KDF.
+
+Пароли хешируются схемой PASSWORD_HASH_SCHEME (bcrypt, argon2 - нужен пакет argon2-cffi,
+pbkdf2_sha256) с солью на каждого пользователя. Старые хеши (SHA-256 с общей солью)
+и хеши других схем или меньшей стоимости по-прежнему проверяются и при успешном
+входе заменяются новыми (verify_and_update).
+
+Проверка и хеширование - CPU-bound, поэтому выполняются в отдельном пуле потоков
+с ограничением числа ожидающих операций: при всплеске входов лишние запросы сразу
+получают PasswordHasherBusy, а не занимают все потоки и event loop приложения.
+"""
+import asyncio
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, Tuple
+
+from passlib.context import CryptContext
+from passlib.utils import handlers
+
+from app.core.config import settings
+
+class legacy_sha256(handlers.StaticHandler):
+    """Прежний формат: sha256(password + общая соль) в hex, без соли на пользователя"""
+    name = "legacy_sha256"
+    checksum_chars = handlers.HEX_CHARS
+    checksum_size = 64
+    _salt = b"temp_salt_change_in_production"
+
+    def _calc_checksum(self, secret):
+        if isinstance(secret, str):
+            secret = secret.encode("utf-8")
+        return hashlib.sha256(secret + self._salt).hexdigest()
+
+class PasswordHasherBusy(Exception):
+    """Очередь проверки паролей заполнена, запрос нужно повторить позже"""
+
+def build_password_context(scheme: str, rounds: Optional[int] = None) -> CryptContext:
+    """Контекст: новые хеши - scheme, все остальные схемы считаются устаревшими"""
+    options = {}
+    if rounds is not None:
+        # Хеши меньшей стоимости тоже пересчитываются при входе
+        options[f"{scheme}__default_rounds"] = rounds
+        options[f"{scheme}__min_rounds"] = rounds
+    schemes = [scheme] + [name for name in ("bcrypt", "pbkdf2_sha256") if name != scheme] + [legacy_sha256]
+    return CryptContext(schemes=schemes, deprecated="auto", **options)
+
+password_context = build_password_context(settings.PASSWORD_HASH_SCHEME, settings.PASSWORD_HASH_ROUNDS)
+
+_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1,
+    thread_name_prefix="password-hash"
+)
+_pending = threading.BoundedSemaphore(settings.PASSWORD_HASH_MAX_PENDING)
+
+def hash_password(password: str) -> str:
+    return password_context.hash(password)
+
+def verify_and_update(password: str, password_hash: Optional[str]) -> Tuple[bool, Optional[str]]:
+    """(пароль верен, новый хеш или None); неизвестный формат хеша - неверный пароль"""
+    if password_hash is None:
+        # Та же стоимость, что и у настоящей проверки: время ответа не выдает отсутствие email
+        password_context.dummy_verify()
+        return False, None
+    try:
+        return password_context.verify_and_update(password, password_hash)
+    except ValueError:
+        return False, None
+
+def _acquire() -> None:
+    if not _pending.acquire(blocking=False):
+        raise PasswordHasherBusy("Too many concurrent password checks")
+
+async def run_bounded_async(function: Callable[..., Any], *args) -> Any:
+    """Выполняет хеширование в пуле паролей, не блокируя event loop.
+
+    Место в очереди освобождается, когда хеширование в пуле закончилось, а не когда
+    перестали ждать результат: отмененный запрос не дает обойти ограничение очереди.
+    """
+    _acquire()
+    try:
+        future = _executor.submit(function, *args)
+    except BaseException:
+        _pending.release()
+        raise
+    future.add_done_callback(lambda _: _pending.release())
+    return await asyncio.wrap_future(future)
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
@@ -6,43 +7,106 @@ from app.core.database import get_db
 from . import services, schemas
 from .dependencies import get_current_active_user
 from .models import User
+from .passwords import PasswordHasherBusy, hash_password, run_bounded_async, verify_and_update
+from .tokens import InvalidRefreshToken
 
 router = APIRouter()
 
+# Регистрация и вход - async: запросы к БД идут в пуле потоков, а хеширование - в пуле
+# паролей, и поток на время хеширования не занят ожиданием результата
 @router.post("/register", response_model=schemas.UserResponse)
-def register_user(
+async def register_user(
     user_data: schemas.UserCreate,
     db: Session = Depends(get_db)
 ):
     # Check if user already exists
-    db_user = services.get_user_by_email(db, email=user_data.email)
+    db_user = await run_in_threadpool(services.get_user_by_email, db, email=user_data.email)
     if db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    return services.create_user(db=db, user_data=user_data)
+    try:
+        password_hash = await run_bounded_async(hash_password, user_data.password)
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many password checks in progress, try again later",
+            headers={"Retry-After": "1"},
+        )
+    return await run_in_threadpool(services.create_user, db, user_data, password_hash)
 
 @router.post("/login", response_model=schemas.Token)
-def login_user(
+async def login_user(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
-    user = services.authenticate_user(db, form_data.username, form_data.password)
-    if not user:
+    user = await run_in_threadpool(services.get_user_by_email, db, form_data.username)
+    try:
+        is_valid, new_hash = await run_bounded_async(
+            verify_and_update, form_data.password, user.password_hash if user else None
+        )
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many password checks in progress, try again later",
+            headers={"Retry-After": "1"},
+        )
+    if not is_valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if new_hash:
+        user = await run_in_threadpool(services.update_password_hash, db, user, new_hash)
     
-    access_token = services.create_access_token(
-        data={"sub": str(user.id)}
-    )
-    
-    return {"access_token": access_token, "token_type": "bearer"}
+    return await run_in_threadpool(services.issue_tokens, db, user)
+
+@router.post("/refresh", response_model=schemas.Token)
+def refresh_tokens(
+    request_data: schemas.RefreshTokenRequest,
+    db: Session = Depends(get_db)
+):
+    """Новая пара токенов по refresh-токену (старый refresh-токен больше не действует)"""
+    try:
+        return services.rotate_refresh_token(db, request_data.refresh_token)
+    except InvalidRefreshToken:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(
+    request_data: schemas.RefreshTokenRequest,
+    db: Session = Depends(get_db)
+):
+    """Отзывает refresh-токен этого устройства (вместе с его цепочкой ротаций)"""
+    try:
+        services.revoke_refresh_token(db, request_data.refresh_token)
+    except InvalidRefreshToken:
+        pass
+
+@router.post("/logout-all", status_code=status.HTTP_204_NO_CONTENT)
+def logout_all(
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Выход на всех устройствах: отзываются все access- и refresh-токены пользователя"""
+    services.revoke_user_tokens(db, current_user.id)
+    db.commit()
+    services.invalidate_principal(current_user.id)
 
 @router.get("/me", response_model=schemas.UserResponse)
-def read_users_me(current_user: User = Depends(get_current_active_user)):
-    return current_user
\ No newline at end of file
+def read_users_me(
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    # В current_user только данные из токена - профиль читаем из БД
+    user = services.get_user(db, current_user.id)
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
\ No newline at end of file
@@ -1,15 +1,18 @@
 from pydantic import BaseModel, EmailStr
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 from uuid import UUID
 
+# Значения ENUM user_role: неизвестная роль отклоняется с 422 до обращения к БД
+UserRole = Literal['guest', 'hotel_manager', 'admin']
+
 # Base schemas
 class UserBase(BaseModel):
     email: EmailStr
     first_name: str
     last_name: str
     phone: Optional[str] = None
-    role: str = 'guest'
+    role: UserRole = 'guest'
 
 # Request schemas
 class UserCreate(UserBase):
@@ -22,6 +25,11 @@ class UserLogin(BaseModel):
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None  # Срок жизни access-токена, секунды
+
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
 
 class TokenData(BaseModel):
     user_id: Optional[UUID] = None
@@ -1,26 +1,30 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Dict, Optional
 from uuid import UUID
 from jose import JWTError, jwt
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-import hashlib
 import secrets
 
+from app.core.cache import TTLCache
 from app.core.config import settings
 from .models import User
+from .passwords import verify_and_update
 from .schemas import UserCreate, TokenData
+from .tokens import (
+    InvalidRefreshToken, bump_token_version_statement, expired_refresh_tokens_delete,
+    insert_refresh_token_statement, matches, new_refresh_token, parse_refresh_token,
+    refresh_family_delete, refresh_token_for_update_statement, user_refresh_tokens_delete
+)
 
-# Упрощенное хеширование паролей (временно)
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    # Временное решение - простое сравнение
-    # В продакшене заменить на bcrypt
-    return hash_password(plain_password) == hashed_password
+# Текущие версии токенов по id пользователя, чтобы не читать таблицу users на каждый запрос
+token_version_cache = TTLCache(
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
 
-def hash_password(password: str) -> str:
-    # Временное решение - используем SHA256 с солью
-    # В продакшене заменить на bcrypt
-    salt = "temp_salt_change_in_production"
-    return hashlib.sha256((password + salt).encode()).hexdigest()
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return verify_and_update(plain_password, hashed_password)[0]
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -33,22 +37,77 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
-    user = db.query(User).filter(User.email == email).first()
-    if not user:
-        return None
-    if not verify_password(password, user.password_hash):
-        return None
+def update_password_hash(db: Session, user: User, new_hash: str) -> User:
+    """Замена устаревшего хеша после успешного входа (хеш считается в пуле паролей)"""
+    user.password_hash = new_hash
+    db.commit()
+    db.refresh(user)
     return user
 
+def token_response(user: User, refresh_token: str) -> Dict[str, Any]:
+    return {
+        "access_token": create_access_token(principal_claims(user)),
+        "refresh_token": refresh_token,
+        "token_type": "bearer",
+        "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    }
+
+def issue_tokens(db: Session, user: User) -> Dict[str, Any]:
+    """Access-токен и refresh-токен новой цепочки (после входа по паролю)"""
+    refresh_token, row = new_refresh_token(user.id)
+    db.execute(expired_refresh_tokens_delete(user.id))
+    db.execute(insert_refresh_token_statement(row))
+    # Claims берутся до коммита, пока атрибуты пользователя загружены
+    response = token_response(user, refresh_token)
+    db.commit()
+    return response
+
+def rotate_refresh_token(db: Session, token: str) -> Dict[str, Any]:
+    """Обменивает refresh-токен на новую пару; повторный обмен отзывает всю цепочку"""
+    token_id, secret = parse_refresh_token(token)
+    stored = db.execute(refresh_token_for_update_statement(token_id)).scalar_one_or_none()
+    if not matches(stored, secret):
+        db.rollback()
+        raise InvalidRefreshToken("Unknown refresh token")
+    
+    user = db.get(User, stored.user_id)
+    if stored.used_at is not None or stored.expires_at <= datetime.utcnow() or not user or not user.is_active:
+        db.execute(refresh_family_delete(stored.family_id))
+        db.commit()
+        raise InvalidRefreshToken("Refresh token is expired or revoked")
+    
+    stored.used_at = datetime.utcnow()
+    refresh_token, row = new_refresh_token(user.id, stored.family_id)
+    db.execute(expired_refresh_tokens_delete(user.id))
+    db.execute(insert_refresh_token_statement(row))
+    response = token_response(user, refresh_token)
+    db.commit()
+    return response
+
+def revoke_refresh_token(db: Session, token: str) -> None:
+    """Выход на одном устройстве: отзывает цепочку предъявленного токена"""
+    token_id, secret = parse_refresh_token(token)
+    stored = db.execute(refresh_token_for_update_statement(token_id)).scalar_one_or_none()
+    if matches(stored, secret):
+        db.execute(refresh_family_delete(stored.family_id))
+    db.commit()
+
+def revoke_user_tokens(db: Session, user_id: UUID) -> None:
+    """Выход на всех устройствах: access-токены отклоняются, refresh-токены удаляются (без коммита)"""
+    db.execute(bump_token_version_statement(user_id))
+    db.execute(user_refresh_tokens_delete(user_id))
+
+def get_user(db: Session, user_id: UUID) -> Optional[User]:
+    return db.get(User, user_id)
+
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
     return db.query(User).filter(User.email == email).first()
 
-def create_user(db: Session, user_data: UserCreate) -> User:
-    hashed_password = hash_password(user_data.password)
+def create_user(db: Session, user_data: UserCreate, password_hash: str) -> User:
+    """Пользователь с хешем пароля, посчитанным в пуле паролей (passwords.run_bounded_async)"""
     db_user = User(
         email=user_data.email,
-        password_hash=hashed_password,
+        password_hash=password_hash,
         first_name=user_data.first_name,
         last_name=user_data.last_name,
         phone=user_data.phone,
@@ -57,4 +116,29 @@ def create_user(db: Session, user_data: UserCreate) -> User:
     db.add(db_user)
     db.commit()
     db.refresh(db_user)
-    return db_user
\ No newline at end of file
+    return db_user
+
+def principal_claims(user: User) -> dict:
+    """Claims access-токена: их достаточно для авторизации без чтения пользователя из БД"""
+    return {"sub": str(user.id), "role": user.role, "active": user.is_active, "ver": user.token_version or 0}
+
+def principal_from_claims(user_id: UUID, claims: dict) -> User:
+    """Отсоединенный пользователь с id, ролью и активностью из токена"""
+    return User(
+        id=user_id,
+        role=claims.get("role"),
+        is_active=claims.get("active", True),
+        token_version=claims.get("ver", 0)
+    )
+
+def token_version_statement(user_id: UUID):
+    return select(User.token_version).where(User.id == user_id)
+
+def get_cached_token_version(user_id: UUID) -> Optional[int]:
+    return token_version_cache.get(user_id)
+
+def cache_token_version(user_id: UUID, version: int) -> None:
+    token_version_cache.set(user_id, version)
+
+def invalidate_principal(user_id: UUID) -> None:
+    token_version_cache.delete(user_id if isinstance(user_id, UUID) else UUID(str(user_id)))
@@ -0,0 +1,103 @@
+"""Refresh-токены с ротацией и отзывом.
+
+Токен непрозрачный: "<id>.<секрет>", в таблице refresh_tokens лежит только sha256 секрета.
+Каждый обмен помечает токен использованным и выдает новый в той же цепочке (family_id).
+Повторное предъявление уже обмененного токена означает утечку - отзывается вся цепочка.
+Просроченные токены пользователя удаляются при входе и при каждом обмене. Токены
+пользователей, которые больше не входят, удаляет периодическая очистка:
+
+    python -m app.modules.auth.tokens purge
+"""
+import argparse
+import hashlib
+import hmac
+import secrets
+import sys
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from .models import RefreshToken, User
+
+class InvalidRefreshToken(Exception):
+    """Refresh-токен неизвестен, просрочен, отозван или уже использован"""
+
+def _digest(secret: str) -> bytes:
+    return hashlib.sha256(secret.encode()).digest()
+
+def new_refresh_token(user_id: UUID, family_id: Optional[UUID] = None) -> Tuple[str, Dict[str, Any]]:
+    """Строка токена для клиента и строка для вставки в refresh_tokens"""
+    token_id = uuid.uuid4()
+    secret = secrets.token_urlsafe(32)
+    row = {
+        "id": token_id,
+        "user_id": user_id,
+        "family_id": family_id or token_id,
+        "token_hash": _digest(secret),
+        "expires_at": datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    }
+    return f"{token_id.hex}.{secret}", row
+
+def parse_refresh_token(token: str) -> Tuple[UUID, str]:
+    token_id, _, secret = token.partition(".")
+    try:
+        return UUID(hex=token_id), secret
+    except ValueError:
+        raise InvalidRefreshToken("Malformed refresh token")
+
+def matches(row: Optional[RefreshToken], secret: str) -> bool:
+    return row is not None and hmac.compare_digest(row.token_hash, _digest(secret))
+
+def insert_refresh_token_statement(row: Dict[str, Any]):
+    return insert(RefreshToken).values(**row)
+
+def refresh_token_for_update_statement(token_id: UUID):
+    """Строка токена под блокировкой: параллельные обмены одного токена идут по очереди"""
+    return select(RefreshToken).where(RefreshToken.id == token_id).with_for_update()
+
+def expired_refresh_tokens_delete(user_id: UUID):
+    return delete(RefreshToken).where(
+        RefreshToken.user_id == user_id,
+        RefreshToken.expires_at <= datetime.utcnow()
+    )
+
+def all_expired_refresh_tokens_delete():
+    return delete(RefreshToken).where(RefreshToken.expires_at <= datetime.utcnow())
+
+def refresh_family_delete(family_id: UUID):
+    return delete(RefreshToken).where(RefreshToken.family_id == family_id)
+
+def user_refresh_tokens_delete(user_id: UUID):
+    return delete(RefreshToken).where(RefreshToken.user_id == user_id)
+
+def bump_token_version_statement(user_id: UUID):
+    """Отзывает все выданные access-токены пользователя"""
+    return update(User).where(User.id == user_id).values(token_version=User.token_version + 1)
+
+def purge_expired_refresh_tokens(db: Session) -> int:
+    """Удаляет просроченные refresh-токены всех пользователей"""
+    deleted = db.execute(all_expired_refresh_tokens_delete()).rowcount
+    db.commit()
+    return deleted
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Обслуживание таблицы refresh-токенов")
+    parser.add_argument("command", choices=["purge"])
+    parser.parse_args(argv)
+
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        print(f"Expired refresh tokens purged: {purge_expired_refresh_tokens(db)}")
+        return 0
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from uuid import UUID
+from datetime import date
+
+from app.core.database import get_async_db
+from app.modules.auth.dependencies import get_current_active_user
+from app.modules.auth.models import User
+from app.modules.hotels.models import Hotel
+from app.modules.users.dependencies import get_current_admin_user
+from app.core.serialization import json_response
+from app.shared.pagination import NEXT_CURSOR_HEADER
+from . import async_services, models, schemas, export
+from .dependencies import get_booking_for_hotel_manager_async, get_booking_for_user_async, get_booking_search
+from .services import BookingConflictError
+
+# Асинхронные версии эндпоинтов (подключаются при DB_ASYNC).
+# Порядок маршрутов повторяет routes.py: /my-bookings идет раньше /{booking_id}.
+router = APIRouter()
+
+@router.post("/", response_model=schemas.BookingResponse)
+async def create_booking(
+    booking_data: schemas.BookingCreate,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        return await async_services.create_booking(db, booking_data, current_user.id)
+    except BookingConflictError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/group", response_model=List[schemas.BookingResponse])
+async def create_group_booking(
+    booking_data: schemas.GroupBookingCreate,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Бронирование нескольких номеров одного отеля на одни даты (все или ни одного)"""
+    try:
+        return await async_services.create_group_booking(db, booking_data, current_user.id)
+    except BookingConflictError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/my-bookings", response_model=List[schemas.BookingResponse])
+async def get_my_bookings(
+    search: schemas.BookingSearch = Depends(get_booking_search),
+    cursor: Optional[str] = Query(None, description="Курсор из заголовка X-Next-Cursor"),
+    limit: int = Query(50, ge=1, le=200),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Получить мои бронирования (новые первыми, постранично)"""
+    try:
+        bookings, next_cursor = await async_services.get_user_bookings(db, current_user.id, search, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return json_response(List[schemas.BookingResponse], bookings, headers)
+
+@router.get("/{booking_id}", response_model=schemas.BookingResponse)
+async def get_booking(booking: models.Booking = Depends(get_booking_for_user_async)):
+    return booking
+
+@router.put("/{booking_id}/cancel", response_model=schemas.BookingResponse)
+async def cancel_booking(
+    booking: models.Booking = Depends(get_booking_for_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # Можно отменять только pending или confirmed бронирования
+    if booking.status not in ['pending', 'confirmed']:
+        raise HTTPException(
+            status_code=400, 
+            detail=f"Cannot cancel booking with status: {booking.status}"
+        )
+    
+    updated_booking = await async_services.update_booking_status(db, booking.id, 'cancelled')
+    if not updated_booking:
+        raise HTTPException(status_code=404, detail="Booking not found")
+    return updated_booking
+
+@router.get("/hotel/{hotel_id}/bookings", response_model=List[schemas.BookingResponse])
+async def get_hotel_bookings(
+    hotel_id: UUID,
+    search: schemas.BookingSearch = Depends(get_booking_search),
+    cursor: Optional[str] = Query(None, description="Курсор из заголовка X-Next-Cursor"),
+    limit: int = Query(50, ge=1, le=200),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    hotel = await db.get(Hotel, hotel_id)
+    if not hotel:
+        raise HTTPException(status_code=404, detail="Hotel not found")
+    
+    if hotel.manager_id != current_user.id and current_user.role != 'admin':
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to manage this hotel"
+        )
+    
+    try:
+        bookings, next_cursor = await async_services.get_hotel_bookings(db, hotel_id, search, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return json_response(List[schemas.BookingResponse], bookings, headers)
+
+
+@router.get("/hotel/{hotel_id}/bookings/export")
+async def export_hotel_bookings(
+    hotel_id: UUID,
+    search: schemas.BookingSearch = Depends(get_booking_search),
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Потоковая выгрузка истории бронирований отеля (NDJSON или CSV)"""
+    hotel = await db.get(Hotel, hotel_id)
+    if not hotel:
+        raise HTTPException(status_code=404, detail="Hotel not found")
+    
+    if hotel.manager_id != current_user.id and current_user.role != 'admin':
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to manage this hotel"
+        )
+    
+    search = search.copy(update={"hotel_id": hotel_id})
+    return StreamingResponse(
+        export.astream_booking_export(db, search, format),
+        media_type=export.EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="bookings-{hotel_id}.{format}"'}
+    )
+
+@router.put("/{booking_id}/status", response_model=schemas.BookingResponse)
+async def update_booking_status(
+    booking_id: UUID,
+    status_update: schemas.BookingUpdate,
+    booking: models.Booking = Depends(get_booking_for_hotel_manager_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    if status_update.status not in ['pending', 'confirmed', 'cancelled', 'completed']:
+        raise HTTPException(status_code=400, detail="Invalid status")
+    
+    try:
+        updated_booking = await async_services.update_booking_status(db, booking.id, status_update.status)
+    except BookingConflictError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    if not updated_booking:
+        raise HTTPException(status_code=404, detail="Booking not found")
+    return updated_booking
+
+# Платежи
+@router.post("/payments/", response_model=schemas.PaymentResponse)
+async def create_payment(
+    payment_data: schemas.PaymentCreate,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # Проверяем, что пользователь имеет доступ к бронированию
+    booking = await db.get(models.Booking, payment_data.booking_id)
+    if not booking or booking.guest_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Booking not found")
+    
+    return await async_services.create_payment(db, payment_data)
+
+@router.put("/payments/{payment_id}/status", response_model=schemas.PaymentResponse)
+async def update_payment_status(
+    payment_id: UUID,
+    status: str = Query(..., description="New payment status"),
+    transaction_id: Optional[str] = Query(None),
+    current_user: User = Depends(get_current_admin_user),  # Только админы могут менять статус платежей
+    db: AsyncSession = Depends(get_async_db)
+):
+    if status not in ['pending', 'completed', 'failed', 'refunded']:
+        raise HTTPException(status_code=400, detail="Invalid payment status")
+    
+    updated_payment = await async_services.update_payment_status(db, payment_id, status, transaction_id)
+    if not updated_payment:
+        raise HTTPException(status_code=404, detail="Payment not found")
+    return updated_payment
+
+# Проверка доступности
+@router.get("/availability/check")
+async def check_availability(
+    room_id: UUID,
+    check_in: date,
+    check_out: date,
+    db: AsyncSession = Depends(get_async_db)
+):
+    if check_out <= check_in:
+        raise HTTPException(status_code=400, detail="Invalid date range")
+    
+    quote = await async_services.get_room_stay_quote(db, room_id, check_in, check_out)
+    if quote is None:
+        raise HTTPException(status_code=404, detail="Room not found")
+    
+    is_available = quote.is_available and await async_services.check_room_availability(db, room_id, check_in, check_out)
+    
+    return {
+        "available": is_available,
+        "estimated_price": quote.total_price,
+        "nights": quote.nights
+    }
@@ -0,0 +1,106 @@
+from typing import List, Optional, Tuple
+from uuid import UUID
+from datetime import date, datetime
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.shared.pagination import split_page
+from app.modules.hotels.models import Room
+from app.modules.hotels.pricing import StayQuote, get_stay_quotes
+from . import models, schemas, services
+from .services import bookings_page_statement, booking_statement, room_conflict_exists
+
+# Асинхронные версии сервисов бронирований (DB_ASYNC).
+# Создание бронирований и смена статуса выполняются синхронными сервисами через
+# AsyncSession.run_sync: блокировки номеров, индекс занятости и счетчики популярности
+# описаны в одном месте, а запросы идут через asyncpg без занятия потока.
+# После записи бронирование перечитывается со связями, чтобы сериализация
+# ответа не обращалась к ленивым атрибутам вне greenlet.
+async def get_bookings_page(
+    db: AsyncSession,
+    search: schemas.BookingSearch,
+    cursor: Optional[str] = None,
+    limit: int = 50
+) -> Tuple[List[models.Booking], Optional[str]]:
+    """Страница бронирований с загрузкой связанных данных и курсор следующей страницы"""
+    result = await db.execute(bookings_page_statement(search, cursor, limit))
+    return split_page(result.unique().scalars().all(), limit)
+
+async def get_user_bookings(
+    db: AsyncSession,
+    user_id: UUID,
+    search: Optional[schemas.BookingSearch] = None,
+    cursor: Optional[str] = None,
+    limit: int = 50
+) -> Tuple[List[models.Booking], Optional[str]]:
+    """Получает страницу бронирований пользователя"""
+    search = (search or schemas.BookingSearch()).copy(update={"guest_id": user_id})
+    return await get_bookings_page(db, search, cursor, limit)
+
+async def get_hotel_bookings(
+    db: AsyncSession,
+    hotel_id: UUID,
+    search: Optional[schemas.BookingSearch] = None,
+    cursor: Optional[str] = None,
+    limit: int = 50
+) -> Tuple[List[models.Booking], Optional[str]]:
+    """Получает страницу бронирований отеля"""
+    search = (search or schemas.BookingSearch()).copy(update={"hotel_id": hotel_id})
+    return await get_bookings_page(db, search, cursor, limit)
+
+async def get_booking(db: AsyncSession, booking_id: UUID) -> Optional[models.Booking]:
+    """Получает бронирование по ID"""
+    result = await db.execute(booking_statement(booking_id))
+    return result.unique().scalars().first()
+
+async def create_booking(db: AsyncSession, booking_data: schemas.BookingCreate, guest_id: UUID) -> models.Booking:
+    """Создает новое бронирование (см. services.create_booking)"""
+    booking = await db.run_sync(services.create_booking, booking_data, guest_id)
+    return await get_booking(db, booking.id)
+
+async def create_group_booking(db: AsyncSession, booking_data: schemas.GroupBookingCreate, guest_id: UUID) -> List[models.Booking]:
+    """Бронирования нескольких номеров одной транзакцией (связи загружаются сервисом)"""
+    return await db.run_sync(services.create_group_booking, booking_data, guest_id)
+
+async def update_booking_status(db: AsyncSession, booking_id: UUID, status: str) -> Optional[models.Booking]:
+    """Обновляет статус бронирования под блокировкой строки"""
+    booking = await db.run_sync(services.update_booking_status, booking_id, status)
+    if not booking:
+        return None
+    return await get_booking(db, booking.id)
+
+async def check_room_availability(db: AsyncSession, room_id: UUID, check_in: date, check_out: date) -> bool:
+    """Проверяет доступность номера на указанные даты"""
+    return not (await db.execute(select(room_conflict_exists(room_id, check_in, check_out)))).scalar()
+
+async def get_room_stay_quote(db: AsyncSession, room_id: UUID, check_in: date, check_out: date) -> Optional[StayQuote]:
+    """Стоимость проживания в номере по календарю цен и открыт ли он для продажи на эти ночи"""
+    room = await db.get(Room, room_id)
+    if not room:
+        return None
+    quotes = await db.run_sync(get_stay_quotes, [room.room_type_id], check_in, check_out)
+    return quotes[room.room_type_id]
+
+async def create_payment(db: AsyncSession, payment_data: schemas.PaymentCreate) -> models.Payment:
+    """Создает запись о платеже"""
+    db_payment = models.Payment(**payment_data.dict())
+    db.add(db_payment)
+    await db.commit()
+    await db.refresh(db_payment)
+    return db_payment
+
+async def update_payment_status(db: AsyncSession, payment_id: UUID, status: str, transaction_id: Optional[str] = None) -> Optional[models.Payment]:
+    """Обновляет статус платежа"""
+    db_payment = await db.get(models.Payment, payment_id)
+    if not db_payment:
+        return None
+    
+    db_payment.payment_status = status
+    if transaction_id:
+        db_payment.transaction_id = transaction_id
+    if status == 'completed':
+        db_payment.payment_date = datetime.utcnow()
+    
+    await db.commit()
+    await db.refresh(db_payment)
+    return db_payment
@@ -1,21 +1,18 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from typing import Optional
 from uuid import UUID
+from datetime import date
 
-from app.core.database import get_db
+from app.core.database import get_async_db, get_db
 from app.modules.auth.dependencies import get_current_active_user
 from app.modules.auth.models import User
 from app.modules.hotels.dependencies import get_hotel_manager
 from app.modules.hotels.models import Hotel  # Импортируем Hotel из модуля отелей
-from . import services, models
+from . import async_services, services, models, schemas
 
-async def get_booking_for_user(
-    booking_id: UUID,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
-) -> models.Booking:
-    """Проверяет, что пользователь имеет доступ к бронированию"""
-    booking = services.get_booking(db, booking_id)
+def _check_user_access(booking: Optional[models.Booking], current_user: User) -> models.Booking:
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
     
@@ -29,13 +26,7 @@ async def get_booking_for_user(
     
     return booking
 
-async def get_booking_for_hotel_manager(
-    booking_id: UUID,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
-) -> models.Booking:
-    """Проверяет, что пользователь является менеджером отеля для этого бронирования"""
-    booking = services.get_booking(db, booking_id)
+def _check_hotel_manager_access(booking: Optional[models.Booking], current_user: User) -> models.Booking:
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
     
@@ -47,4 +38,43 @@ async def get_booking_for_hotel_manager(
             detail="Not enough permissions to manage this booking"
         )
     
-    return booking
\ No newline at end of file
+    return booking
+
+def get_booking_for_user(
+    booking_id: UUID,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+) -> models.Booking:
+    """Проверяет, что пользователь имеет доступ к бронированию"""
+    return _check_user_access(services.get_booking(db, booking_id), current_user)
+
+def get_booking_for_hotel_manager(
+    booking_id: UUID,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+) -> models.Booking:
+    """Проверяет, что пользователь является менеджером отеля для этого бронирования"""
+    return _check_hotel_manager_access(services.get_booking(db, booking_id), current_user)
+
+# Те же проверки для асинхронных эндпоинтов (DB_ASYNC)
+async def get_booking_for_user_async(
+    booking_id: UUID,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+) -> models.Booking:
+    return _check_user_access(await async_services.get_booking(db, booking_id), current_user)
+
+async def get_booking_for_hotel_manager_async(
+    booking_id: UUID,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+) -> models.Booking:
+    return _check_hotel_manager_access(await async_services.get_booking(db, booking_id), current_user)
+
+def get_booking_search(
+    status_filter: Optional[str] = Query(None, alias="status", pattern="^(pending|confirmed|cancelled|completed)$"),
+    date_from: Optional[date] = Query(None, description="Проживание пересекается с периодом: начало"),
+    date_to: Optional[date] = Query(None, description="Проживание пересекается с периодом: конец"),
+) -> schemas.BookingSearch:
+    """Фильтры списка бронирований из query-параметров"""
+    return schemas.BookingSearch(status=status_filter, date_from=date_from, date_to=date_to)
@@ -0,0 +1,107 @@
+"""Потоковая выгрузка бронирований отеля (NDJSON или CSV).
+
+Строки читаются серверным курсором пачками по EXPORT_BATCH_SIZE и сразу
+отдаются клиенту, поэтому память не зависит от размера истории.
+"""
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import AsyncIterator, Iterator, Sequence
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.modules.auth.models import User
+from app.modules.hotels.models import Room, RoomType
+from . import models, schemas
+from .services import booking_search_conditions
+
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+def booking_export_statement(search: schemas.BookingSearch):
+    """Плоские строки бронирований в порядке создания, без ORM-объектов"""
+    paid_amount = select(
+        func.coalesce(func.sum(models.Payment.amount), 0)
+    ).where(
+        models.Payment.booking_id == models.Booking.id,
+        models.Payment.payment_status == 'completed'
+    ).scalar_subquery()
+
+    return select(
+        models.Booking.id,
+        models.Booking.created_at,
+        models.Booking.status,
+        models.Booking.check_in_date,
+        models.Booking.check_out_date,
+        models.Booking.number_of_guests,
+        models.Booking.total_price,
+        paid_amount.label("paid_amount"),
+        models.Booking.cancelled_at,
+        Room.room_number,
+        RoomType.name.label("room_type"),
+        User.email.label("guest_email"),
+        User.first_name.label("guest_first_name"),
+        User.last_name.label("guest_last_name"),
+    ).join(Room, Room.id == models.Booking.room_id)\
+     .join(RoomType, RoomType.id == Room.room_type_id)\
+     .join(User, User.id == models.Booking.guest_id)\
+     .where(*booking_search_conditions(search))\
+     .order_by(models.Booking.created_at, models.Booking.id)\
+     .execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+def encode_ndjson(rows: Sequence) -> bytes:
+    return "".join(
+        json.dumps(dict(row._mapping), default=_json_default, ensure_ascii=False) + "\n"
+        for row in rows
+    ).encode()
+
+def encode_csv(rows: Sequence, header: Sequence[str] = None) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(header)
+    writer.writerows(rows)
+    return buffer.getvalue().encode()
+
+def _encode(format: str, rows: Sequence, columns: Sequence[str], first: bool) -> bytes:
+    if format == "csv":
+        return encode_csv(rows, columns if first else None)
+    return encode_ndjson(rows)
+
+def stream_booking_export(db: Session, search: schemas.BookingSearch, format: str) -> Iterator[bytes]:
+    result = db.execute(booking_export_statement(search))
+    columns = list(result.keys())
+    first = True
+    for rows in result.partitions():
+        yield _encode(format, rows, columns, first)
+        first = False
+    if first and format == "csv":
+        yield encode_csv([], columns)
+
+async def astream_booking_export(db: AsyncSession, search: schemas.BookingSearch, format: str) -> AsyncIterator[bytes]:
+    result = await db.stream(booking_export_statement(search))
+    columns = list(result.keys())
+    first = True
+    async for rows in result.partitions():
+        yield _encode(format, rows, columns, first)
+        first = False
+    if first and format == "csv":
+        yield encode_csv([], columns)
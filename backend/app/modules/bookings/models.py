@@ -1,11 +1,15 @@
-from sqlalchemy import Column, String, Text, Integer, Boolean, DECIMAL, ForeignKey, Date, DateTime
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Text, Integer, Boolean, DECIMAL, ForeignKey, Date, DateTime, Index
+from sqlalchemy.dialects.postgresql import UUID, ENUM
 from sqlalchemy.orm import relationship
 import uuid
 from datetime import datetime
 
+from app.core.database import Base
 from app.shared.models import BaseModel
 
+# Статусы, при которых бронирование занимает номер
+ACTIVE_BOOKING_STATUSES = ('pending', 'confirmed')
+
 class Booking(BaseModel):
     __tablename__ = "bookings"
     
@@ -13,7 +17,7 @@ class Booking(BaseModel):
     check_out_date = Column(Date, nullable=False)
     number_of_guests = Column(Integer, nullable=False, default=1)
     total_price = Column(DECIMAL(10, 2), nullable=False)
-    status = Column(String(20), nullable=False, default='pending')  # pending, confirmed, cancelled, completed
+    status = Column(ENUM('pending', 'confirmed', 'cancelled', 'completed', name='booking_status'), nullable=False, default='pending')  # pending, confirmed, cancelled, completed
     special_requests = Column(Text)
     
     # Связи
@@ -26,16 +30,30 @@ class Booking(BaseModel):
     
     # Отмененные бронирования
     cancelled_at = Column(DateTime)
+    
+    # Постраничная выдача по (created_at, id)
+    __table_args__ = (
+        Index('idx_bookings_guest_created', 'guest_id', 'created_at', 'id'),
+        Index('idx_bookings_room_created', 'room_id', 'created_at', 'id'),
+    )
 
 class Payment(BaseModel):
     __tablename__ = "payments"
     
     amount = Column(DECIMAL(10, 2), nullable=False)
     payment_method = Column(String(50), nullable=False)  # card, cash, etc.
-    payment_status = Column(String(20), nullable=False, default='pending')  # pending, completed, failed, refunded
+    payment_status = Column(ENUM('pending', 'completed', 'failed', 'refunded', name='payment_status'), nullable=False, default='pending')  # pending, completed, failed, refunded
     transaction_id = Column(String(255))
     payment_date = Column(DateTime)
     
     # Связи
     booking_id = Column(UUID(as_uuid=True), ForeignKey("bookings.id"), nullable=False)
-    booking = relationship("Booking", back_populates="payments")
\ No newline at end of file
+    booking = relationship("Booking", back_populates="payments")
+
+class RoomNight(Base):
+    """Индекс занятости: одна строка на каждую ночь активного бронирования номера"""
+    __tablename__ = "room_nights"
+    
+    room_id = Column(UUID(as_uuid=True), ForeignKey("rooms.id", ondelete="CASCADE"), primary_key=True)
+    night = Column(Date, primary_key=True)
+    booking_id = Column(UUID(as_uuid=True), ForeignKey("bookings.id", ondelete="CASCADE"), nullable=False, index=True)
\ No newline at end of file
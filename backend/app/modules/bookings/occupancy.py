@@ -0,0 +1,138 @@
+"""Индекс занятости номеров по ночам (таблица room_nights).
+
+Каждое активное бронирование занимает по одной строке на ночь проживания,
+поэтому проверка доступности сводится к поиску по первичному ключу
+(room_id, night) вместо сканирования пересечений диапазонов в bookings.
+
+Пересборка и проверка индекса из командной строки:
+
+    python -m app.modules.bookings.occupancy rebuild
+    python -m app.modules.bookings.occupancy check
+
+Пустой индекс при существующих бронированиях заполняется при старте (app.core.schema).
+"""
+import argparse
+import sys
+from datetime import date, timedelta
+from typing import Any, Dict, List
+from uuid import UUID
+
+from sqlalchemy import Date, cast, delete, func, insert, literal_column, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from .models import ACTIVE_BOOKING_STATUSES, Booking, RoomNight
+
+def stay_nights(check_in: date, check_out: date) -> List[date]:
+    """Ночи проживания: от даты заезда включительно до даты выезда не включительно"""
+    return [check_in + timedelta(days=offset) for offset in range((check_out - check_in).days)]
+
+def room_nights_occupied(room_id_column, check_in: date, check_out: date):
+    """EXISTS-условие: хотя бы одна ночь номера в интервале уже занята"""
+    return select(RoomNight.room_id).where(
+        RoomNight.room_id == room_id_column,
+        RoomNight.night >= check_in,
+        RoomNight.night < check_out
+    ).exists()
+
+def occupy_room_nights(db: Session, *bookings: Booking) -> None:
+    """Занимает ночи бронирований в индексе одной вставкой (без коммита)"""
+    rows = [
+        {"room_id": booking.room_id, "night": night, "booking_id": booking.id}
+        for booking in bookings
+        for night in stay_nights(booking.check_in_date, booking.check_out_date)
+    ]
+    if rows:
+        db.execute(insert(RoomNight), rows)
+
+def release_room_nights(db: Session, booking_id: UUID) -> None:
+    """Освобождает ночи бронирования в индексе (без коммита)"""
+    db.execute(delete(RoomNight).where(RoomNight.booking_id == booking_id))
+
+def sync_booking_occupancy(db: Session, booking: Booking, previous_status: str) -> bool:
+    """Приводит индекс в соответствие со сменой статуса бронирования; True, если занятость изменилась"""
+    was_active = previous_status in ACTIVE_BOOKING_STATUSES
+    is_active = booking.status in ACTIVE_BOOKING_STATUSES
+    if was_active and not is_active:
+        release_room_nights(db, booking.id)
+    elif is_active and not was_active:
+        occupy_room_nights(db, booking)
+    return was_active != is_active
+
+def _expected_room_nights():
+    """Ночи, которые должны быть в индексе по данным таблицы bookings"""
+    night = func.generate_series(
+        Booking.check_in_date,
+        Booking.check_out_date - 1,
+        literal_column("interval '1 day'")
+    )
+    return select(
+        Booking.room_id.label("room_id"),
+        cast(night, Date).label("night"),
+        Booking.id.label("booking_id")
+    ).where(Booking.status.in_(ACTIVE_BOOKING_STATUSES))
+
+def room_nights_backfill_statement():
+    """Вставка ночей всех активных бронирований в индекс.
+
+    Пересекающиеся активные бронирования (если они уже есть в данных) не должны
+    ломать вставку - их покажет проверка согласованности.
+    """
+    return pg_insert(RoomNight).from_select(
+        ["room_id", "night", "booking_id"], _expected_room_nights()
+    ).on_conflict_do_nothing()
+
+def rebuild_occupancy_index(db: Session) -> int:
+    """Полностью пересобирает индекс занятости из существующих бронирований"""
+    db.execute(delete(RoomNight))
+    result = db.execute(room_nights_backfill_statement())
+    db.commit()
+    return result.rowcount
+
+def check_occupancy_consistency(db: Session, sample_size: int = 20) -> Dict[str, Any]:
+    """Сравнивает индекс с бронированиями и возвращает расхождения"""
+    expected = _expected_room_nights().subquery("expected")
+    actual = select(RoomNight.room_id, RoomNight.night, RoomNight.booking_id)
+
+    missing = select(expected.c.room_id, expected.c.night, expected.c.booking_id)\
+        .except_(actual).subquery("missing")
+    orphaned = actual.except_(
+        select(expected.c.room_id, expected.c.night, expected.c.booking_id)
+    ).subquery("orphaned")
+    # Ночи, на которые претендуют несколько активных бронирований
+    double_booked = select(expected.c.room_id, expected.c.night)\
+        .group_by(expected.c.room_id, expected.c.night)\
+        .having(func.count() > 1).subquery("double_booked")
+
+    report = {}
+    for name, subquery in (("missing", missing), ("orphaned", orphaned), ("double_booked", double_booked)):
+        report[f"{name}_count"] = db.execute(select(func.count()).select_from(subquery)).scalar()
+        report[name] = [dict(row._mapping) for row in db.execute(select(subquery).limit(sample_size))]
+    report["consistent"] = not (report["missing_count"] or report["orphaned_count"])
+    return report
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Обслуживание индекса занятости номеров")
+    parser.add_argument("command", choices=["rebuild", "check"])
+    args = parser.parse_args(argv)
+
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        if args.command == "rebuild":
+            rows = rebuild_occupancy_index(db)
+            print(f"Occupancy index rebuilt: {rows} room-nights")
+            return 0
+
+        report = check_occupancy_consistency(db)
+        for key in ("missing", "orphaned", "double_booked"):
+            print(f"{key}: {report[key + '_count']}")
+            for row in report[key]:
+                print(f"  {row}")
+        return 0 if report["consistent"] else 1
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from uuid import UUID
@@ -10,9 +11,11 @@ from app.modules.auth.models import User
 from app.modules.users.dependencies import get_current_admin_user
 from app.modules.hotels.dependencies import get_hotel_manager
 from app.modules.hotels.models import Hotel
-from . import services, schemas, models
-from .dependencies import get_booking_for_user, get_booking_for_hotel_manager
+from . import services, schemas, models, export
+from .dependencies import get_booking_for_user, get_booking_for_hotel_manager, get_booking_search
 from app.shared.schemas import UserShortInfo
+from app.core.serialization import json_response
+from app.shared.pagination import NEXT_CURSOR_HEADER
 
 router = APIRouter()
 
@@ -25,17 +28,40 @@ def create_booking(
 ):
     try:
         return services.create_booking(db, booking_data, current_user.id)
+    except services.BookingConflictError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/group", response_model=List[schemas.BookingResponse])
+def create_group_booking(
+    booking_data: schemas.GroupBookingCreate,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Бронирование нескольких номеров одного отеля на одни даты (все или ни одного)"""
+    try:
+        return services.create_group_booking(db, booking_data, current_user.id)
+    except services.BookingConflictError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/my-bookings", response_model=List[schemas.BookingResponse])
-async def get_my_bookings(
+def get_my_bookings(
+    search: schemas.BookingSearch = Depends(get_booking_search),
+    cursor: Optional[str] = Query(None, description="Курсор из заголовка X-Next-Cursor"),
+    limit: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db),
     current_user: UserShortInfo = Depends(get_current_user)
 ):
-    """Получить мои бронирования"""
-    bookings = services.get_user_bookings(db, current_user.id)
-    return bookings
+    """Получить мои бронирования (новые первыми, постранично)"""
+    try:
+        bookings, next_cursor = services.get_user_bookings(db, current_user.id, search, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return json_response(List[schemas.BookingResponse], bookings, headers)
 
 @router.get("/{booking_id}", response_model=schemas.BookingResponse)  # Используем BookingResponse
 def get_booking(
@@ -66,13 +92,33 @@ def cancel_booking(
 def get_hotel_bookings(
     hotel_id: UUID,
     hotel: Hotel = Depends(get_hotel_manager),
-    status: Optional[str] = Query(None),
+    search: schemas.BookingSearch = Depends(get_booking_search),
+    cursor: Optional[str] = Query(None, description="Курсор из заголовка X-Next-Cursor"),
+    limit: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db)
 ):
-    bookings = services.get_hotel_bookings(db, hotel_id)
-    if status:
-        bookings = [b for b in bookings if b.status == status]
-    return bookings
+    try:
+        bookings, next_cursor = services.get_hotel_bookings(db, hotel_id, search, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return json_response(List[schemas.BookingResponse], bookings, headers)
+
+@router.get("/hotel/{hotel_id}/bookings/export")
+def export_hotel_bookings(
+    hotel_id: UUID,
+    hotel: Hotel = Depends(get_hotel_manager),
+    search: schemas.BookingSearch = Depends(get_booking_search),
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    db: Session = Depends(get_db)
+):
+    """Потоковая выгрузка истории бронирований отеля (NDJSON или CSV)"""
+    search = search.copy(update={"hotel_id": hotel_id})
+    return StreamingResponse(
+        export.stream_booking_export(db, search, format),
+        media_type=export.EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="bookings-{hotel_id}.{format}"'}
+    )
 
 @router.put("/{booking_id}/status", response_model=schemas.BookingResponse)
 def update_booking_status(
@@ -84,7 +130,10 @@ def update_booking_status(
     if status_update.status not in ['pending', 'confirmed', 'cancelled', 'completed']:
         raise HTTPException(status_code=400, detail="Invalid status")
     
-    updated_booking = services.update_booking_status(db, booking.id, status_update.status)
+    try:
+        updated_booking = services.update_booking_status(db, booking.id, status_update.status)
+    except services.BookingConflictError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     if not updated_booking:
         raise HTTPException(status_code=404, detail="Booking not found")
     return updated_booking
@@ -127,11 +176,17 @@ def check_availability(
     check_out: date,
     db: Session = Depends(get_db)
 ):
-    is_available = services.check_room_availability(db, room_id, check_in, check_out)
-    price = services.calculate_booking_price(db, room_id, check_in, check_out, 1)  # Базовый расчет для 1 гостя
+    if check_out <= check_in:
+        raise HTTPException(status_code=400, detail="Invalid date range")
+    
+    quote = services.get_room_stay_quote(db, room_id, check_in, check_out)
+    if quote is None:
+        raise HTTPException(status_code=404, detail="Room not found")
+    
+    is_available = quote.is_available and services.check_room_availability(db, room_id, check_in, check_out)
     
     return {
         "available": is_available,
-        "estimated_price": price,
-        "nights": (check_out - check_in).days
+        "estimated_price": quote.total_price,
+        "nights": quote.nights
     }
\ No newline at end of file
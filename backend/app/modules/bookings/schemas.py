@@ -26,6 +26,15 @@ class PaymentBase(BaseModel):
 class BookingCreate(BookingBase):
     room_id: UUID
 
+class GroupBookingRooms(BaseModel):
+    room_type_id: UUID
+    count: int = Field(gt=0, le=100)
+
+class GroupBookingCreate(BookingBase):
+    """Несколько номеров одного отеля на одни даты; number_of_guests - гостей в каждом номере"""
+    hotel_id: UUID
+    rooms: List[GroupBookingRooms] = Field(min_length=1)
+
 class PaymentCreate(PaymentBase):
     booking_id: UUID
 
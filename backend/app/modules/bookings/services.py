@@ -1,52 +1,129 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
 from datetime import date, datetime, timedelta
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_, func, select, values, column, true, Integer
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.exc import IntegrityError
 
+from app.core.config import settings
+from app.shared.pagination import keyset_page, split_page
 from . import models, schemas
+from .occupancy import room_nights_occupied, occupy_room_nights, sync_booking_occupancy
 from app.modules.hotels.models import Room, RoomType, Hotel
+from app.modules.hotels.pricing import StayQuote, get_stay_quotes
+from app.modules.hotels.calendar import invalidate_availability_calendar
+from app.modules.hotels.popularity import record_booking_status_change, invalidate_destinations_cache
 
-def get_user_bookings(db: Session, user_id: UUID) -> List[models.Booking]:
-    """Получает все бронирования пользователя с загрузкой связанных данных"""
-    return db.query(models.Booking).options(
-            # Загружаем связанные данные для избежания N+1 запросов
-            joinedload(models.Booking.room)
-                .joinedload(Room.room_type),
-            joinedload(models.Booking.room)
-                .joinedload(Room.hotel),  # Загружаем отель через номер
-            joinedload(models.Booking.guest),
-            joinedload(models.Booking.payments)
-        ).filter(models.Booking.guest_id == user_id).order_by(models.Booking.created_at.desc()).all()
-
-def get_hotel_bookings(db: Session, hotel_id: UUID) -> List[models.Booking]:
-    """Получает все бронирования отеля с загрузкой связанных данных"""
-    return db.query(models.Booking).join(Room).options(
-            joinedload(models.Booking.room).joinedload(Room.room_type),  # Используем Room из hotels
-            joinedload(models.Booking.room).joinedload(Room.hotel),      # Используем Room из hotels
-            joinedload(models.Booking.guest),
-            joinedload(models.Booking.payments)
-        ).filter(Room.hotel_id == hotel_id).order_by(models.Booking.created_at.desc()).all()
+class BookingConflictError(ValueError):
+    """Номер уже занят на выбранные даты"""
+
+def _is_room_night_conflict(exc: IntegrityError) -> bool:
+    # psycopg2 отдает имя ограничения в diag, asyncpg - в исходном исключении драйвера
+    source = getattr(exc.orig, "diag", None) or exc.orig.__cause__
+    return getattr(source, "constraint_name", None) == "room_nights_pkey"
+
+def room_conflict_exists(room_id_column, check_in: date, check_out: date):
+    """EXISTS-условие: у номера есть активное бронирование, пересекающееся с датами"""
+    if settings.USE_OCCUPANCY_INDEX:
+        return room_nights_occupied(room_id_column, check_in, check_out)
+    return select(models.Booking.id).where(
+        models.Booking.room_id == room_id_column,
+        models.Booking.status.in_(models.ACTIVE_BOOKING_STATUSES),
+        models.Booking.check_in_date < check_out,
+        models.Booking.check_out_date > check_in
+    ).exists()
+
+def booking_load_options():
+    """Загрузка связанных данных бронирования для избежания N+1 запросов"""
+    return (
+        joinedload(models.Booking.room).joinedload(Room.room_type),
+        joinedload(models.Booking.room).joinedload(Room.hotel),  # Загружаем отель через номер
+        joinedload(models.Booking.guest),
+        joinedload(models.Booking.payments)
+    )
+
+def booking_search_conditions(search: schemas.BookingSearch) -> list:
+    """Условия фильтров BookingSearch (для hotel_id запрос должен быть соединен с Room).
+
+    date_from/date_to отбирают бронирования, проживание по которым пересекается с периодом.
+    """
+    conditions = []
+    if search.hotel_id:
+        conditions.append(Room.hotel_id == search.hotel_id)
+    if search.guest_id:
+        conditions.append(models.Booking.guest_id == search.guest_id)
+    if search.status:
+        conditions.append(models.Booking.status == search.status)
+    if search.date_from:
+        conditions.append(models.Booking.check_out_date > search.date_from)
+    if search.date_to:
+        conditions.append(models.Booking.check_in_date <= search.date_to)
+    return conditions
+
+def bookings_statement(search: schemas.BookingSearch):
+    """Бронирования по фильтрам BookingSearch (без сортировки и лимита)"""
+    statement = select(models.Booking).options(*booking_load_options())
+    if search.hotel_id:
+        statement = statement.join(Room)
+    return statement.where(*booking_search_conditions(search))
+
+def bookings_page_statement(search: schemas.BookingSearch, cursor: Optional[str] = None, limit: int = 50):
+    return keyset_page(bookings_statement(search), models.Booking, cursor, limit)
+
+def booking_statement(booking_id: UUID):
+    return select(models.Booking).options(*booking_load_options())\
+        .where(models.Booking.id == booking_id)
+
+def get_bookings_page(
+    db: Session,
+    search: schemas.BookingSearch,
+    cursor: Optional[str] = None,
+    limit: int = 50
+) -> Tuple[List[models.Booking], Optional[str]]:
+    """Страница бронирований с загрузкой связанных данных и курсор следующей страницы"""
+    rows = db.execute(bookings_page_statement(search, cursor, limit)).unique().scalars().all()
+    return split_page(rows, limit)
+
+def get_user_bookings(
+    db: Session,
+    user_id: UUID,
+    search: Optional[schemas.BookingSearch] = None,
+    cursor: Optional[str] = None,
+    limit: int = 50
+) -> Tuple[List[models.Booking], Optional[str]]:
+    """Получает страницу бронирований пользователя"""
+    search = (search or schemas.BookingSearch()).copy(update={"guest_id": user_id})
+    return get_bookings_page(db, search, cursor, limit)
+
+def get_hotel_bookings(
+    db: Session,
+    hotel_id: UUID,
+    search: Optional[schemas.BookingSearch] = None,
+    cursor: Optional[str] = None,
+    limit: int = 50
+) -> Tuple[List[models.Booking], Optional[str]]:
+    """Получает страницу бронирований отеля"""
+    search = (search or schemas.BookingSearch()).copy(update={"hotel_id": hotel_id})
+    return get_bookings_page(db, search, cursor, limit)
 
 def check_room_availability(db: Session, room_id: UUID, check_in: date, check_out: date) -> bool:
     """Проверяет доступность номера на указанные даты"""
-    conflicting_bookings = db.query(models.Booking).filter(
-        models.Booking.room_id == room_id,
-        models.Booking.status.in_(['pending', 'confirmed']),
-        or_(
-            and_(models.Booking.check_in_date < check_out, models.Booking.check_out_date > check_in)
-        )
-    ).count()
-    
-    return conflicting_bookings == 0
+    return not db.execute(select(room_conflict_exists(room_id, check_in, check_out))).scalar()
+
+def get_room_stay_quote(db: Session, room_id: UUID, check_in: date, check_out: date) -> Optional[StayQuote]:
+    """Стоимость проживания в номере по календарю цен и открыт ли он для продажи на эти ночи"""
+    room = db.get(Room, room_id)
+    if not room:
+        return None
+    return get_stay_quotes(db, [room.room_type_id], check_in, check_out)[room.room_type_id]
 
 def calculate_booking_price(db: Session, room_id: UUID, check_in: date, check_out: date, guests: int) -> float:
-    """Рассчитывает общую стоимость бронирования"""
-    room = db.query(Room).filter(Room.id == room_id).first()  # Используем Room из hotels
+    """Рассчитывает общую стоимость бронирования по календарю цен"""
+    room = db.get(Room, room_id)  # Используем Room из hotels (после блокировки берется из сессии)
     if not room:
         raise ValueError("Room not found")
     
-    # Простой расчет: цена за ночь * количество ночей
     nights = (check_out - check_in).days
     if nights <= 0:
         raise ValueError("Invalid date range")
@@ -55,21 +132,35 @@ def calculate_booking_price(db: Session, room_id: UUID, check_in: date, check_ou
     if guests > room.room_type.capacity:
         raise ValueError(f"Room capacity is {room.room_type.capacity} guests")
     
-    total_price = room.room_type.base_price * nights
-    return total_price
+    quote = get_stay_quotes(db, [room.room_type_id], check_in, check_out)[room.room_type_id]
+    if not quote.is_available:
+        raise ValueError("Room type is closed for sale on some of the selected dates")
+    return quote.total_price
 
 def create_booking(db: Session, booking_data: schemas.BookingCreate, guest_id: UUID) -> models.Booking:
     """Создает новое бронирование"""
+    # Блокируем строку номера до конца транзакции, чтобы параллельные
+    # бронирования того же номера проверяли доступность по очереди
+    room = db.query(Room).filter(Room.id == booking_data.room_id).with_for_update().first()
+    if not room:
+        db.rollback()
+        raise ValueError("Room not found")
+    
     # Проверяем доступность номера
     if not check_room_availability(db, booking_data.room_id, booking_data.check_in_date, booking_data.check_out_date):
-        raise ValueError("Room is not available for the selected dates")
+        db.rollback()
+        raise BookingConflictError("Room is not available for the selected dates")
     
     # Рассчитываем цену
-    total_price = calculate_booking_price(
-        db, booking_data.room_id, 
-        booking_data.check_in_date, booking_data.check_out_date,
-        booking_data.number_of_guests
-    )
+    try:
+        total_price = calculate_booking_price(
+            db, booking_data.room_id, 
+            booking_data.check_in_date, booking_data.check_out_date,
+            booking_data.number_of_guests
+        )
+    except ValueError:
+        db.rollback()
+        raise
     
     # Создаем бронирование
     db_booking = models.Booking(
@@ -79,34 +170,147 @@ def create_booking(db: Session, booking_data: schemas.BookingCreate, guest_id: U
         status='pending'
     )
     
-    db.add(db_booking)
-    db.commit()
+    try:
+        db.add(db_booking)
+        db.flush()
+        # Первичный ключ room_nights не даст занять ночь дважды,
+        # даже если блокировка номера была обойдена
+        occupy_room_nights(db, db_booking)
+        db.commit()
+    except IntegrityError as exc:
+        db.rollback()
+        if _is_room_night_conflict(exc):
+            raise BookingConflictError("Room is not available for the selected dates")
+        raise
+    
+    invalidate_availability_calendar(room.hotel_id)
     db.refresh(db_booking)
     return db_booking
 
+def free_rooms_statement(hotel_id: UUID, requested: Dict[UUID, int], check_in: date, check_out: date, guests: int):
+    """Первые свободные номера каждого запрошенного типа (не больше нужного количества).
+
+    Номера блокируются FOR UPDATE SKIP LOCKED внутри LATERAL-подзапроса: занятые
+    параллельным бронированием номера пропускаются, и берется следующий свободный.
+    """
+    requests = values(
+        column("room_type_id", PG_UUID(as_uuid=True)),
+        column("count", Integer),
+        name="requested"
+    ).data(list(requested.items()))
+    
+    # Во FROM только rooms, поэтому блокируются только строки номеров
+    rooms = select(Room.id.label("room_id"), Room.room_type_id.label("room_type_id"))\
+        .where(
+            Room.hotel_id == hotel_id,
+            Room.room_type_id == requests.c.room_type_id,
+            Room.room_type_id.in_(select(RoomType.id).where(RoomType.capacity >= guests)),
+            Room.is_available == True,
+            ~room_conflict_exists(Room.id, check_in, check_out)
+        )\
+        .order_by(Room.room_number)\
+        .limit(requests.c.count)\
+        .with_for_update(skip_locked=True)\
+        .lateral("free_rooms")
+    
+    return select(rooms.c.room_id, rooms.c.room_type_id).select_from(requests).join(rooms, true())
+
+def create_group_booking(db: Session, booking_data: schemas.GroupBookingCreate, guest_id: UUID) -> List[models.Booking]:
+    """Создает бронирования нескольких номеров одной транзакцией: либо все, либо ни одного"""
+    check_in, check_out = booking_data.check_in_date, booking_data.check_out_date
+    requested = {}
+    for item in booking_data.rooms:
+        requested[item.room_type_id] = requested.get(item.room_type_id, 0) + item.count
+    
+    quotes = get_stay_quotes(db, requested, check_in, check_out)
+    for room_type_id in requested:
+        if room_type_id not in quotes:
+            db.rollback()
+            raise ValueError(f"Room type not found: {room_type_id}")
+        if not quotes[room_type_id].is_available:
+            db.rollback()
+            raise BookingConflictError(f"Room type {room_type_id} is closed for sale on some of the selected dates")
+    
+    # Подбираем и блокируем свободные номера всех типов одним запросом
+    allocated = db.execute(
+        free_rooms_statement(booking_data.hotel_id, requested, check_in, check_out, booking_data.number_of_guests)
+    ).all()
+    
+    allocated_counts = {}
+    for _, room_type_id in allocated:
+        allocated_counts[room_type_id] = allocated_counts.get(room_type_id, 0) + 1
+    shortages = [
+        f"{room_type_id}: {allocated_counts.get(room_type_id, 0)} of {count}"
+        for room_type_id, count in requested.items()
+        if allocated_counts.get(room_type_id, 0) < count
+    ]
+    if shortages:
+        db.rollback()
+        raise BookingConflictError("Not enough free rooms for the selected dates (" + ", ".join(shortages) + ")")
+    
+    booking_fields = booking_data.dict(exclude={"hotel_id", "rooms"})
+    bookings = [
+        models.Booking(
+            **booking_fields,
+            room_id=room_id,
+            guest_id=guest_id,
+            total_price=quotes[room_type_id].total_price,
+            status='pending'
+        )
+        for room_id, room_type_id in allocated
+    ]
+    
+    try:
+        db.add_all(bookings)
+        db.flush()
+        occupy_room_nights(db, *bookings)
+        db.commit()
+    except IntegrityError as exc:
+        db.rollback()
+        if _is_room_night_conflict(exc):
+            raise BookingConflictError("Room is not available for the selected dates")
+        raise
+    
+    invalidate_availability_calendar(booking_data.hotel_id)
+    booking_ids = [booking.id for booking in bookings]
+    return db.execute(
+        select(models.Booking).options(*booking_load_options())
+        .where(models.Booking.id.in_(booking_ids))
+        .order_by(models.Booking.created_at, models.Booking.id)
+    ).unique().scalars().all()
+
 def get_booking(db: Session, booking_id: UUID) -> Optional[models.Booking]:
     """Получает бронирование по ID"""
-    return db.query(models.Booking)\
-        .options(
-            joinedload(models.Booking.room).joinedload(Room.room_type),
-            joinedload(models.Booking.room).joinedload(Room.hotel),
-            joinedload(models.Booking.guest),
-            joinedload(models.Booking.payments)
-        )\
-        .filter(models.Booking.id == booking_id)\
-        .first()
+    return db.execute(booking_statement(booking_id)).unique().scalars().first()
 
 def update_booking_status(db: Session, booking_id: UUID, status: str) -> Optional[models.Booking]:
     """Обновляет статус бронирования"""
-    db_booking = db.query(models.Booking).filter(models.Booking.id == booking_id).first()
+    # Блокируем строку, чтобы параллельные смены статуса не посчитали переход дважды.
+    # populate_existing: бронирование уже в сессии (его загрузила зависимость), и без
+    # перечитывания previous_status был бы значением до ожидания блокировки
+    db_booking = db.query(models.Booking).filter(models.Booking.id == booking_id)\
+        .with_for_update().populate_existing().first()
     if not db_booking:
         return None
     
+    previous_status = db_booking.status
     db_booking.status = status
     if status == 'cancelled':
         db_booking.cancelled_at = datetime.utcnow()
     
-    db.commit()
+    try:
+        occupancy_changed = sync_booking_occupancy(db, db_booking, previous_status)
+        popularity_changed = record_booking_status_change(db, db_booking, previous_status)
+        db.commit()
+    except IntegrityError as exc:
+        db.rollback()
+        if _is_room_night_conflict(exc):
+            raise BookingConflictError("Room is not available for the booking dates")
+        raise
+    if popularity_changed:
+        invalidate_destinations_cache()
+    if occupancy_changed:
+        invalidate_availability_calendar(db_booking.room.hotel_id)
     db.refresh(db_booking)
     return db_booking
 
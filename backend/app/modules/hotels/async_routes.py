@@ -0,0 +1,221 @@
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from uuid import UUID
+from datetime import date
+
+from app.core.database import get_async_db
+from app.core.response_cache import response_cache
+from app.core.serialization import dump_json, json_response
+from app.modules.auth.dependencies import get_current_active_user
+from app.modules.auth.models import User
+from app.modules.users.dependencies import get_current_admin_user
+from . import async_services, imports, models, schemas
+from .calendar import calendar_cache_namespace
+from .services import DESTINATIONS_CACHE, ROOM_TYPES_CACHE, hotel_cache_namespace, hotel_details_result
+from .dependencies import get_hotel_manager_async, get_hotel_owner_or_admin, get_search_filters
+
+# Асинхронные версии эндпоинтов (подключаются при DB_ASYNC).
+# Порядок маршрутов повторяет routes.py: статические пути идут раньше /{hotel_id}.
+router = APIRouter()
+
+@router.get("/availability/{hotel_id}", response_model=schemas.HotelAvailabilityResponse)
+async def get_hotel_availability(
+    hotel_id: UUID,
+    check_in: date,
+    check_out: date,
+    guests: int = Query(1, ge=1),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Получает детальную информацию о доступности номеров в конкретном отеле"""
+    availability = await async_services.get_hotel_availability(db, hotel_id, check_in, check_out, guests)
+    if "error" in availability:
+        raise HTTPException(status_code=404, detail=availability["error"])
+    return availability
+
+@router.get("/destinations/popular", response_model=List[schemas.PopularDestination])
+async def get_popular_destinations(
+    request: Request,
+    limit: int = Query(10, le=50),
+    window_days: Optional[int] = Query(None, ge=1, le=365, description="Учитывать бронирования за последние N дней"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Получает популярные направления"""
+    cached, slot = response_cache.get(DESTINATIONS_CACHE, f"limit={limit}:window={window_days}")
+    if cached is None:
+        destinations = await async_services.get_popular_destinations(db, limit, window_days)
+        cached = response_cache.set(slot, dump_json(List[schemas.PopularDestination], destinations))
+    return cached.to_response(request)
+
+@router.get("/destinations/autocomplete", response_model=List[schemas.DestinationSuggestion])
+async def autocomplete_destinations(
+    q: str = Query(..., min_length=1, max_length=100, description="Начало названия города или страны"),
+    limit: int = Query(10, ge=1, le=20),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Подсказки направлений для строки поиска (префикс и опечатки)"""
+    return json_response(List[schemas.DestinationSuggestion], await async_services.autocomplete_destinations(db, q.strip(), limit))
+
+@router.get("/search", response_model=List[schemas.HotelSearchResult])
+async def search_hotels(
+    filters: schemas.SearchFilters = Depends(get_search_filters),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return json_response(List[schemas.HotelSearchResult], await async_services.search_hotels(db, filters))
+
+@router.get("/search/faceted", response_model=schemas.HotelSearchPage)
+async def search_hotels_faceted(
+    filters: schemas.SearchFilters = Depends(get_search_filters),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Поиск с общим числом отелей и счетчиками удобств (facets) по всей выдаче"""
+    return json_response(schemas.HotelSearchPage, await async_services.search_hotels_faceted(db, filters))
+
+@router.get("/room-types/", response_model=List[schemas.RoomTypeResponse])
+async def get_room_types(request: Request, db: AsyncSession = Depends(get_async_db)):
+    cached, slot = response_cache.get(ROOM_TYPES_CACHE, "all")
+    if cached is None:
+        room_types = await async_services.get_room_types(db)
+        cached = response_cache.set(slot, dump_json(List[schemas.RoomTypeResponse], room_types))
+    return cached.to_response(request)
+
+@router.get("/my/hotels", response_model=List[schemas.HotelResponse])
+async def get_my_hotels(
+    current_user: User = Depends(get_hotel_owner_or_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return json_response(List[schemas.HotelResponse], await async_services.get_user_hotels(db, current_user.id))
+
+@router.get("/{hotel_id}", response_model=schemas.HotelDetailResponse)
+async def get_hotel_details(
+    hotel_id: UUID,
+    request: Request,
+    expand: Optional[str] = Query(None, pattern="^rooms$", description="rooms - добавить страницу номеров"),
+    rooms_skip: int = Query(0, ge=0),
+    rooms_limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Карточка отеля; номера с типами - только при expand=rooms, постранично"""
+    cache_key = f"detail:rooms:{rooms_skip}:{rooms_limit}" if expand else "detail"
+    cached, slot = response_cache.get(hotel_cache_namespace(hotel_id), cache_key)
+    if cached is None:
+        hotel = await async_services.get_hotel(db, hotel_id)
+        if not hotel or not hotel.is_active:
+            raise HTTPException(status_code=404, detail="Hotel not found")
+        rooms_page = await async_services.get_hotel_rooms_page(db, hotel_id, rooms_skip, rooms_limit) if expand else None
+        details = hotel_details_result(hotel, rooms_page)
+        cached = response_cache.set(slot, dump_json(schemas.HotelDetailResponse, details))
+    return cached.to_response(request)
+
+@router.get("/{hotel_id}/calendar", response_model=schemas.AvailabilityCalendar)
+async def get_availability_calendar(
+    hotel_id: UUID,
+    request: Request,
+    start: Optional[date] = Query(None, description="Первая ночь окна, по умолчанию сегодня"),
+    days: int = Query(30, ge=1, le=90),
+    guests: int = Query(1, ge=1),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Свободные номера по типам на каждую ночь окна (для выбора дат)"""
+    start = start or date.today()
+    cached, slot = response_cache.get(calendar_cache_namespace(hotel_id), f"{start}:{days}:{guests}")
+    if cached is None:
+        calendar = await async_services.get_availability_calendar(db, hotel_id, start, days, guests)
+        if calendar is None:
+            raise HTTPException(status_code=404, detail="Hotel not found")
+        cached = response_cache.set(slot, dump_json(schemas.AvailabilityCalendar, calendar))
+    return cached.to_response(request)
+
+# Hotel management endpoints
+@router.post("/", response_model=schemas.HotelResponse)
+async def create_hotel(
+    hotel_data: schemas.HotelCreate,
+    current_user: User = Depends(get_hotel_owner_or_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await async_services.create_hotel(db, hotel_data, current_user.id)
+
+@router.put("/{hotel_id}", response_model=schemas.HotelResponse)
+async def update_hotel(
+    hotel_id: UUID,
+    hotel_update: schemas.HotelUpdate,
+    hotel: models.Hotel = Depends(get_hotel_manager_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    updated_hotel = await async_services.update_hotel(db, hotel_id, hotel_update)
+    if not updated_hotel:
+        raise HTTPException(status_code=404, detail="Hotel not found")
+    return updated_hotel
+
+# Room Type management
+@router.post("/room-types/", response_model=schemas.RoomTypeResponse)
+async def create_room_type(
+    room_type_data: schemas.RoomTypeCreate,
+    current_user: User = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await async_services.create_room_type(db, room_type_data)
+
+@router.put("/room-types/pricing", response_model=schemas.RateCalendarResult)
+async def upload_rate_calendar(
+    upload: schemas.RateCalendarUpload,
+    current_user: User = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Массовая загрузка календаря цен: диапазоны и/или дни по типам номеров"""
+    try:
+        return await async_services.upsert_rate_calendar(db, upload)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+# Room management
+@router.post("/{hotel_id}/rooms", response_model=schemas.RoomResponse)
+async def create_room(
+    hotel_id: UUID,
+    room_data: schemas.RoomCreate,
+    hotel: models.Hotel = Depends(get_hotel_manager_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await async_services.create_room(db, room_data, hotel_id)
+
+@router.post("/{hotel_id}/rooms/import", response_model=schemas.RoomImportResult)
+async def import_rooms(
+    hotel_id: UUID,
+    upload: schemas.RoomImport,
+    hotel: models.Hotel = Depends(get_hotel_manager_async),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Массовый импорт номеров (и типов номеров для администраторов) с ошибками по строкам"""
+    try:
+        return await async_services.import_rooms(db, hotel, upload, can_create_room_types=current_user.role == 'admin')
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/{hotel_id}/rooms/import/csv", response_model=schemas.RoomImportResult)
+async def import_rooms_csv(
+    hotel_id: UUID,
+    rooms: UploadFile = File(..., description="room_number,floor,is_available,room_type_id|room_type"),
+    room_types: Optional[UploadFile] = File(None, description="name,description,base_price,capacity,amenities,size_sqm,bed_type"),
+    hotel: models.Hotel = Depends(get_hotel_manager_async),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """То же, что и импорт JSON, но из CSV-файлов (удобства через ';')"""
+    try:
+        upload = imports.room_import_from_csv(await rooms.read(), await room_types.read() if room_types else None)
+        return await async_services.import_rooms(db, hotel, upload, can_create_room_types=current_user.role == 'admin')
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.put("/rooms/{room_id}", response_model=schemas.RoomResponse)
+async def update_room(
+    room_id: UUID,
+    room_update: schemas.RoomUpdate,
+    current_user: User = Depends(get_hotel_owner_or_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    updated_room = await async_services.update_room(db, room_id, room_update)
+    if not updated_room:
+        raise HTTPException(status_code=404, detail="Room not found")
+    return updated_room
@@ -0,0 +1,169 @@
+from typing import List, Optional, Dict, Any, Tuple
+from uuid import UUID
+from datetime import date
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.core.response_cache import response_cache
+from . import imports, models, pricing, schemas
+from .calendar import availability_calendar_result, availability_calendar_statement, invalidate_availability_calendar
+from .services import (
+    ROOM_TYPES_CACHE, hotel_cache_namespace,
+    search_statement, search_row_to_result, search_page_result, available_rooms_statement,
+    hotel_availability_result, popular_destinations_statement, hotel_rooms_load_options,
+    hotel_rooms_page_statement, hotel_rooms_count_statement,
+    destination_autocomplete_statement, similarity_threshold_statement
+)
+
+# Асинхронные версии сервисов отелей (DB_ASYNC).
+# Запросы строятся теми же функциями, что и в синхронных сервисах; пакетные
+# загрузки (календарь цен, импорт номеров) выполняются синхронным кодом через run_sync.
+async def get_hotel(db: AsyncSession, hotel_id: UUID) -> Optional[models.Hotel]:
+    return await db.get(models.Hotel, hotel_id)
+
+async def get_hotel_rooms_page(db: AsyncSession, hotel_id: UUID, skip: int = 0, limit: int = 50) -> Tuple[List[models.Room], int]:
+    """Страница номеров отеля и общее число номеров"""
+    rooms = (await db.execute(hotel_rooms_page_statement(hotel_id, skip, limit))).scalars().all()
+    total = (await db.execute(hotel_rooms_count_statement(hotel_id))).scalar_one()
+    return rooms, total
+
+async def get_user_hotels(db: AsyncSession, manager_id: UUID) -> List[models.Hotel]:
+    result = await db.execute(
+        select(models.Hotel).options(*hotel_rooms_load_options()).where(models.Hotel.manager_id == manager_id)
+    )
+    return result.scalars().all()
+
+async def search_hotels(db: AsyncSession, filters: schemas.SearchFilters) -> List[Dict[str, Any]]:
+    """Расширенный поиск отелей с учетом доступности номеров"""
+    if filters.q:
+        await db.execute(similarity_threshold_statement())
+    result = await db.execute(search_statement(filters))
+    return [search_row_to_result(row) for row in result.all()]
+
+async def search_hotels_faceted(db: AsyncSession, filters: schemas.SearchFilters) -> Dict[str, Any]:
+    """Поиск отелей вместе с total и фасетами удобств - одним запросом"""
+    if filters.q:
+        await db.execute(similarity_threshold_statement())
+    rows = (await db.execute(search_statement(filters, with_facets=True))).all()
+    if not rows and filters.skip:
+        # Страница за концом выдачи: total и фасеты берем по первой строке
+        first = filters.copy(update={"skip": 0, "limit": 1})
+        rows = (await db.execute(search_statement(first, with_facets=True))).all()
+        return {**search_page_result(rows), "items": []}
+    return search_page_result(rows)
+
+async def get_availability_calendar(db: AsyncSession, hotel_id: UUID, start: date, days: int, guests: int = 1) -> Optional[Dict[str, Any]]:
+    """Свободные номера по типам на каждую ночь окна; None, если отеля нет"""
+    if await db.get(models.Hotel, hotel_id) is None:
+        return None
+    rows = (await db.execute(availability_calendar_statement(hotel_id, start, days, guests))).all()
+    return availability_calendar_result(hotel_id, start, days, rows)
+
+async def get_hotel_availability(db: AsyncSession, hotel_id: UUID, check_in: date, check_out: date, guests: int = 1) -> Dict[str, Any]:
+    """Получает детальную информацию о доступности номеров в отеле"""
+    hotel = await db.get(models.Hotel, hotel_id)
+    if not hotel:
+        return {"error": "Hotel not found"}
+    
+    result = await db.execute(available_rooms_statement(hotel_id, check_in, check_out, guests))
+    return hotel_availability_result(hotel, result.all(), check_in, check_out, guests)
+
+async def get_popular_destinations(db: AsyncSession, limit: int = 10, window_days: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Получает популярные направления на основе количества бронирований"""
+    result = await db.execute(popular_destinations_statement(limit, window_days))
+    return [
+        {
+            "city": city,
+            "country": country,
+            "popularity": booking_count
+        }
+        for city, country, booking_count in result.all()
+    ]
+
+async def autocomplete_destinations(db: AsyncSession, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+    """Подсказки направлений по началу названия города/страны (с учетом опечаток)"""
+    await db.execute(similarity_threshold_statement())
+    result = await db.execute(destination_autocomplete_statement(query, limit))
+    return [dict(row._mapping) for row in result.all()]
+
+async def get_room_types(db: AsyncSession) -> List[models.RoomType]:
+    result = await db.execute(select(models.RoomType))
+    return result.scalars().all()
+
+async def get_hotel_with_rooms(db: AsyncSession, hotel_id: UUID) -> Optional[models.Hotel]:
+    """Отель вместе с номерами и их типами (для HotelResponse)"""
+    result = await db.execute(
+        select(models.Hotel).options(*hotel_rooms_load_options()).where(models.Hotel.id == hotel_id)
+    )
+    return result.scalars().first()
+
+async def create_hotel(db: AsyncSession, hotel_data: schemas.HotelCreate, manager_id: UUID) -> models.Hotel:
+    db_hotel = models.Hotel(**hotel_data.dict(), manager_id=manager_id)
+    db.add(db_hotel)
+    await db.commit()
+    response_cache.invalidate(hotel_cache_namespace(db_hotel.id))
+    return await get_hotel_with_rooms(db, db_hotel.id)
+
+async def update_hotel(db: AsyncSession, hotel_id: UUID, hotel_update: schemas.HotelUpdate) -> Optional[models.Hotel]:
+    db_hotel = await db.get(models.Hotel, hotel_id)
+    if not db_hotel:
+        return None
+    
+    update_data = hotel_update.dict(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(db_hotel, field, value)
+    
+    await db.commit()
+    response_cache.invalidate(hotel_cache_namespace(hotel_id))
+    return await get_hotel_with_rooms(db, hotel_id)
+
+async def create_room_type(db: AsyncSession, room_type_data: schemas.RoomTypeCreate) -> models.RoomType:
+    db_room_type = models.RoomType(**room_type_data.dict())
+    db.add(db_room_type)
+    await db.commit()
+    await db.refresh(db_room_type)
+    response_cache.invalidate(ROOM_TYPES_CACHE)
+    return db_room_type
+
+async def upsert_rate_calendar(db: AsyncSession, upload: schemas.RateCalendarUpload) -> Dict[str, int]:
+    """Календарь цен пачками upsert в одной транзакции (см. pricing.upsert_rate_calendar)"""
+    return await db.run_sync(pricing.upsert_rate_calendar, upload)
+
+async def get_room(db: AsyncSession, room_id: UUID) -> Optional[models.Room]:
+    """Номер вместе с типом (для RoomResponse)"""
+    result = await db.execute(
+        select(models.Room).options(selectinload(models.Room.room_type)).where(models.Room.id == room_id)
+    )
+    return result.scalars().first()
+
+async def create_room(db: AsyncSession, room_data: schemas.RoomCreate, hotel_id: UUID) -> models.Room:
+    db_room = models.Room(**room_data.dict(), hotel_id=hotel_id)
+    db.add(db_room)
+    await db.commit()
+    response_cache.invalidate(hotel_cache_namespace(hotel_id))
+    invalidate_availability_calendar(hotel_id)
+    return await get_room(db, db_room.id)
+
+async def import_rooms(
+    db: AsyncSession,
+    hotel: models.Hotel,
+    upload: schemas.RoomImport,
+    can_create_room_types: bool
+) -> Dict[str, Any]:
+    """Импорт типов номеров и номеров отеля (см. imports.import_rooms)"""
+    return await db.run_sync(imports.import_rooms, hotel, upload, can_create_room_types)
+
+async def update_room(db: AsyncSession, room_id: UUID, room_update: schemas.RoomUpdate) -> Optional[models.Room]:
+    db_room = await db.get(models.Room, room_id)
+    if not db_room:
+        return None
+    
+    update_data = room_update.dict(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(db_room, field, value)
+    
+    await db.commit()
+    response_cache.invalidate(hotel_cache_namespace(db_room.hotel_id))
+    invalidate_availability_calendar(db_room.hotel_id)
+    return await get_room(db, room_id)
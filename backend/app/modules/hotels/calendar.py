@@ -0,0 +1,98 @@
+"""Календарь доступности отеля для выбора дат.
+
+Число свободных номеров каждого типа на каждую ночь окна считается одним запросом:
+generate_series по ночам и одна агрегация по индексу занятости room_nights.
+Ночь, закрытая для продажи в календаре цен (pricing.is_available = false), дает
+0 свободных номеров этого типа - как и при бронировании (pricing.stay_available).
+Ответ кешируется по отелю и окну и сбрасывается при изменении бронирований,
+номеров отеля и календаря цен его типов номеров.
+"""
+from datetime import date, timedelta
+from typing import Any, Dict, List
+from uuid import UUID
+
+from sqlalchemy import Date, and_, case, cast, func, literal_column, select, true
+
+from app.core.response_cache import response_cache
+from app.modules.bookings.models import RoomNight
+from .models import Pricing, Room, RoomType
+
+def calendar_cache_namespace(hotel_id: UUID) -> str:
+    return f"calendar:{hotel_id}"
+
+def invalidate_availability_calendar(hotel_id: UUID) -> None:
+    response_cache.invalidate(calendar_cache_namespace(hotel_id))
+
+def availability_calendar_statement(hotel_id: UUID, start: date, days: int, guests: int = 1):
+    """Строки (тип номера, ночь, свободно) для ночей start .. start + days - 1"""
+    end = start + timedelta(days=days)
+    room_filter = (
+        Room.hotel_id == hotel_id,
+        Room.is_available == True,
+        RoomType.capacity >= guests
+    )
+    room_totals = select(
+        RoomType.id.label("room_type_id"),
+        RoomType.name.label("name"),
+        func.count(Room.id).label("rooms")
+    ).join(Room, Room.room_type_id == RoomType.id)\
+     .where(*room_filter)\
+     .group_by(RoomType.id, RoomType.name)\
+     .subquery("room_totals")
+
+    occupied = select(
+        Room.room_type_id.label("room_type_id"),
+        RoomNight.night.label("night"),
+        func.count().label("occupied")
+    ).join(RoomNight, RoomNight.room_id == Room.id)\
+     .join(RoomType, Room.room_type_id == RoomType.id)\
+     .where(*room_filter, RoomNight.night >= start, RoomNight.night < end)\
+     .group_by(Room.room_type_id, RoomNight.night)\
+     .subquery("occupied")
+
+    nights = select(cast(
+        func.generate_series(start, end - timedelta(days=1), literal_column("interval '1 day'")), Date
+    ).label("night")).subquery("nights")
+
+    # Ночь без строки pricing открыта для продажи
+    night_available = func.coalesce(Pricing.is_available, True)
+    return select(
+        room_totals.c.room_type_id,
+        room_totals.c.name,
+        room_totals.c.rooms,
+        nights.c.night,
+        case(
+            (night_available, room_totals.c.rooms - func.coalesce(occupied.c.occupied, 0)),
+            else_=0
+        ).label("free")
+    ).select_from(room_totals)\
+     .join(nights, true())\
+     .outerjoin(occupied, and_(
+        occupied.c.room_type_id == room_totals.c.room_type_id,
+        occupied.c.night == nights.c.night
+     ))\
+     .outerjoin(Pricing, and_(
+        Pricing.room_type_id == room_totals.c.room_type_id,
+        Pricing.date == nights.c.night
+     ))\
+     .order_by(room_totals.c.name, room_totals.c.room_type_id, nights.c.night)
+
+def availability_calendar_result(hotel_id: UUID, start: date, days: int, rows) -> Dict[str, Any]:
+    """Массивы свободных номеров по ночам: по каждому типу и всего по отелю"""
+    room_types: Dict[UUID, Dict[str, Any]] = {}
+    for row in rows:
+        entry = room_types.get(row.room_type_id)
+        if entry is None:
+            entry = room_types[row.room_type_id] = {
+                "room_type_id": row.room_type_id, "name": row.name, "rooms": row.rooms, "free": []
+            }
+        entry["free"].append(row.free)
+
+    entries: List[Dict[str, Any]] = list(room_types.values())
+    return {
+        "hotel_id": hotel_id,
+        "start_date": start,
+        "days": days,
+        "free": [sum(entry["free"][night] for entry in entries) for night in range(days)],
+        "room_types": entries
+    }
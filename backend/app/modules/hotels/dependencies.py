@@ -1,19 +1,16 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from typing import List, Optional
 from uuid import UUID
+from datetime import date
 
-from app.core.database import get_db
+from app.core.database import get_async_db, get_db
 from app.modules.auth.dependencies import get_current_active_user
 from app.modules.auth.models import User
-from . import services, models  # Добавляем импорт models
+from . import services, models, schemas  # Добавляем импорт models
 
-# Проверка, что пользователь является менеджером отеля
-async def get_hotel_manager(
-    hotel_id: UUID,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
-) -> models.Hotel:
-    hotel = services.get_hotel(db, hotel_id)
+def _check_hotel_manager(hotel: Optional[models.Hotel], current_user: User) -> models.Hotel:
     if not hotel:
         raise HTTPException(status_code=404, detail="Hotel not found")
     
@@ -25,6 +22,21 @@ async def get_hotel_manager(
     
     return hotel
 
+# Проверка, что пользователь является менеджером отеля
+def get_hotel_manager(
+    hotel_id: UUID,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+) -> models.Hotel:
+    return _check_hotel_manager(services.get_hotel(db, hotel_id), current_user)
+
+async def get_hotel_manager_async(
+    hotel_id: UUID,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+) -> models.Hotel:
+    return _check_hotel_manager(await db.get(models.Hotel, hotel_id), current_user)
+
 # Проверка, что пользователь может управлять отелями
 async def get_hotel_owner_or_admin(
     current_user: User = Depends(get_current_active_user)
@@ -34,4 +46,48 @@ async def get_hotel_owner_or_admin(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions to manage hotels"
         )
-    return current_user
\ No newline at end of file
+    return current_user
+
+def _split_list(value: Optional[str]) -> Optional[List[str]]:
+    items = [item.strip() for item in value.split(",") if item.strip()] if value else []
+    return items or None
+
+def get_search_filters(
+    q: Optional[str] = Query(None, max_length=100, description="Название, город, страна или описание (допускаются опечатки)"),
+    city: Optional[str] = Query(None, description="Город"),
+    country: Optional[str] = Query(None, description="Страна"),
+    check_in: Optional[date] = Query(None, description="Дата заезда"),
+    check_out: Optional[date] = Query(None, description="Дата выезда"),
+    guests: Optional[int] = Query(None, description="Количество гостей"),
+    min_price: Optional[float] = Query(None, description="Минимальная цена"),
+    max_price: Optional[float] = Query(None, description="Максимальная цена"),
+    amenities: Optional[str] = Query(None, description="Удобства отеля через запятую (нужны все)"),
+    room_amenities: Optional[str] = Query(None, description="Удобства номера через запятую (нужны все)"),
+    lat: Optional[float] = Query(None, ge=-90, le=90, description="Широта центра поиска рядом"),
+    lon: Optional[float] = Query(None, ge=-180, le=180, description="Долгота центра поиска рядом"),
+    radius_km: float = Query(10, gt=0, le=500, description="Радиус поиска рядом, км"),
+    sort_by: Optional[str] = Query(None, pattern="^(relevance|distance|price|rating|name)$", description="Сортировка: relevance (при q), distance (при lat/lon), price, rating, name"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+) -> schemas.SearchFilters:
+    """Фильтры поиска отелей из query-параметров"""
+    if (lat is None) != (lon is None):
+        raise HTTPException(status_code=400, detail="lat and lon must be given together")
+    return schemas.SearchFilters(
+        q=q.strip() if q and q.strip() else None,
+        city=city,
+        country=country,
+        check_in=check_in,
+        check_out=check_out,
+        guests=guests,
+        min_price=min_price,
+        max_price=max_price,
+        amenities=_split_list(amenities),
+        room_amenities=_split_list(room_amenities),
+        latitude=lat,
+        longitude=lon,
+        radius_km=radius_km if lat is not None else None,
+        sort_by=sort_by,
+        skip=skip,
+        limit=limit
+    )
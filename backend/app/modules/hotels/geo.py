@@ -0,0 +1,54 @@
+"""Поиск отелей рядом с точкой.
+
+Сначала отбор по ограничивающему прямоугольнику: point(longitude, latitude) <@ box(...)
+идет по GiST-индексу idx_hotels_location_gist (встроенные геометрические типы PostgreSQL,
+расширения не нужны). Затем точное расстояние по формуле гаверсинусов отсекает углы
+прямоугольника и используется для сортировки.
+"""
+import math
+from typing import List, Tuple
+
+from sqlalchemy import func, or_
+
+from .models import Hotel
+
+EARTH_RADIUS_KM = 6371.0
+
+def bounding_boxes(latitude: float, longitude: float, radius_km: float) -> List[Tuple[float, float, float, float]]:
+    """Прямоугольники (min_lon, min_lat, max_lon, max_lat), покрывающие круг радиуса radius_km.
+
+    У полюса берется вся полоса широт, через 180-й меридиан - два прямоугольника.
+    """
+    delta_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = latitude - delta_lat, latitude + delta_lat
+    if min_lat <= -90 or max_lat >= 90:
+        return [(-180.0, max(min_lat, -90.0), 180.0, min(max_lat, 90.0))]
+
+    delta_lon = math.degrees(math.asin(min(math.sin(radius_km / EARTH_RADIUS_KM) / math.cos(math.radians(latitude)), 1.0)))
+    min_lon, max_lon = longitude - delta_lon, longitude + delta_lon
+    if min_lon < -180:
+        return [(min_lon + 360, min_lat, 180.0, max_lat), (-180.0, min_lat, max_lon, max_lat)]
+    if max_lon > 180:
+        return [(min_lon, min_lat, 180.0, max_lat), (-180.0, min_lat, max_lon - 360, max_lat)]
+    return [(min_lon, min_lat, max_lon, max_lat)]
+
+def hotel_point():
+    """То же выражение, что в индексе idx_hotels_location_gist"""
+    return func.point(Hotel.longitude, Hotel.latitude)
+
+def distance_km(latitude: float, longitude: float):
+    """Расстояние от точки до отеля по большому кругу (гаверсинус), км"""
+    lat1, lon1 = math.radians(latitude), math.radians(longitude)
+    lat2, lon2 = func.radians(Hotel.latitude), func.radians(Hotel.longitude)
+    a = func.power(func.sin((lat2 - lat1) / 2), 2) \
+        + math.cos(lat1) * func.cos(lat2) * func.power(func.sin((lon2 - lon1) / 2), 2)
+    # least() защищает asin от погрешности округления чуть выше 1
+    return 2 * EARTH_RADIUS_KM * func.asin(func.least(func.sqrt(a), 1.0))
+
+def nearby_filter(latitude: float, longitude: float, radius_km: float):
+    """Отель не дальше radius_km: прямоугольник по индексу и точная проверка расстояния"""
+    in_box = or_(*(
+        hotel_point().op("<@")(func.box(func.point(min_lon, min_lat), func.point(max_lon, max_lat)))
+        for min_lon, min_lat, max_lon, max_lat in bounding_boxes(latitude, longitude, radius_km)
+    ))
+    return in_box & (distance_km(latitude, longitude) <= radius_km)
@@ -0,0 +1,154 @@
+"""Массовый импорт номеров и типов номеров отеля (JSON или CSV).
+
+Все строки проверяются за один проход. Ошибочные строки попадают в отчет и
+не мешают остальным, а корректные вставляются пачками в одной транзакции.
+"""
+import csv
+import io
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.core.response_cache import response_cache
+from . import models, schemas
+from .calendar import invalidate_availability_calendar
+from .services import ROOM_TYPES_CACHE, hotel_cache_namespace
+
+MAX_IMPORT_ROWS = 5000
+
+# Разделитель списка удобств в CSV (запятая занята разделителем колонок)
+CSV_LIST_SEPARATOR = ";"
+
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+def _validate_rows(rows: List[Dict[str, Any]], schema, section: str, errors: List[Dict[str, Any]]) -> List[Tuple[int, Any]]:
+    valid = []
+    for number, row in enumerate(rows, start=1):
+        try:
+            valid.append((number, schema(**row)))
+        except ValidationError as exc:
+            errors.append({"section": section, "row": number, "detail": _validation_message(exc)})
+        except TypeError:
+            errors.append({"section": section, "row": number, "detail": "Row must be an object"})
+    return valid
+
+def import_rooms(
+    db: Session,
+    hotel: models.Hotel,
+    upload: schemas.RoomImport,
+    can_create_room_types: bool
+) -> Dict[str, Any]:
+    """Импортирует типы номеров и номера отеля; возвращает счетчики и ошибки по строкам"""
+    if len(upload.room_types) + len(upload.rooms) > MAX_IMPORT_ROWS:
+        raise ValueError(f"Import is limited to {MAX_IMPORT_ROWS} rows")
+    
+    errors = []
+    room_types = _validate_rows(upload.room_types, schemas.RoomTypeCreate, "room_types", errors)
+    rooms = _validate_rows(upload.rooms, schemas.RoomImportRow, "rooms", errors)
+    
+    # Параллельные импорты в один отель выполняются по очереди
+    db.execute(select(models.Hotel.id).where(models.Hotel.id == hotel.id).with_for_update())
+    
+    # Справочник типов номеров общий и небольшой - читаем его целиком
+    known_types = db.execute(select(models.RoomType.id, models.RoomType.name)).all()
+    type_ids = {room_type_id for room_type_id, _ in known_types}
+    type_ids_by_name = {name: room_type_id for room_type_id, name in known_types}
+    
+    new_room_types = []
+    created_names = set()
+    for number, room_type in room_types:
+        if room_type.name in created_names:
+            errors.append({"section": "room_types", "row": number, "detail": f"Duplicate room type name: {room_type.name}"})
+            continue
+        if room_type.name in type_ids_by_name:
+            # Существующий тип с тем же названием используется повторно
+            continue
+        if not can_create_room_types:
+            errors.append({"section": "room_types", "row": number, "detail": "Only administrators can create room types"})
+            continue
+        row = {"id": uuid.uuid4(), **room_type.dict()}
+        new_room_types.append(row)
+        created_names.add(room_type.name)
+        type_ids_by_name[room_type.name] = row["id"]
+        type_ids.add(row["id"])
+    
+    taken_numbers = set(db.execute(
+        select(models.Room.room_number).where(models.Room.hotel_id == hotel.id)
+    ).scalars())
+    
+    new_rooms = []
+    for number, room in rooms:
+        room_type_id = room.room_type_id or type_ids_by_name.get(room.room_type)
+        if room_type_id not in type_ids:
+            errors.append({"section": "rooms", "row": number, "detail": f"Unknown room type: {room.room_type_id or room.room_type}"})
+            continue
+        if room.room_number in taken_numbers:
+            errors.append({"section": "rooms", "row": number, "detail": f"Room number already exists: {room.room_number}"})
+            continue
+        taken_numbers.add(room.room_number)
+        new_rooms.append({
+            "id": uuid.uuid4(),
+            "hotel_id": hotel.id,
+            "room_type_id": room_type_id,
+            "room_number": room.room_number,
+            "floor": room.floor,
+            "is_available": room.is_available
+        })
+    
+    try:
+        if new_room_types:
+            db.execute(insert(models.RoomType), new_room_types)
+        if new_rooms:
+            db.execute(insert(models.Room), new_rooms)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    
+    if new_room_types:
+        response_cache.invalidate(ROOM_TYPES_CACHE)
+    if new_rooms:
+        response_cache.invalidate(hotel_cache_namespace(hotel.id))
+        invalidate_availability_calendar(hotel.id)
+    
+    errors.sort(key=lambda error: (error["section"] != "room_types", error["row"]))
+    return {
+        "room_types_created": len(new_room_types),
+        "rooms_created": len(new_rooms),
+        "errors": errors
+    }
+
+def read_csv_rows(content: bytes, list_fields: Tuple[str, ...] = ()) -> List[Dict[str, Any]]:
+    """Строки CSV с заголовком; пустые ячейки опускаются, списки разделяются ';'"""
+    reader = csv.DictReader(io.StringIO(content.decode("utf-8-sig")))
+    rows = []
+    for record in reader:
+        row = {}
+        for key, value in record.items():
+            if key is None or value is None or value.strip() == "":
+                continue
+            key = key.strip()
+            value = value.strip()
+            if key in list_fields:
+                row[key] = [item.strip() for item in value.split(CSV_LIST_SEPARATOR) if item.strip()]
+            else:
+                row[key] = value
+        rows.append(row)
+    return rows
+
+def room_import_from_csv(rooms_csv: bytes, room_types_csv: Optional[bytes] = None) -> schemas.RoomImport:
+    """Собирает импорт из CSV-файлов; на нечитаемый файл бросает ValueError"""
+    try:
+        return schemas.RoomImport(
+            room_types=read_csv_rows(room_types_csv, list_fields=("amenities",)) if room_types_csv else [],
+            rooms=read_csv_rows(rooms_csv)
+        )
+    except csv.Error as e:
+        raise ValueError(f"Invalid CSV: {e}") from e
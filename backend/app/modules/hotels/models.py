@@ -1,8 +1,9 @@
-from sqlalchemy import Column, String, Text, Integer, Boolean, DECIMAL, ForeignKey, Date, UniqueConstraint
+from sqlalchemy import Column, String, Text, Integer, Boolean, DECIMAL, ForeignKey, Date, UniqueConstraint, Index, DDL, event, func
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 import uuid
 
+from app.core.database import Base
 from app.shared.models import BaseModel
 
 class Hotel(BaseModel):
@@ -26,6 +27,20 @@ class Hotel(BaseModel):
     manager_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     manager = relationship("User", backref="managed_hotels")
     rooms = relationship("Room", back_populates="hotel", cascade="all, delete-orphan")
+    
+    # Триграммные индексы для ILIKE '%...%' и поиска с опечатками (расширение pg_trgm)
+    __table_args__ = tuple(
+        Index(f'idx_hotels_{column}_trgm', column, postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'})
+        for column in ('name', 'city', 'country', 'description')
+    ) + (
+        # Фильтр удобств amenities @> '["wifi", "pool"]'
+        Index('idx_hotels_amenities', 'amenities', postgresql_using='gin', postgresql_ops={'amenities': 'jsonb_path_ops'}),
+        # Поиск рядом с точкой: point(longitude, latitude) <@ box(...) (см. geo.py)
+        Index('idx_hotels_location_gist', func.point(longitude, latitude), postgresql_using='gist'),
+    )
+
+# Расширение нужно до создания индексов при create_all на пустой базе
+event.listen(Hotel.__table__, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
 
 class RoomType(BaseModel):
     __tablename__ = "room_types"
@@ -40,6 +55,10 @@ class RoomType(BaseModel):
     
     # Связи
     rooms = relationship("Room", back_populates="room_type")
+    
+    __table_args__ = (
+        Index('idx_room_types_amenities', 'amenities', postgresql_using='gin', postgresql_ops={'amenities': 'jsonb_path_ops'}),
+    )
 
 class Room(BaseModel):
     __tablename__ = "rooms"
@@ -68,4 +87,21 @@ class Pricing(BaseModel):
     room_type_id = Column(UUID(as_uuid=True), ForeignKey("room_types.id"), nullable=False)
     room_type = relationship("RoomType")
     
-    __table_args__ = (UniqueConstraint('room_type_id', 'date', name='unique_room_type_date'),)
\ No newline at end of file
+    __table_args__ = (UniqueConstraint('room_type_id', 'date', name='unique_room_type_date'),)
+
+class DestinationPopularity(Base):
+    """Накопительный счетчик подтвержденных бронирований по направлению"""
+    __tablename__ = "destination_popularity"
+    
+    city = Column(String(100), primary_key=True)
+    country = Column(String(100), primary_key=True)
+    booking_count = Column(Integer, nullable=False, default=0)
+
+class DestinationDailyPopularity(Base):
+    """Счетчик по дням создания бронирований - для популярности за последние N дней"""
+    __tablename__ = "destination_daily_popularity"
+    
+    city = Column(String(100), primary_key=True)
+    country = Column(String(100), primary_key=True)
+    day = Column(Date, primary_key=True, index=True)
+    booking_count = Column(Integer, nullable=False, default=0)
\ No newline at end of file
@@ -0,0 +1,147 @@
+"""Популярность направлений, которая поддерживается инкрементально.
+
+Счетчики обновляются при смене статуса бронирования (bookings.services.update_booking_status),
+поэтому эндпоинт популярных направлений читает готовые значения вместо агрегации всей истории.
+Периодическая сверка со всей таблицей bookings:
+
+    python -m app.modules.hotels.popularity reconcile
+
+Пустые счетчики при существующих бронированиях заполняются при старте (app.core.schema).
+"""
+import argparse
+import sys
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Date, cast, delete, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.response_cache import response_cache
+from app.modules.bookings.models import Booking
+from .models import DestinationDailyPopularity, DestinationPopularity, Hotel, Room
+
+# Статусы бронирований, которые учитываются в популярности
+POPULAR_BOOKING_STATUSES = ('confirmed', 'completed')
+
+# Пространство кеша ответов для популярных направлений
+DESTINATIONS_CACHE = "destinations"
+
+def _increment(db: Session, model, values: Dict[str, Any], delta: int) -> None:
+    statement = pg_insert(model).values(**values, booking_count=delta)
+    statement = statement.on_conflict_do_update(
+        index_elements=list(values),
+        set_={"booking_count": model.booking_count + statement.excluded.booking_count}
+    )
+    db.execute(statement)
+
+def record_booking_status_change(db: Session, booking: Booking, previous_status: str) -> bool:
+    """Обновляет счетчики направления при смене статуса (без коммита)"""
+    was_counted = previous_status in POPULAR_BOOKING_STATUSES
+    is_counted = booking.status in POPULAR_BOOKING_STATUSES
+    if was_counted == is_counted:
+        return False
+    
+    delta = 1 if is_counted else -1
+    city, country = db.execute(
+        select(Hotel.city, Hotel.country)
+        .join(Room, Room.hotel_id == Hotel.id)
+        .where(Room.id == booking.room_id)
+    ).one()
+    day = (booking.created_at or booking.updated_at).date()
+    
+    _increment(db, DestinationPopularity, {"city": city, "country": country}, delta)
+    _increment(db, DestinationDailyPopularity, {"city": city, "country": country, "day": day}, delta)
+    return True
+
+def invalidate_destinations_cache() -> None:
+    response_cache.invalidate(DESTINATIONS_CACHE)
+
+def popular_destinations_statement(limit: int = 10, window_days: Optional[int] = None):
+    if window_days is None:
+        return select(
+            DestinationPopularity.city,
+            DestinationPopularity.country,
+            DestinationPopularity.booking_count
+        ).where(
+            DestinationPopularity.booking_count > 0
+        ).order_by(
+            DestinationPopularity.booking_count.desc()
+        ).limit(limit)
+    
+    since = date.today() - timedelta(days=window_days)
+    booking_count = func.sum(DestinationDailyPopularity.booking_count)
+    return select(
+        DestinationDailyPopularity.city,
+        DestinationDailyPopularity.country,
+        booking_count.label("booking_count")
+    ).where(
+        DestinationDailyPopularity.day >= since
+    ).group_by(
+        DestinationDailyPopularity.city, DestinationDailyPopularity.country
+    ).having(
+        booking_count > 0
+    ).order_by(
+        booking_count.desc()
+    ).limit(limit)
+
+def destination_popularity_rebuild_statements():
+    """Удаление счетчиков и их пересчет из таблицы bookings"""
+    day = cast(Booking.created_at, Date)
+    counted = select(
+        Hotel.city,
+        Hotel.country,
+        day.label("day"),
+        func.count(Booking.id).label("booking_count")
+    ).select_from(Hotel)\
+     .join(Room, Hotel.id == Room.hotel_id)\
+     .join(Booking, Room.id == Booking.room_id)\
+     .where(
+        Booking.status.in_(POPULAR_BOOKING_STATUSES)
+    ).group_by(
+        Hotel.city, Hotel.country, day
+    ).subquery("counted")
+    
+    return (
+        delete(DestinationDailyPopularity),
+        delete(DestinationPopularity),
+        DestinationDailyPopularity.__table__.insert().from_select(
+            ["city", "country", "day", "booking_count"],
+            select(counted.c.city, counted.c.country, counted.c.day, counted.c.booking_count)
+        ),
+        DestinationPopularity.__table__.insert().from_select(
+            ["city", "country", "booking_count"],
+            select(
+                counted.c.city, counted.c.country, func.sum(counted.c.booking_count)
+            ).group_by(counted.c.city, counted.c.country)
+        )
+    )
+
+def reconcile_destination_popularity(db: Session) -> Dict[str, int]:
+    """Пересчитывает счетчики из таблицы bookings"""
+    delete_daily, delete_totals, insert_daily, insert_totals = destination_popularity_rebuild_statements()
+    db.execute(delete_daily)
+    db.execute(delete_totals)
+    daily = db.execute(insert_daily).rowcount
+    totals = db.execute(insert_totals).rowcount
+    db.commit()
+    invalidate_destinations_cache()
+    return {"destinations": totals, "daily_rows": daily}
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Обслуживание счетчиков популярности направлений")
+    parser.add_argument("command", choices=["reconcile"])
+    parser.parse_args(argv)
+
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        result = reconcile_destination_popularity(db)
+        print(f"Destination popularity reconciled: {result['destinations']} destinations, {result['daily_rows']} daily rows")
+        return 0
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""Цены проживания с учетом календаря цен (таблица pricing).
+
+Строка pricing переопределяет цену типа номера на конкретную ночь, а
+is_available = false закрывает ночь для продажи. Ночи без записи стоят base_price.
+Итог считается одной агрегацией по всем нужным типам номеров сразу:
+
+    total = base_price * (ночей без переопределения) + сумма переопределенных цен
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, NamedTuple
+from uuid import UUID
+
+from sqlalchemy import Boolean, Date, Numeric, bindparam, func, select
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID, insert as pg_insert
+from sqlalchemy.orm import Session
+
+from . import schemas
+from .calendar import invalidate_availability_calendar
+from .models import Pricing, Room, RoomType
+
+class StayQuote(NamedTuple):
+    total_price: Decimal
+    nights: int
+    is_available: bool
+
+def stay_prices_subquery(check_in: date, check_out: date, name: str = "stay_prices"):
+    """Переопределения цен за ночи проживания, свернутые по типу номера"""
+    return select(
+        Pricing.room_type_id.label("room_type_id"),
+        func.sum(Pricing.price).label("override_total"),
+        func.count().label("override_nights"),
+        func.bool_and(func.coalesce(Pricing.is_available, True)).label("is_available")
+    ).where(
+        Pricing.date >= check_in,
+        Pricing.date < check_out
+    ).group_by(Pricing.room_type_id).subquery(name)
+
+def stay_total(stay_prices, base_price, nights: int):
+    """Стоимость проживания для типа номера (stay_prices присоединен через outer join)"""
+    return base_price * (nights - func.coalesce(stay_prices.c.override_nights, 0)) \
+        + func.coalesce(stay_prices.c.override_total, 0)
+
+def stay_available(stay_prices):
+    """Ни одна ночь проживания не закрыта для продажи"""
+    return func.coalesce(stay_prices.c.is_available, True)
+
+def stay_quotes_statement(room_type_ids: Iterable[UUID], check_in: date, check_out: date):
+    nights = (check_out - check_in).days
+    stay_prices = stay_prices_subquery(check_in, check_out)
+    return select(
+        RoomType.id,
+        stay_total(stay_prices, RoomType.base_price, nights).label("total_price"),
+        stay_available(stay_prices).label("is_available")
+    ).outerjoin(
+        stay_prices, stay_prices.c.room_type_id == RoomType.id
+    ).where(RoomType.id.in_(list(room_type_ids)))
+
+def get_stay_quotes(
+    db: Session,
+    room_type_ids: Iterable[UUID],
+    check_in: date,
+    check_out: date
+) -> Dict[UUID, StayQuote]:
+    """Стоимость проживания для нескольких типов номеров одним запросом"""
+    nights = (check_out - check_in).days
+    rows = db.execute(stay_quotes_statement(room_type_ids, check_in, check_out)).all()
+    return {
+        room_type_id: StayQuote(total_price, nights, is_available)
+        for room_type_id, total_price, is_available in rows
+    }
+
+# Ограничение размера одной загрузки календаря (строк pricing после развертки диапазонов)
+MAX_RATE_CALENDAR_ROWS = 200_000
+# Строк в одном INSERT ... ON CONFLICT
+RATE_CALENDAR_BATCH_SIZE = 5_000
+
+def expand_rate_calendar(upload: schemas.RateCalendarUpload) -> List[Dict[str, Any]]:
+    """Разворачивает диапазоны в строки по дням; при повторе даты побеждает последнее значение"""
+    requested = sum(
+        sum((range_.end_date - range_.start_date).days + 1 for range_ in calendar.ranges) + len(calendar.days)
+        for calendar in upload.room_types
+    )
+    if requested > MAX_RATE_CALENDAR_ROWS:
+        raise ValueError(f"Rate calendar is limited to {MAX_RATE_CALENDAR_ROWS} days per upload")
+    
+    rows = {}
+    for calendar in upload.room_types:
+        entries = [
+            (range_.start_date + timedelta(days=offset), range_.price, range_.is_available)
+            for range_ in calendar.ranges
+            for offset in range((range_.end_date - range_.start_date).days + 1)
+        ]
+        entries += [(day.date, day.price, day.is_available) for day in calendar.days]
+        for night, price, is_available in entries:
+            rows[(calendar.room_type_id, night)] = {
+                "room_type_id": calendar.room_type_id,
+                "date": night,
+                "price": price,
+                "is_available": is_available
+            }
+    return list(rows.values())
+
+def rate_calendar_upsert_statement():
+    """INSERT ... SELECT FROM unnest(массивы) ON CONFLICT (room_type_id, date) DO UPDATE.
+
+    Пачка передается четырьмя массивами-параметрами, а не тысячами VALUES,
+    поэтому запрос короткий и разбирается сервером один раз на пачку.
+    """
+    staged = func.unnest(
+        bindparam("room_type_ids", type_=ARRAY(PG_UUID(as_uuid=True))),
+        bindparam("dates", type_=ARRAY(Date)),
+        bindparam("prices", type_=ARRAY(Numeric(10, 2))),
+        bindparam("availability", type_=ARRAY(Boolean))
+    ).table_valued("room_type_id", "date", "price", "is_available").render_derived(name="staged")
+    
+    # Core-таблица, а не сущность: иначе сессия трактует параметры как ORM bulk insert
+    statement = pg_insert(Pricing.__table__).from_select(
+        ["id", "room_type_id", "date", "price", "is_available", "created_at", "updated_at"],
+        select(
+            func.gen_random_uuid(),
+            staged.c.room_type_id,
+            staged.c.date,
+            staged.c.price,
+            staged.c.is_available,
+            func.now(),
+            func.now()
+        )
+    )
+    # Уникальный индекс (room_type_id, date) указан колонками: имя ограничения
+    # в SQL-скрипте инициализации отличается от имени в модели
+    return statement.on_conflict_do_update(
+        index_elements=["room_type_id", "date"],
+        set_={
+            "price": statement.excluded.price,
+            "is_available": statement.excluded.is_available,
+            "updated_at": func.now()
+        }
+    )
+
+def upsert_rate_calendar(db: Session, upload: schemas.RateCalendarUpload) -> Dict[str, int]:
+    """Записывает календарь цен пачками upsert в одной транзакции"""
+    room_type_ids = {calendar.room_type_id for calendar in upload.room_types}
+    known = set(db.execute(select(RoomType.id).where(RoomType.id.in_(room_type_ids))).scalars())
+    missing = room_type_ids - known
+    if missing:
+        raise ValueError(f"Room types not found: {', '.join(sorted(map(str, missing)))}")
+    
+    rows = expand_rate_calendar(upload)
+    statement = rate_calendar_upsert_statement()
+    try:
+        for start in range(0, len(rows), RATE_CALENDAR_BATCH_SIZE):
+            batch = rows[start:start + RATE_CALENDAR_BATCH_SIZE]
+            db.execute(statement, {
+                "room_type_ids": [row["room_type_id"] for row in batch],
+                "dates": [row["date"] for row in batch],
+                "prices": [row["price"] for row in batch],
+                "availability": [row["is_available"] for row in batch]
+            })
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    # Закрытые ночи меняют календари всех отелей с номерами этих типов
+    hotel_ids = db.execute(select(Room.hotel_id).where(Room.room_type_id.in_(room_type_ids)).distinct()).scalars()
+    for hotel_id in hotel_ids:
+        invalidate_availability_calendar(hotel_id)
+    return {"room_types": len(room_type_ids), "rows": len(rows)}
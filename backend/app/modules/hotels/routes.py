@@ -1,15 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, File, HTTPException, status, Query, Request, UploadFile
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from uuid import UUID
 from datetime import date
 
 from app.core.database import get_db
+from app.core.response_cache import response_cache
+from app.core.serialization import dump_json, json_response
 from app.modules.auth.dependencies import get_current_active_user
 from app.modules.auth.models import User
 from app.modules.users.dependencies import get_current_admin_user
-from . import services, schemas, models
-from .dependencies import get_hotel_owner_or_admin, get_hotel_manager
+from . import services, schemas, models, pricing, imports
+from .calendar import calendar_cache_namespace
+from .dependencies import get_hotel_owner_or_admin, get_hotel_manager, get_search_filters
 
 router = APIRouter()
 
@@ -31,46 +34,82 @@ def get_hotel_availability(
 
 @router.get("/destinations/popular", response_model=List[schemas.PopularDestination])
 def get_popular_destinations(
+    request: Request,
     limit: int = Query(10, le=50),
+    window_days: Optional[int] = Query(None, ge=1, le=365, description="Учитывать бронирования за последние N дней"),
     db: Session = Depends(get_db)
 ):
     """Получает популярные направления"""
-    return services.get_popular_destinations(db, limit)
+    cached, slot = response_cache.get(services.DESTINATIONS_CACHE, f"limit={limit}:window={window_days}")
+    if cached is None:
+        destinations = services.get_popular_destinations(db, limit, window_days)
+        cached = response_cache.set(slot, dump_json(List[schemas.PopularDestination], destinations))
+    return cached.to_response(request)
 
 # Обновляем существующий эндпоинт поиска
+@router.get("/destinations/autocomplete", response_model=List[schemas.DestinationSuggestion])
+def autocomplete_destinations(
+    q: str = Query(..., min_length=1, max_length=100, description="Начало названия города или страны"),
+    limit: int = Query(10, ge=1, le=20),
+    db: Session = Depends(get_db)
+):
+    """Подсказки направлений для строки поиска (префикс и опечатки)"""
+    return json_response(List[schemas.DestinationSuggestion], services.autocomplete_destinations(db, q.strip(), limit))
+
 @router.get("/search", response_model=List[schemas.HotelSearchResult])
 def search_hotels(
-    city: Optional[str] = Query(None, description="Город"),
-    country: Optional[str] = Query(None, description="Страна"),
-    check_in: Optional[date] = Query(None, description="Дата заезда"),
-    check_out: Optional[date] = Query(None, description="Дата выезда"),
-    guests: Optional[int] = Query(None, description="Количество гостей"),
-    min_price: Optional[float] = Query(None, description="Минимальная цена"),
-    max_price: Optional[float] = Query(None, description="Максимальная цена"),
-    amenities: Optional[str] = Query(None, description="Удобства через запятую"),
-    db: Session = Depends(get_db)
-):
-    filters = schemas.SearchFilters(
-        city=city,
-        country=country,
-        check_in=check_in,
-        check_out=check_out,
-        guests=guests,
-        min_price=min_price,
-        max_price=max_price,
-        amenities=amenities.split(",") if amenities else None
-    )
-    return services.search_hotels(db, filters)
-
-@router.get("/{hotel_id}", response_model=schemas.HotelResponse)
+    filters: schemas.SearchFilters = Depends(get_search_filters),
+    db: Session = Depends(get_db)
+):
+    return json_response(List[schemas.HotelSearchResult], services.search_hotels(db, filters))
+
+@router.get("/search/faceted", response_model=schemas.HotelSearchPage)
+def search_hotels_faceted(
+    filters: schemas.SearchFilters = Depends(get_search_filters),
+    db: Session = Depends(get_db)
+):
+    """Поиск с общим числом отелей и счетчиками удобств (facets) по всей выдаче"""
+    return json_response(schemas.HotelSearchPage, services.search_hotels_faceted(db, filters))
+
+@router.get("/{hotel_id}", response_model=schemas.HotelDetailResponse)
 def get_hotel_details(
     hotel_id: UUID,
+    request: Request,
+    expand: Optional[str] = Query(None, pattern="^rooms$", description="rooms - добавить страницу номеров"),
+    rooms_skip: int = Query(0, ge=0),
+    rooms_limit: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db)
 ):
-    hotel = services.get_hotel(db, hotel_id)
-    if not hotel or not hotel.is_active:
-        raise HTTPException(status_code=404, detail="Hotel not found")
-    return hotel
+    """Карточка отеля; номера с типами - только при expand=rooms, постранично"""
+    cache_key = f"detail:rooms:{rooms_skip}:{rooms_limit}" if expand else "detail"
+    cached, slot = response_cache.get(services.hotel_cache_namespace(hotel_id), cache_key)
+    if cached is None:
+        hotel = services.get_hotel(db, hotel_id)
+        if not hotel or not hotel.is_active:
+            raise HTTPException(status_code=404, detail="Hotel not found")
+        rooms_page = services.get_hotel_rooms_page(db, hotel_id, rooms_skip, rooms_limit) if expand else None
+        details = services.hotel_details_result(hotel, rooms_page)
+        cached = response_cache.set(slot, dump_json(schemas.HotelDetailResponse, details))
+    return cached.to_response(request)
+
+@router.get("/{hotel_id}/calendar", response_model=schemas.AvailabilityCalendar)
+def get_availability_calendar(
+    hotel_id: UUID,
+    request: Request,
+    start: Optional[date] = Query(None, description="Первая ночь окна, по умолчанию сегодня"),
+    days: int = Query(30, ge=1, le=90),
+    guests: int = Query(1, ge=1),
+    db: Session = Depends(get_db)
+):
+    """Свободные номера по типам на каждую ночь окна (для выбора дат)"""
+    start = start or date.today()
+    cached, slot = response_cache.get(calendar_cache_namespace(hotel_id), f"{start}:{days}:{guests}")
+    if cached is None:
+        calendar = services.get_availability_calendar(db, hotel_id, start, days, guests)
+        if calendar is None:
+            raise HTTPException(status_code=404, detail="Hotel not found")
+        cached = response_cache.set(slot, dump_json(schemas.AvailabilityCalendar, calendar))
+    return cached.to_response(request)
 
 # Hotel management endpoints
 @router.post("/", response_model=schemas.HotelResponse)
@@ -86,7 +125,7 @@ def get_my_hotels(
     current_user: User = Depends(get_hotel_owner_or_admin),
     db: Session = Depends(get_db)
 ):
-    return services.get_user_hotels(db, current_user.id)
+    return json_response(List[schemas.HotelResponse], services.get_user_hotels(db, current_user.id))
 
 @router.put("/{hotel_id}", response_model=schemas.HotelResponse)
 def update_hotel(
@@ -109,9 +148,25 @@ def create_room_type(
 ):
     return services.create_room_type(db, room_type_data)
 
+@router.put("/room-types/pricing", response_model=schemas.RateCalendarResult)
+def upload_rate_calendar(
+    upload: schemas.RateCalendarUpload,
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Массовая загрузка календаря цен: диапазоны и/или дни по типам номеров"""
+    try:
+        return pricing.upsert_rate_calendar(db, upload)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/room-types/", response_model=List[schemas.RoomTypeResponse])
-def get_room_types(db: Session = Depends(get_db)):
-    return services.get_room_types(db)
+def get_room_types(request: Request, db: Session = Depends(get_db)):
+    cached, slot = response_cache.get(services.ROOM_TYPES_CACHE, "all")
+    if cached is None:
+        room_types = services.get_room_types(db)
+        cached = response_cache.set(slot, dump_json(List[schemas.RoomTypeResponse], room_types))
+    return cached.to_response(request)
 
 # Room management
 @router.post("/{hotel_id}/rooms", response_model=schemas.RoomResponse)
@@ -123,6 +178,36 @@ def create_room(
 ):
     return services.create_room(db, room_data, hotel_id)
 
+@router.post("/{hotel_id}/rooms/import", response_model=schemas.RoomImportResult)
+def import_rooms(
+    hotel_id: UUID,
+    upload: schemas.RoomImport,
+    hotel: models.Hotel = Depends(get_hotel_manager),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Массовый импорт номеров (и типов номеров для администраторов) с ошибками по строкам"""
+    try:
+        return imports.import_rooms(db, hotel, upload, can_create_room_types=current_user.role == 'admin')
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/{hotel_id}/rooms/import/csv", response_model=schemas.RoomImportResult)
+def import_rooms_csv(
+    hotel_id: UUID,
+    rooms: UploadFile = File(..., description="room_number,floor,is_available,room_type_id|room_type"),
+    room_types: Optional[UploadFile] = File(None, description="name,description,base_price,capacity,amenities,size_sqm,bed_type"),
+    hotel: models.Hotel = Depends(get_hotel_manager),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """То же, что и импорт JSON, но из CSV-файлов (удобства через ';')"""
+    try:
+        upload = imports.room_import_from_csv(rooms.file.read(), room_types.file.read() if room_types else None)
+        return imports.import_rooms(db, hotel, upload, can_create_room_types=current_user.role == 'admin')
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.put("/rooms/{room_id}", response_model=schemas.RoomResponse)
 def update_room(
     room_id: UUID,
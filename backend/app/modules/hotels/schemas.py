@@ -63,6 +63,59 @@ class PricingCreate(BaseModel):
     price: float = Field(gt=0)
     is_available: bool = True
 
+class PricingRange(BaseModel):
+    """Одна цена на все ночи с start_date по end_date включительно"""
+    start_date: date
+    end_date: date
+    price: float = Field(gt=0)
+    is_available: bool = True
+
+    @validator('end_date')
+    def validate_dates(cls, v, values):
+        if 'start_date' in values and v < values['start_date']:
+            raise ValueError('End date must not be before start date')
+        return v
+
+class RoomTypeRateCalendar(BaseModel):
+    """Календарь цен типа номера: диапазоны и/или отдельные дни (дни важнее диапазонов)"""
+    room_type_id: UUID
+    ranges: List[PricingRange] = []
+    days: List[PricingCreate] = []
+
+class RateCalendarUpload(BaseModel):
+    room_types: List[RoomTypeRateCalendar] = Field(min_length=1)
+
+class RateCalendarResult(BaseModel):
+    room_types: int
+    rows: int
+
+class RoomImportRow(RoomBase):
+    """Строка импорта номера: тип указывается id или названием"""
+    floor: Optional[int] = Field(None, ge=0)
+    room_type_id: Optional[UUID] = None
+    room_type: Optional[str] = None
+
+    @validator('room_type', always=True)
+    def validate_room_type(cls, v, values):
+        if not v and not values.get('room_type_id'):
+            raise ValueError('Either room_type_id or room_type name is required')
+        return v
+
+class RoomImport(BaseModel):
+    """Строки проверяются по отдельности, поэтому принимаются как есть"""
+    room_types: List[Any] = []
+    rooms: List[Any] = []
+
+class RoomImportError(BaseModel):
+    section: str  # room_types или rooms
+    row: int      # номер строки в разделе, с 1
+    detail: str
+
+class RoomImportResult(BaseModel):
+    room_types_created: int
+    rooms_created: int
+    errors: List[RoomImportError] = []
+
 class HotelSearchResult(BaseModel):
     id: UUID
     name: str
@@ -99,13 +152,33 @@ class HotelAvailabilityResponse(BaseModel):
     room_types_available: Dict[str, Any]
     available_rooms: List[RoomAvailability]
 
+class CalendarRoomType(BaseModel):
+    room_type_id: UUID
+    name: str
+    rooms: int       # Номеров этого типа в продаже
+    free: List[int]  # Свободно по ночам, начиная с start_date
+
+class AvailabilityCalendar(BaseModel):
+    hotel_id: UUID
+    start_date: date
+    days: int
+    free: List[int]  # Свободно всего по отелю по ночам
+    room_types: List[CalendarRoomType]
+
 class PopularDestination(BaseModel):
     city: str
     country: str
     popularity: int
 
+class DestinationSuggestion(BaseModel):
+    city: str
+    country: str
+    hotels: int
+    popularity: int
+
 # Обновляем SearchFilters для поддержки дат
 class SearchFilters(BaseModel):
+    q: Optional[str] = None  # Название, город, страна или описание, с учетом опечаток
     city: Optional[str] = None
     country: Optional[str] = None
     check_in: Optional[date] = None
@@ -113,8 +186,14 @@ class SearchFilters(BaseModel):
     guests: Optional[int] = None
     min_price: Optional[float] = None
     max_price: Optional[float] = None
-    amenities: Optional[List[str]] = None
-    sort_by: Optional[str] = None  # price, rating, name
+    amenities: Optional[List[str]] = None       # Все удобства отеля из списка
+    room_amenities: Optional[List[str]] = None  # Все удобства типа номера из списка
+    latitude: Optional[float] = None   # Поиск рядом с точкой: центр
+    longitude: Optional[float] = None
+    radius_km: Optional[float] = None  # и радиус
+    sort_by: Optional[str] = None  # relevance, distance, price, rating, name
+    skip: int = 0
+    limit: Optional[int] = None
 
     @validator('check_out')
     def validate_dates(cls, v, values):
@@ -140,16 +219,23 @@ class RoomResponse(RoomBase):
     class Config:
         from_attributes = True
 
-class HotelResponse(HotelBase):
+class HotelSummaryResponse(HotelBase):
     id: UUID
     manager_id: UUID
     is_active: bool
     created_at: datetime
-    rooms: List[RoomResponse] = []
     
     class Config:
         from_attributes = True
 
+class HotelResponse(HotelSummaryResponse):
+    rooms: List[RoomResponse] = []
+
+class HotelDetailResponse(HotelSummaryResponse):
+    """Карточка отеля: страница номеров и их общее число только при expand=rooms"""
+    rooms: Optional[List[RoomResponse]] = None
+    rooms_total: Optional[int] = None
+
 class HotelSearchResult(BaseModel):
     id: UUID
     name: str
@@ -162,10 +248,17 @@ class HotelSearchResult(BaseModel):
     images: List[str]
     min_price: float
     available_rooms: int
+    distance_km: Optional[float] = None  # Только при поиске рядом с точкой
     
     class Config:
         from_attributes = True
 
+class HotelSearchPage(BaseModel):
+    """Страница поиска с общим числом найденных отелей и счетчиками удобств по всей выдаче"""
+    items: List[HotelSearchResult]
+    total: int
+    facets: Dict[str, int]  # удобство -> число отелей
+
 class AvailabilityResponse(BaseModel):
     room_type: RoomTypeResponse
     available_rooms: int
@@ -1,11 +1,28 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
 from datetime import date, datetime, timedelta
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, case
+from sqlalchemy.orm import Session, aliased, contains_eager, selectinload
+from sqlalchemy import and_, or_, func, case, literal, select, true, JSON
 
+from app.core.response_cache import response_cache
 from . import models, schemas
 from app.modules.bookings.models import Booking, Payment
+from app.modules.bookings.services import room_conflict_exists
+from .popularity import DESTINATIONS_CACHE, popular_destinations_statement
+from .calendar import (
+    availability_calendar_result, availability_calendar_statement, invalidate_availability_calendar
+)
+from .geo import distance_km, nearby_filter
+from .pricing import stay_available, stay_prices_subquery, stay_total
+from .text_search import (
+    destination_autocomplete_statement, like_pattern, similarity_threshold_statement, text_match, text_rank
+)
+
+# Пространства кеша ответов публичных эндпоинтов
+ROOM_TYPES_CACHE = "room_types"
+
+def hotel_cache_namespace(hotel_id: UUID) -> str:
+    return f"hotel:{hotel_id}"
 
 # Hotel services
 def create_hotel(db: Session, hotel_data: schemas.HotelCreate, manager_id: UUID) -> models.Hotel:
@@ -13,13 +30,45 @@ def create_hotel(db: Session, hotel_data: schemas.HotelCreate, manager_id: UUID)
     db.add(db_hotel)
     db.commit()
     db.refresh(db_hotel)
+    response_cache.invalidate(hotel_cache_namespace(db_hotel.id))
     return db_hotel
 
+def hotel_rooms_load_options():
+    """Загрузка номеров отеля вместе с типами (для HotelResponse)"""
+    return (selectinload(models.Hotel.rooms).selectinload(models.Room.room_type),)
+
 def get_hotel(db: Session, hotel_id: UUID) -> Optional[models.Hotel]:
     return db.query(models.Hotel).filter(models.Hotel.id == hotel_id).first()
 
+def hotel_rooms_page_statement(hotel_id: UUID, skip: int, limit: int):
+    """Страница номеров отеля (по номеру комнаты) вместе с типами"""
+    return select(models.Room).options(selectinload(models.Room.room_type))\
+        .where(models.Room.hotel_id == hotel_id)\
+        .order_by(models.Room.room_number, models.Room.id)\
+        .offset(skip).limit(limit)
+
+def hotel_rooms_count_statement(hotel_id: UUID):
+    return select(func.count()).select_from(models.Room).where(models.Room.hotel_id == hotel_id)
+
+def hotel_details_result(
+    hotel: models.Hotel,
+    rooms_page: Optional[Tuple[List[models.Room], int]] = None
+) -> Dict[str, Any]:
+    """Компактная карточка отеля (без обращения к hotel.rooms) и, при expand=rooms, страница номеров"""
+    details = schemas.HotelSummaryResponse.model_validate(hotel).dict()
+    if rooms_page is not None:
+        details["rooms"], details["rooms_total"] = rooms_page
+    return details
+
+def get_hotel_rooms_page(db: Session, hotel_id: UUID, skip: int = 0, limit: int = 50) -> Tuple[List[models.Room], int]:
+    """Страница номеров отеля и общее число номеров"""
+    rooms = db.execute(hotel_rooms_page_statement(hotel_id, skip, limit)).scalars().all()
+    total = db.execute(hotel_rooms_count_statement(hotel_id)).scalar_one()
+    return rooms, total
+
 def get_user_hotels(db: Session, manager_id: UUID) -> List[models.Hotel]:
-    return db.query(models.Hotel).filter(models.Hotel.manager_id == manager_id).all()
+    return db.query(models.Hotel).options(*hotel_rooms_load_options())\
+        .filter(models.Hotel.manager_id == manager_id).all()
 
 def update_hotel(db: Session, hotel_id: UUID, hotel_update: schemas.HotelUpdate) -> Optional[models.Hotel]:
     db_hotel = db.query(models.Hotel).filter(models.Hotel.id == hotel_id).first()
@@ -32,122 +81,243 @@ def update_hotel(db: Session, hotel_id: UUID, hotel_update: schemas.HotelUpdate)
     
     db.commit()
     db.refresh(db_hotel)
+    response_cache.invalidate(hotel_cache_namespace(hotel_id))
     return db_hotel
 
-def search_hotels(db: Session, filters: schemas.SearchFilters) -> List[Dict[str, Any]]:
-    """Расширенный поиск отелей с учетом доступности номеров"""
-    query = db.query(models.Hotel).filter(models.Hotel.is_active == True)
+def amenity_facets(hotel_stats):
+    """Число найденных отелей с каждым удобством: {"wifi": 12, "pool": 3}"""
+    facet_hotel = aliased(models.Hotel)
+    amenity = func.jsonb_array_elements_text(facet_hotel.amenities).table_valued("value").lateral("amenity")
+    counts = select(
+        amenity.c.value.label("amenity"),
+        func.count().label("hotels")
+    ).select_from(hotel_stats)\
+     .join(facet_hotel, facet_hotel.id == hotel_stats.c.hotel_id)\
+     .join(amenity, true())\
+     .group_by(amenity.c.value)\
+     .correlate(None)\
+     .subquery("amenity_counts")
+    return select(
+        func.coalesce(func.json_object_agg(counts.c.amenity, counts.c.hotels, type_=JSON), literal({}, JSON))
+    ).correlate(None).scalar_subquery()
+
+def search_statement(filters: schemas.SearchFilters, with_facets: bool = False):
+    """Строит один агрегирующий запрос поиска: доступные номера, цены и статистика по отелям.
+
+    with_facets добавляет к каждой строке общее число найденных отелей (total)
+    и счетчики удобств по всей выдаче (facets), до пагинации.
+    """
+    nights = 0
+    if filters.check_in and filters.check_out:
+        nights = (filters.check_out - filters.check_in).days
+    # Стоимость проживания по календарю цен; без дат - базовая цена за ночь
+    stay_prices = None
+    if nights > 0:
+        stay_prices = stay_prices_subquery(filters.check_in, filters.check_out)
+        stay_price = stay_total(stay_prices, models.RoomType.base_price, nights)
+    else:
+        stay_price = models.RoomType.base_price
     
-    # Базовые фильтры по местоположению
+    # Доступные номера, сгруппированные по отелю и типу номера
+    room_type_stats = select(
+        models.Room.hotel_id.label("hotel_id"),
+        models.RoomType.name.label("room_type_name"),
+        func.count(models.Room.id).label("rooms_count"),
+        func.min(models.RoomType.base_price).label("base_price"),
+        func.max(models.RoomType.capacity).label("capacity"),
+        func.min(stay_price).label("min_price")
+    ).select_from(models.Room)\
+     .join(models.RoomType, models.Room.room_type_id == models.RoomType.id)\
+     .join(models.Hotel, models.Room.hotel_id == models.Hotel.id)\
+     .where(
+        models.Hotel.is_active == True,
+        models.Room.is_available == True
+    )
+    
+    if stay_prices is not None:
+        # Типы номеров с закрытыми для продажи ночами не предлагаем
+        room_type_stats = room_type_stats.outerjoin(
+            stay_prices, stay_prices.c.room_type_id == models.RoomType.id
+        ).where(stay_available(stay_prices))
+    
+    # Базовые фильтры по местоположению (ILIKE по подстроке идет по триграммным индексам)
+    if filters.q:
+        room_type_stats = room_type_stats.where(text_match(filters.q))
     if filters.city:
-        query = query.filter(models.Hotel.city.ilike(f"%{filters.city}%"))
+        room_type_stats = room_type_stats.where(models.Hotel.city.ilike(like_pattern(filters.city)))
     if filters.country:
-        query = query.filter(models.Hotel.country.ilike(f"%{filters.country}%"))
+        room_type_stats = room_type_stats.where(models.Hotel.country.ilike(like_pattern(filters.country)))
     
-    # Фильтры по удобствам
+    # Фильтры по удобствам: одно условие @> на весь набор (GIN jsonb_path_ops)
     if filters.amenities:
-        for amenity in filters.amenities:
-            query = query.filter(models.Hotel.amenities.contains([amenity]))
+        room_type_stats = room_type_stats.where(models.Hotel.amenities.contains(filters.amenities))
+    if filters.room_amenities:
+        room_type_stats = room_type_stats.where(models.RoomType.amenities.contains(filters.room_amenities))
     
-    # Получаем отели
-    hotels = query.all()
+    # Рядом с точкой: прямоугольник по GiST-индексу и точное расстояние
+    near_point = filters.latitude is not None and filters.longitude is not None and filters.radius_km
+    if near_point:
+        room_type_stats = room_type_stats.where(
+            nearby_filter(filters.latitude, filters.longitude, filters.radius_km)
+        )
     
-    results = []
-    for hotel in hotels:
-        # Получаем все доступные номера отеля с учетом фильтров
-        available_rooms_query = db.query(models.Room).filter(
-            models.Room.hotel_id == hotel.id,
-            models.Room.is_available == True
-        ).join(models.RoomType)
-        
-        # Фильтры для номеров
-        if filters.guests:
-            available_rooms_query = available_rooms_query.filter(
-                models.RoomType.capacity >= filters.guests
-            )
-        
-        if filters.check_in and filters.check_out:
-            # Исключаем номера с конфликтующими бронированиями
-            conflicting_rooms_subquery = db.query(Booking.room_id).filter(
-                Booking.room_id == models.Room.id,
-                Booking.status.in_(['pending', 'confirmed']),
-                or_(
-                    and_(
-                        Booking.check_in_date < filters.check_out,
-                        Booking.check_out_date > filters.check_in
-                    )
-                )
-            ).exists()
-            
-            available_rooms_query = available_rooms_query.filter(~conflicting_rooms_subquery)
-        
-        available_rooms = available_rooms_query.all()
-        
-        if not available_rooms:
-            continue  # Пропускаем отели без доступных номеров
-        
-        # Рассчитываем минимальную цену
-        room_prices = []
-        for room in available_rooms:
-            # Базовая цена типа номера
-            base_price = room.room_type.base_price
-            
-            # Здесь можно добавить динамическое ценообразование
-            # на основе дат, спроса и т.д.
-            if filters.check_in and filters.check_out:
-                nights = (filters.check_out - filters.check_in).days
-                if nights > 0:
-                    # Простой расчет: цена за ночь * количество ночей
-                    room_price = base_price * nights
-                    room_prices.append(room_price)
-                else:
-                    room_prices.append(base_price)
-            else:
-                room_prices.append(base_price)
-        
-        min_price = min(room_prices) if room_prices else 0
-        
-        # Фильтр по цене
-        if filters.min_price and min_price < filters.min_price:
-            continue
-        if filters.max_price and min_price > filters.max_price:
-            continue
-        
-        # Группируем доступные номера по типам для статистики
-        room_types_available = {}
-        for room in available_rooms:
-            room_type_name = room.room_type.name
-            if room_type_name not in room_types_available:
-                room_types_available[room_type_name] = {
-                    'count': 0,
-                    'min_price': room.room_type.base_price,
-                    'capacity': room.room_type.capacity
-                }
-            room_types_available[room_type_name]['count'] += 1
-        
-        results.append({
-            "id": hotel.id,
-            "name": hotel.name,
-            "description": hotel.description,
-            "address": hotel.address,
-            "city": hotel.city,
-            "country": hotel.country,
-            "star_rating": hotel.star_rating,
-            "amenities": hotel.amenities,
-            "images": hotel.images,
-            "min_price": min_price,
-            "available_rooms": len(available_rooms),
-            "room_types_available": room_types_available,
-            "total_room_types": len(room_types_available)
-        })
+    # Фильтры для номеров
+    if filters.guests:
+        room_type_stats = room_type_stats.where(models.RoomType.capacity >= filters.guests)
+    
+    if filters.check_in and filters.check_out:
+        # Исключаем номера с конфликтующими бронированиями
+        room_type_stats = room_type_stats.where(
+            ~room_conflict_exists(models.Room.id, filters.check_in, filters.check_out)
+        )
+    
+    room_type_stats = room_type_stats.group_by(
+        models.Room.hotel_id, models.RoomType.name
+    ).subquery("room_type_stats")
+    
+    # Сворачиваем статистику по типам номеров до одной строки на отель
+    hotel_stats = select(
+        room_type_stats.c.hotel_id,
+        func.sum(room_type_stats.c.rooms_count).label("available_rooms"),
+        func.min(room_type_stats.c.min_price).label("min_price"),
+        func.count().label("total_room_types"),
+        func.json_object_agg(
+            room_type_stats.c.room_type_name,
+            func.json_build_object(
+                "count", room_type_stats.c.rooms_count,
+                "min_price", room_type_stats.c.base_price,
+                "capacity", room_type_stats.c.capacity
+            ),
+            type_=JSON
+        ).label("room_types_available")
+    ).group_by(room_type_stats.c.hotel_id)
+    
+    # Фильтр по цене
+    if filters.min_price:
+        hotel_stats = hotel_stats.having(func.min(room_type_stats.c.min_price) >= filters.min_price)
+    if filters.max_price:
+        hotel_stats = hotel_stats.having(func.min(room_type_stats.c.min_price) <= filters.max_price)
+    
+    # Для фасетов выдача читается дважды - CTE вычисляется один раз
+    hotel_stats = hotel_stats.cte("hotel_stats") if with_facets else hotel_stats.subquery("hotel_stats")
+    
+    statement = select(
+        models.Hotel,
+        hotel_stats.c.available_rooms,
+        hotel_stats.c.min_price,
+        hotel_stats.c.total_room_types,
+        hotel_stats.c.room_types_available
+    ).join(hotel_stats, models.Hotel.id == hotel_stats.c.hotel_id)
+    if near_point:
+        distance = distance_km(filters.latitude, filters.longitude)
+        statement = statement.add_columns(distance.label("distance_km"))
+    if with_facets:
+        statement = statement.add_columns(
+            func.count().over().label("total"),
+            amenity_facets(hotel_stats).label("facets")
+        )
     
     # Сортировка результатов
-    if filters.min_price or filters.max_price:
-        results.sort(key=lambda x: x['min_price'])
+    sort_by = filters.sort_by
+    if sort_by is None:
+        if filters.q:
+            sort_by = "relevance"
+        elif near_point:
+            sort_by = "distance"
+        else:
+            sort_by = "price" if filters.min_price or filters.max_price else "rating"
+    if sort_by == "relevance" and filters.q:
+        order = [text_rank(filters.q).desc(), models.Hotel.star_rating.desc().nulls_last()]
+    elif sort_by == "distance" and near_point:
+        order = [distance.asc()]
+    elif sort_by == "price":
+        order = [hotel_stats.c.min_price.asc()]
+    elif sort_by == "name":
+        order = [models.Hotel.name.asc()]
     else:
-        results.sort(key=lambda x: x['star_rating'] or 0, reverse=True)
+        order = [models.Hotel.star_rating.desc().nulls_last()]
+    statement = statement.order_by(*order, models.Hotel.id)
     
-    return results
+    # Пагинация
+    if filters.skip:
+        statement = statement.offset(filters.skip)
+    if filters.limit:
+        statement = statement.limit(filters.limit)
+    
+    return statement
+
+def search_row_to_result(row) -> Dict[str, Any]:
+    hotel = row.Hotel
+    return {
+        "id": hotel.id,
+        "name": hotel.name,
+        "description": hotel.description,
+        "address": hotel.address,
+        "city": hotel.city,
+        "country": hotel.country,
+        "star_rating": hotel.star_rating,
+        "amenities": hotel.amenities,
+        "images": hotel.images,
+        "min_price": row.min_price,
+        "available_rooms": row.available_rooms,
+        "room_types_available": row.room_types_available,
+        "total_room_types": row.total_room_types,
+        "distance_km": getattr(row, "distance_km", None)
+    }
+
+def search_hotels(db: Session, filters: schemas.SearchFilters) -> List[Dict[str, Any]]:
+    """Расширенный поиск отелей с учетом доступности номеров"""
+    if filters.q:
+        db.execute(similarity_threshold_statement())
+    rows = db.execute(search_statement(filters)).all()
+    return [search_row_to_result(row) for row in rows]
+
+def search_page_result(rows) -> Dict[str, Any]:
+    """Страница поиска с общим числом отелей и фасетами удобств из строк search_statement(with_facets=True)"""
+    return {
+        "items": [search_row_to_result(row) for row in rows],
+        "total": rows[0].total if rows else 0,
+        "facets": rows[0].facets if rows else {}
+    }
+
+def search_hotels_faceted(db: Session, filters: schemas.SearchFilters) -> Dict[str, Any]:
+    """Поиск отелей вместе с total и фасетами удобств - одним запросом"""
+    if filters.q:
+        db.execute(similarity_threshold_statement())
+    rows = db.execute(search_statement(filters, with_facets=True)).all()
+    if not rows and filters.skip:
+        # Страница за концом выдачи: total и фасеты берем по первой строке
+        first = filters.copy(update={"skip": 0, "limit": 1})
+        return {**search_page_result(db.execute(search_statement(first, with_facets=True)).all()), "items": []}
+    return search_page_result(rows)
+
+def available_rooms_statement(hotel_id: UUID, check_in: date, check_out: date, guests: int = 1):
+    """Свободные номера отеля на даты вместе с типами и стоимостью проживания по календарю цен"""
+    nights = (check_out - check_in).days
+    if nights > 0:
+        stay_prices = stay_prices_subquery(check_in, check_out)
+        total_price = stay_total(stay_prices, models.RoomType.base_price, nights)
+    else:
+        stay_prices = None
+        total_price = models.RoomType.base_price
+    
+    statement = select(models.Room, total_price.label("total_price"))\
+        .join(models.RoomType, models.Room.room_type_id == models.RoomType.id)\
+        .options(contains_eager(models.Room.room_type))\
+        .where(
+            models.Room.hotel_id == hotel_id,
+            models.Room.is_available == True,
+            ~room_conflict_exists(models.Room.id, check_in, check_out)
+        )
+    
+    if stay_prices is not None:
+        statement = statement.outerjoin(stay_prices, stay_prices.c.room_type_id == models.RoomType.id)\
+            .where(stay_available(stay_prices))
+    
+    if guests:
+        statement = statement.where(models.RoomType.capacity >= guests)
+    
+    return statement.order_by(models.Room.room_number)
 
 def get_hotel_availability(db: Session, hotel_id: UUID, check_in: date, check_out: date, guests: int = 1) -> Dict[str, Any]:
     """Получает детальную информацию о доступности номеров в отеле"""
@@ -155,54 +325,49 @@ def get_hotel_availability(db: Session, hotel_id: UUID, check_in: date, check_ou
     if not hotel:
         return {"error": "Hotel not found"}
     
-    # Получаем все номера отеля
-    rooms_query = db.query(models.Room).filter(
-        models.Room.hotel_id == hotel_id,
-        models.Room.is_available == True
-    ).join(models.RoomType)
+    # Одним запросом получаем свободные номера вместе с их типами и ценами
+    rows = db.execute(available_rooms_statement(hotel_id, check_in, check_out, guests)).all()
     
-    if guests:
-        rooms_query = rooms_query.filter(models.RoomType.capacity >= guests)
-    
-    all_rooms = rooms_query.all()
-    
-    # Фильтруем доступные номера (без конфликтующих бронирований)
+    return hotel_availability_result(hotel, rows, check_in, check_out, guests)
+
+def get_availability_calendar(db: Session, hotel_id: UUID, start: date, days: int, guests: int = 1) -> Optional[Dict[str, Any]]:
+    """Свободные номера по типам на каждую ночь окна; None, если отеля нет"""
+    if db.get(models.Hotel, hotel_id) is None:
+        return None
+    rows = db.execute(availability_calendar_statement(hotel_id, start, days, guests)).all()
+    return availability_calendar_result(hotel_id, start, days, rows)
+
+def hotel_availability_result(
+    hotel: models.Hotel,
+    rows: List[Any],
+    check_in: date,
+    check_out: date,
+    guests: int
+) -> Dict[str, Any]:
+    """Собирает ответ о доступности из уже загруженных строк (номер, стоимость проживания)"""
+    nights = (check_out - check_in).days
     available_rooms = []
-    for room in all_rooms:
-        # Проверяем конфликтующие бронирования
-        conflicting_bookings = db.query(Booking).filter(
-            Booking.room_id == room.id,
-            Booking.status.in_(['pending', 'confirmed']),
-            or_(
-                and_(
-                    Booking.check_in_date < check_out,
-                    Booking.check_out_date > check_in
-                )
-            )
-        ).count()
+    for room, total_price in rows:
+        price_per_night = round(total_price / nights, 2) if nights > 0 else room.room_type.base_price
         
-        if conflicting_bookings == 0:
-            nights = (check_out - check_in).days
-            total_price = room.room_type.base_price * nights if nights > 0 else room.room_type.base_price
-            
-            available_rooms.append({
-                "room_id": room.id,
-                "room_number": room.room_number,
-                "floor": room.floor,
-                "room_type": {
-                    "id": room.room_type.id,
-                    "name": room.room_type.name,
-                    "description": room.room_type.description,
-                    "base_price": room.room_type.base_price,
-                    "capacity": room.room_type.capacity,
-                    "amenities": room.room_type.amenities,
-                    "size_sqm": room.room_type.size_sqm,
-                    "bed_type": room.room_type.bed_type
-                },
-                "total_price": total_price,
-                "nights": nights,
-                "price_per_night": room.room_type.base_price
-            })
+        available_rooms.append({
+            "room_id": room.id,
+            "room_number": room.room_number,
+            "floor": room.floor,
+            "room_type": {
+                "id": room.room_type.id,
+                "name": room.room_type.name,
+                "description": room.room_type.description,
+                "base_price": room.room_type.base_price,
+                "capacity": room.room_type.capacity,
+                "amenities": room.room_type.amenities,
+                "size_sqm": room.room_type.size_sqm,
+                "bed_type": room.room_type.bed_type
+            },
+            "total_price": total_price,
+            "nights": nights,
+            "price_per_night": price_per_night
+        })
     
     # Группируем по типам номеров
     room_types_available = {}
@@ -239,23 +404,9 @@ def get_hotel_availability(db: Session, hotel_id: UUID, check_in: date, check_ou
         "available_rooms": available_rooms
     }
 
-def get_popular_destinations(db: Session, limit: int = 10) -> List[Dict[str, Any]]:
-    """Получает популярные направления на основе количества бронирований"""
-    # Явно указываем связи между таблицами
-    popular_destinations = db.query(
-        models.Hotel.city,
-        models.Hotel.country,
-        func.count(Booking.id).label('booking_count')
-    ).select_from(models.Hotel)\
-     .join(models.Room, models.Hotel.id == models.Room.hotel_id)\
-     .join(Booking, models.Room.id == Booking.room_id)\
-     .filter(
-        Booking.status.in_(['confirmed', 'completed'])
-    ).group_by(
-        models.Hotel.city, models.Hotel.country
-    ).order_by(
-        func.count(Booking.id).desc()
-    ).limit(limit).all()
+def get_popular_destinations(db: Session, limit: int = 10, window_days: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Получает популярные направления из счетчиков бронирований (за все время или за последние window_days дней)"""
+    popular_destinations = db.execute(popular_destinations_statement(limit, window_days)).all()
     
     return [
         {
@@ -266,12 +417,19 @@ def get_popular_destinations(db: Session, limit: int = 10) -> List[Dict[str, Any
         for city, country, booking_count in popular_destinations
     ]
 
+def autocomplete_destinations(db: Session, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+    """Подсказки направлений по началу названия города/страны (с учетом опечаток)"""
+    db.execute(similarity_threshold_statement())
+    rows = db.execute(destination_autocomplete_statement(query, limit)).all()
+    return [dict(row._mapping) for row in rows]
+
 # Room Type services
 def create_room_type(db: Session, room_type_data: schemas.RoomTypeCreate) -> models.RoomType:
     db_room_type = models.RoomType(**room_type_data.dict())
     db.add(db_room_type)
     db.commit()
     db.refresh(db_room_type)
+    response_cache.invalidate(ROOM_TYPES_CACHE)
     return db_room_type
 
 def get_room_types(db: Session) -> List[models.RoomType]:
@@ -283,6 +441,8 @@ def create_room(db: Session, room_data: schemas.RoomCreate, hotel_id: UUID) -> m
     db.add(db_room)
     db.commit()
     db.refresh(db_room)
+    response_cache.invalidate(hotel_cache_namespace(hotel_id))
+    invalidate_availability_calendar(hotel_id)
     return db_room
 
 def get_room(db: Session, room_id: UUID) -> Optional[models.Room]:
@@ -299,4 +459,6 @@ def update_room(db: Session, room_id: UUID, room_update: schemas.RoomUpdate) ->
     
     db.commit()
     db.refresh(db_room)
+    response_cache.invalidate(hotel_cache_namespace(db_room.hotel_id))
+    invalidate_availability_calendar(db_room.hotel_id)
     return db_room
\ No newline at end of file
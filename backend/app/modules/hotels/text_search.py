@@ -0,0 +1,80 @@
+"""Текстовый поиск отелей и автодополнение направлений на pg_trgm.
+
+Поля name, city, country и description покрыты GIN-индексами gin_trgm_ops
+(01-init-tables.sql), поэтому и ILIKE '%...%', и сравнение по схожести слов
+(оператор <%) идут по индексу, а не полным сканированием таблицы hotels.
+Порог схожести задается на транзакцию перед запросом (similarity_threshold_statement).
+"""
+from sqlalchemy import case, func, literal, or_, select
+
+from app.core.config import settings
+from .models import DestinationPopularity, Hotel
+
+# Поля, по которым ищет параметр q (описание - только по подстроке)
+TEXT_SEARCH_COLUMNS = (Hotel.name, Hotel.city, Hotel.country)
+
+def like_pattern(value: str, prefix_only: bool = False) -> str:
+    """Шаблон ILIKE с экранированными %, _ и \\ из пользовательского ввода"""
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%" if prefix_only else f"%{escaped}%"
+
+def similarity_threshold_statement():
+    """Порог для оператора <% на текущую транзакцию (по умолчанию в pg_trgm 0.6 - слишком строго для опечаток)"""
+    return select(func.set_config(
+        "pg_trgm.word_similarity_threshold", str(settings.SEARCH_SIMILARITY_THRESHOLD), True
+    ))
+
+def _similar(query: str, column):
+    return literal(query).op("<%")(column)
+
+def text_match(query: str):
+    """Отель подходит под q: подстрока в названии/городе/стране/описании или похожее слово"""
+    pattern = like_pattern(query)
+    return or_(
+        *(column.ilike(pattern) for column in TEXT_SEARCH_COLUMNS),
+        Hotel.description.ilike(pattern),
+        *(_similar(query, column) for column in TEXT_SEARCH_COLUMNS)
+    )
+
+def text_rank(query: str):
+    """Релевантность для сортировки: лучшая схожесть q со словами названия, города или страны"""
+    return func.greatest(*(func.word_similarity(query, column) for column in TEXT_SEARCH_COLUMNS))
+
+def destination_autocomplete_statement(query: str, limit: int = 10):
+    """Направления (город, страна), начинающиеся с query или похожие на него.
+
+    Сначала точные совпадения по префиксу, затем по схожести, популярности и числу отелей.
+    """
+    pattern = like_pattern(query, prefix_only=True)
+    is_prefix = or_(Hotel.city.ilike(pattern), Hotel.country.ilike(pattern))
+    destinations = select(
+        Hotel.city.label("city"),
+        Hotel.country.label("country"),
+        func.count().label("hotels"),
+        func.bool_or(is_prefix).label("is_prefix"),
+        func.max(func.greatest(
+            func.word_similarity(query, Hotel.city),
+            func.word_similarity(query, Hotel.country)
+        )).label("rank")
+    ).where(
+        Hotel.is_active == True,
+        or_(is_prefix, _similar(query, Hotel.city), _similar(query, Hotel.country))
+    ).group_by(Hotel.city, Hotel.country).subquery("destinations")
+
+    popularity = func.coalesce(DestinationPopularity.booking_count, 0)
+    return select(
+        destinations.c.city,
+        destinations.c.country,
+        destinations.c.hotels,
+        popularity.label("popularity")
+    ).outerjoin(
+        DestinationPopularity,
+        (DestinationPopularity.city == destinations.c.city)
+        & (DestinationPopularity.country == destinations.c.country)
+    ).order_by(
+        case((destinations.c.is_prefix, 0), else_=1),
+        destinations.c.rank.desc(),
+        popularity.desc(),
+        destinations.c.hotels.desc(),
+        destinations.c.city
+    ).limit(limit)
@@ -0,0 +1,73 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+
+from app.core.database import get_async_db
+from app.modules.auth.dependencies import get_current_active_user
+from app.modules.auth.models import User
+from app.core.serialization import json_response
+from app.shared.pagination import NEXT_CURSOR_HEADER
+from . import async_services, schemas
+from .dependencies import get_current_admin_user
+
+# Асинхронные версии эндпоинтов (подключаются при DB_ASYNC)
+router = APIRouter()
+
+@router.get("/profile", response_model=schemas.UserProfileResponse)
+async def get_my_profile(
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    user_profile = await async_services.get_user_profile(db, current_user.id)
+    if not user_profile:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user_profile
+
+@router.put("/profile", response_model=schemas.UserResponse)
+async def update_my_profile(
+    user_update: schemas.UserUpdate,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    updated_user = await async_services.update_user_profile(db, current_user.id, user_update)
+    if not updated_user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return updated_user
+
+@router.get("/", response_model=List[schemas.UserResponse])
+async def get_all_users(
+    skip: int = Query(0, ge=0, description="Устарело: используйте cursor"),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Курсор из заголовка X-Next-Cursor"),
+    current_user: User = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        users, next_cursor = await async_services.get_all_users(db, skip=skip, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return json_response(List[schemas.UserResponse], users, headers)
+
+@router.put("/{user_id}/role", response_model=schemas.UserResponse)
+async def update_user_role(
+    user_id: str,
+    role_update: schemas.UserRoleUpdate,
+    current_user: User = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    updated_user = await async_services.update_user_role(db, user_id, role_update)
+    if not updated_user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return updated_user
+
+@router.delete("/{user_id}")
+async def delete_user(
+    user_id: str,
+    current_user: User = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    success = await async_services.delete_user(db, user_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="User not found")
+    return {"message": "User deleted successfully"}
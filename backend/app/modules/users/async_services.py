@@ -0,0 +1,68 @@
+from typing import List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.auth.models import User
+from app.modules.auth.services import invalidate_principal
+from app.modules.auth.tokens import bump_token_version_statement
+from app.shared.pagination import split_page
+from . import schemas
+from .services import users_page_statement
+
+# Асинхронные версии сервисов пользователей (DB_ASYNC)
+async def get_user_profile(db: AsyncSession, user_id: UUID) -> Optional[User]:
+    return await db.get(User, user_id)
+
+async def update_user_profile(
+    db: AsyncSession, 
+    user_id: UUID, 
+    user_update: schemas.UserUpdate
+) -> Optional[User]:
+    db_user = await db.get(User, user_id)
+    if not db_user:
+        return None
+    
+    update_data = user_update.dict(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(db_user, field, value)
+    
+    await db.commit()
+    await db.refresh(db_user)
+    invalidate_principal(db_user.id)
+    return db_user
+
+async def get_all_users(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None
+) -> Tuple[List[User], Optional[str]]:
+    result = await db.execute(users_page_statement(cursor, limit, skip))
+    return split_page(result.scalars().all(), limit)
+
+async def update_user_role(
+    db: AsyncSession, 
+    user_id: UUID, 
+    role_update: schemas.UserRoleUpdate
+) -> Optional[User]:
+    db_user = await db.get(User, user_id)
+    if not db_user:
+        return None
+    
+    db_user.role = role_update.role
+    # Access-токены со старой ролью отклоняются, по refresh-токену выдаются новые
+    await db.execute(bump_token_version_statement(db_user.id))
+    await db.commit()
+    await db.refresh(db_user)
+    invalidate_principal(db_user.id)
+    return db_user
+
+async def delete_user(db: AsyncSession, user_id: UUID) -> bool:
+    db_user = await db.get(User, user_id)
+    if not db_user:
+        return False
+    
+    await db.delete(db_user)
+    await db.commit()
+    invalidate_principal(user_id)
+    return True
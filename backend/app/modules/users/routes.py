@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app.core.database import get_db
 from app.modules.auth.dependencies import get_current_active_user
 from app.modules.auth.models import User
+from app.core.serialization import json_response
+from app.shared.pagination import NEXT_CURSOR_HEADER
 from . import services, schemas
 from .dependencies import get_current_admin_user
 
@@ -35,12 +37,18 @@ def update_my_profile(
 # Административные эндпоинты
 @router.get("/", response_model=List[schemas.UserResponse])
 def get_all_users(
-    skip: int = 0,
-    limit: int = 100,
+    skip: int = Query(0, ge=0, description="Устарело: используйте cursor"),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Курсор из заголовка X-Next-Cursor"),
     current_user: User = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
-    return services.get_all_users(db, skip=skip, limit=limit)
+    try:
+        users, next_cursor = services.get_all_users(db, skip=skip, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return json_response(List[schemas.UserResponse], users, headers)
 
 @router.put("/{user_id}/role", response_model=schemas.UserResponse)
 def update_user_role(
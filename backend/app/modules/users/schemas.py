@@ -3,7 +3,7 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from app.modules.auth.schemas import UserBase
+from app.modules.auth.schemas import UserBase, UserRole
 
 # Request schemas
 class UserUpdate(BaseModel):
@@ -13,7 +13,7 @@ class UserUpdate(BaseModel):
     phone: Optional[str] = None
 
 class UserRoleUpdate(BaseModel):
-    role: str
+    role: UserRole
 
 # Response schemas (наследуем от auth)
 from app.modules.auth.schemas import UserResponse
@@ -1,8 +1,12 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from uuid import UUID
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.modules.auth.models import User
+from app.modules.auth.services import invalidate_principal
+from app.modules.auth.tokens import bump_token_version_statement
+from app.shared.pagination import keyset_page, split_page
 from . import schemas
 
 def get_user_profile(db: Session, user_id: UUID) -> Optional[User]:
@@ -23,10 +27,24 @@ def update_user_profile(
     
     db.commit()
     db.refresh(db_user)
+    invalidate_principal(db_user.id)
     return db_user
 
-def get_all_users(db: Session, skip: int = 0, limit: int = 100) -> List[User]:
-    return db.query(User).offset(skip).limit(limit).all()
+def users_page_statement(cursor: Optional[str] = None, limit: int = 100, skip: int = 0):
+    """Пользователи по убыванию (created_at, id); skip оставлен для старых клиентов"""
+    statement = keyset_page(select(User), User, cursor, limit)
+    if skip:
+        statement = statement.offset(skip)
+    return statement
+
+def get_all_users(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None
+) -> Tuple[List[User], Optional[str]]:
+    rows = db.execute(users_page_statement(cursor, limit, skip)).scalars().all()
+    return split_page(rows, limit)
 
 def update_user_role(
     db: Session, 
@@ -38,8 +56,11 @@ def update_user_role(
         return None
     
     db_user.role = role_update.role
+    # Access-токены со старой ролью отклоняются, по refresh-токену выдаются новые
+    db.execute(bump_token_version_statement(db_user.id))
     db.commit()
     db.refresh(db_user)
+    invalidate_principal(db_user.id)
     return db_user
 
 def delete_user(db: Session, user_id: UUID) -> bool:
@@ -49,4 +70,5 @@ def delete_user(db: Session, user_id: UUID) -> bool:
     
     db.delete(db_user)
     db.commit()
+    invalidate_principal(user_id)
     return True
\ No newline at end of file
@@ -0,0 +1,40 @@
+import base64
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import tuple_
+
+# Заголовок ответа с курсором следующей страницы (тело остается списком)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(created_at: datetime, id: UUID) -> str:
+    raw = f"{created_at.isoformat()}|{id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Разбирает курсор; на некорректное значение бросает ValueError"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, id = raw.split("|")
+        return datetime.fromisoformat(created_at), UUID(id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+def keyset_page(statement, model, cursor: Optional[str], limit: int):
+    """Страница по убыванию (created_at, id) начиная после курсора.
+
+    Выбирает на одну строку больше limit, чтобы понять, есть ли следующая страница.
+    """
+    if cursor:
+        created_at, id = decode_cursor(cursor)
+        statement = statement.where(tuple_(model.created_at, model.id) < tuple_(created_at, id))
+    return statement.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+
+def split_page(rows: Sequence[Any], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """Отрезает лишнюю строку и возвращает элементы страницы и курсор следующей"""
+    items = list(rows[:limit])
+    if len(rows) <= limit:
+        return items, None
+    last = items[-1]
+    return items, encode_cursor(last.created_at, last.id)
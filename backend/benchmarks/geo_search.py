@@ -0,0 +1,112 @@
+"""Бенчмарк поиска отелей рядом с точкой на синтетическом каталоге.
+
+Заполняет hotels (и по номеру на отель) точками, сгруппированными вокруг крупных
+городов, внутри транзакции, замеряет поиск в радиусе с GiST-индексом по прямоугольнику
+и без индексов (SET LOCAL), а также только по гаверсинусу без прямоугольника,
+и откатывает транзакцию. Нужна база с индексами из 01-init-tables.sql:
+
+    DATABASE_URL=postgresql://localhost/hotel python -m benchmarks.geo_search --hotels 200000
+"""
+import argparse
+import json
+import statistics
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import select, text
+
+from app.core.database import engine
+from app.modules.auth import models as auth_models  # noqa: F401 - User для relationship() отеля
+from app.modules.hotels import schemas
+from app.modules.hotels.geo import distance_km
+from app.modules.hotels.models import Hotel
+from app.modules.hotels.services import search_statement
+
+# Центры скоплений (широта, долгота) и разброс точек вокруг них в градусах
+CLUSTERS = [(48.8566, 2.3522), (51.5074, -0.1278), (40.7128, -74.0060), (35.6762, 139.6503), (55.7558, 37.6173)]
+
+SYNTHETIC_CATALOGUE = """
+WITH manager AS (
+    INSERT INTO users (email, password_hash, first_name, last_name, role)
+    VALUES ('geo-benchmark@example.com', '-', 'Bench', 'Mark', 'hotel_manager')
+    RETURNING id
+), room_type AS (
+    INSERT INTO room_types (name, base_price, capacity) VALUES ('Benchmark', 100, 2) RETURNING id
+), centers AS (
+    SELECT ordinality - 1 AS n, (c->>0)::float8 AS lat, (c->>1)::float8 AS lon
+    FROM jsonb_array_elements(CAST(:clusters AS jsonb)) WITH ORDINALITY AS t(c, ordinality)
+), hotels_inserted AS (
+    INSERT INTO hotels (name, city, country, address, latitude, longitude, manager_id, star_rating)
+    SELECT 'Hotel ' || i, 'City', 'Country', 'Street ' || i,
+           centers.lat + (random() - 0.5) * :spread, centers.lon + (random() - 0.5) * :spread,
+           (SELECT id FROM manager), 1 + i % 5
+    FROM generate_series(1, :hotels) AS i
+    JOIN centers ON centers.n = i % (SELECT count(*) FROM centers)
+    RETURNING id
+)
+INSERT INTO rooms (hotel_id, room_type_id, room_number)
+SELECT id, (SELECT id FROM room_type), '1' FROM hotels_inserted
+"""
+
+def time_query(connection, statement, repeat: int) -> float:
+    """Медиана времени выполнения в миллисекундах"""
+    connection.execute(statement).all()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        connection.execute(statement).all()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+def haversine_only_statement(latitude: float, longitude: float, radius_km: float, limit: int = 50):
+    """Наивный вариант: расстояние до каждого отеля без отбора по прямоугольнику"""
+    distance = distance_km(latitude, longitude)
+    return select(Hotel.id, distance.label("distance_km"))\
+        .where(Hotel.is_active == True, distance <= radius_km)\
+        .order_by(distance).limit(limit)
+
+def main():
+    parser = argparse.ArgumentParser(description="Nearby hotel search latency on a synthetic catalogue")
+    parser.add_argument("--hotels", type=int, default=200_000)
+    parser.add_argument("--spread", type=float, default=6.0, help="Разброс точек вокруг центра, градусы")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    latitude, longitude = CLUSTERS[0]
+    check_in = date.today() + timedelta(days=30)
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        try:
+            started = time.perf_counter()
+            connection.execute(text(SYNTHETIC_CATALOGUE), {
+                "hotels": args.hotels, "spread": args.spread,
+                "clusters": json.dumps(CLUSTERS)
+            })
+            connection.execute(text("ANALYZE hotels, rooms"))
+            print(f"catalogue: {args.hotels} hotels in {time.perf_counter() - started:.1f}s")
+
+            cases = {}
+            for radius in (5, 50, 200):
+                cases[f"search r={radius} km"] = search_statement(schemas.SearchFilters(
+                    latitude=latitude, longitude=longitude, radius_km=radius, limit=50
+                ))
+            cases["search r=50 km + dates/guests"] = search_statement(schemas.SearchFilters(
+                latitude=latitude, longitude=longitude, radius_km=50, limit=50,
+                check_in=check_in, check_out=check_in + timedelta(days=3), guests=2
+            ))
+            cases["haversine only r=50 km"] = haversine_only_statement(latitude, longitude, 50)
+
+            print(f"{'query':<34} {'gist bbox':>10} {'seq scan':>10}")
+            for label, statement in cases.items():
+                indexed = time_query(connection, statement, args.repeat)
+                savepoint = connection.begin_nested()
+                connection.execute(text("SET LOCAL enable_bitmapscan = off"))
+                connection.execute(text("SET LOCAL enable_indexscan = off"))
+                scanned = time_query(connection, statement, max(args.repeat // 4, 3))
+                savepoint.rollback()
+                print(f"{label:<34} {indexed:>7.1f} ms {scanned:>7.1f} ms")
+        finally:
+            transaction.rollback()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Бенчмарк группового бронирования (POST /api/bookings/group) против последовательного.
+
+Создает отель с --rooms номерами двух типов и бронирует группы по --group-size номеров
+на непересекающиеся даты: последовательно, по одному create_booking на номер (как N
+вызовов POST /api/bookings/, каждый со своей проверкой, расчетом цены и коммитом),
+и одним create_group_booking на группу. Все выполняется в одной транзакции, которая
+откатывается (коммиты сервисов фиксируют savepoint):
+
+    DATABASE_URL=postgresql://localhost/hotel python -m benchmarks.group_booking
+"""
+import argparse
+import statistics
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.database import engine
+from app.modules.auth import models as auth_models  # noqa: F401 - модели для relationship()
+from app.modules.bookings import schemas, services
+
+HOTEL = """
+WITH manager AS (
+    INSERT INTO users (email, password_hash, first_name, last_name, role)
+    VALUES ('group-benchmark@example.com', '-', 'Bench', 'Mark', 'hotel_manager')
+    RETURNING id
+), hotel AS (
+    INSERT INTO hotels (name, city, country, address, manager_id)
+    SELECT 'Group Benchmark', 'Benchcity', 'Benchland', 'Street 1', id FROM manager
+    RETURNING id
+), room_types AS (
+    INSERT INTO room_types (name, base_price, capacity)
+    VALUES ('Group benchmark standard', 100, 2), ('Group benchmark family', 180, 4)
+    RETURNING id, capacity
+), rooms AS (
+    INSERT INTO rooms (hotel_id, room_type_id, room_number)
+    SELECT (SELECT id FROM hotel), room_types.id, capacity || '-' || i
+    FROM room_types, generate_series(1, :rooms_per_type) AS i
+)
+SELECT (SELECT id FROM hotel), (SELECT id FROM manager), array_agg(id ORDER BY capacity) FROM room_types
+"""
+
+def sequential(session: Session, guest_id, room_ids, check_in: date, check_out: date) -> None:
+    for room_id in room_ids:
+        services.create_booking(session, schemas.BookingCreate(
+            room_id=room_id, check_in_date=check_in, check_out_date=check_out, number_of_guests=2
+        ), guest_id)
+
+def group(session: Session, guest_id, hotel_id, counts, check_in: date, check_out: date) -> None:
+    services.create_group_booking(session, schemas.GroupBookingCreate(
+        hotel_id=hotel_id, check_in_date=check_in, check_out_date=check_out, number_of_guests=2,
+        rooms=[schemas.GroupBookingRooms(room_type_id=room_type_id, count=count) for room_type_id, count in counts.items()]
+    ), guest_id)
+
+def main():
+    parser = argparse.ArgumentParser(description="Group booking vs sequential single-room bookings")
+    parser.add_argument("--rooms", type=int, default=200, help="Rooms in the hotel (half of each type)")
+    parser.add_argument("--group-size", type=int, default=20)
+    parser.add_argument("--groups", type=int, default=20, help="Groups booked by each method")
+    args = parser.parse_args()
+
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        session = Session(bind=connection, join_transaction_mode="create_savepoint")
+        try:
+            hotel_id, guest_id, room_type_ids = connection.execute(
+                text(HOTEL), {"rooms_per_type": max(args.rooms // 2, 1)}
+            ).one()
+            rooms = connection.execute(text(
+                "SELECT id, room_type_id FROM rooms WHERE hotel_id = :hotel_id ORDER BY room_number"
+            ), {"hotel_id": hotel_id}).all()
+            # Группа - поровну номеров обоих типов
+            counts = {room_type_ids[0]: args.group_size // 2, room_type_ids[1]: args.group_size - args.group_size // 2}
+            room_ids = [room_id for room_type_id, count in counts.items()
+                        for room_id in [room.id for room in rooms if room.room_type_id == room_type_id][:count]]
+            connection.execute(text("ANALYZE rooms, bookings, room_nights"))
+            print(f"hotel with {len(rooms)} rooms, {args.groups} groups of {args.group_size} rooms")
+            print(f"{'method':<12} {'ms/group':>9} {'p95 ms':>8} {'rooms/s':>9}")
+
+            first_night = date.today() + timedelta(days=400)
+            for method_index, name in enumerate(("sequential", "group")):
+                timings = []
+                for index in range(args.groups):
+                    # Каждая группа - на свои даты, чтобы номера были свободны
+                    check_in = first_night + timedelta(days=3 * (method_index * args.groups + index))
+                    check_out = check_in + timedelta(days=2)
+                    started = time.perf_counter()
+                    if name == "sequential":
+                        sequential(session, guest_id, room_ids, check_in, check_out)
+                    else:
+                        group(session, guest_id, hotel_id, counts, check_in, check_out)
+                    timings.append((time.perf_counter() - started) * 1000)
+                p95 = statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0]
+                mean = statistics.mean(timings)
+                print(f"{name:<12} {mean:>9.1f} {p95:>8.1f} {args.group_size * 1000 / mean:>9.0f}")
+        finally:
+            session.close()
+            transaction.rollback()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Бенчмарк текстового поиска отелей на синтетическом каталоге.
+
+Заполняет hotels (и по номеру на отель) синтетическими данными внутри транзакции,
+замеряет запросы поиска и автодополнения с триграммными индексами и без них
+(индексные планы отключаются через SET LOCAL) и откатывает транзакцию.
+Нужна база с расширением pg_trgm и индексами из 01-init-tables.sql:
+
+    DATABASE_URL=postgresql://localhost/hotel python -m benchmarks.hotel_search --hotels 100000
+"""
+import argparse
+import statistics
+import time
+
+from sqlalchemy import text
+
+from app.core.database import engine
+from app.modules.auth import models as auth_models  # noqa: F401 - User для relationship() отеля
+from app.modules.hotels import schemas
+from app.modules.hotels.services import search_statement
+from app.modules.hotels.text_search import destination_autocomplete_statement, similarity_threshold_statement
+
+# Псевдослова из md5: цифры заменены буквами, чтобы триграммы были похожи на текст
+SYNTHETIC_CATALOGUE = """
+WITH manager AS (
+    INSERT INTO users (email, password_hash, first_name, last_name, role)
+    VALUES ('search-benchmark@example.com', '-', 'Bench', 'Mark', 'hotel_manager')
+    RETURNING id
+), room_type AS (
+    INSERT INTO room_types (name, base_price, capacity) VALUES ('Benchmark', 100, 2) RETURNING id
+), words AS (
+    SELECT i,
+           initcap(translate(substr(md5(i::text), 1, 8), '0123456789', 'aeioulmnrs')) AS name_word,
+           initcap(translate(substr(md5((i % :cities)::text), 1, 7), '0123456789', 'aeioulmnrs')) AS city,
+           initcap(translate(substr(md5((i % :countries)::text || 'c'), 1, 6), '0123456789', 'aeioulmnrs')) AS country
+    FROM generate_series(1, :hotels) AS i
+), hotels_inserted AS (
+    INSERT INTO hotels (name, city, country, address, description, manager_id, star_rating)
+    SELECT 'Hotel ' || name_word, city, country, 'Street ' || i,
+           'Comfortable rooms in ' || city || ', ' || name_word || ' district',
+           (SELECT id FROM manager), 1 + i % 5
+    FROM words
+    RETURNING id
+)
+INSERT INTO rooms (hotel_id, room_type_id, room_number)
+SELECT id, (SELECT id FROM room_type), '1' FROM hotels_inserted
+"""
+
+def time_query(connection, statement, repeat: int) -> float:
+    """Медиана времени выполнения в миллисекундах"""
+    connection.execute(statement).all()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        connection.execute(statement).all()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description="Hotel text search latency on a synthetic catalogue")
+    parser.add_argument("--hotels", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        try:
+            started = time.perf_counter()
+            connection.execute(text(SYNTHETIC_CATALOGUE), {
+                "hotels": args.hotels, "cities": max(args.hotels // 20, 1), "countries": 150
+            })
+            connection.execute(text("ANALYZE hotels, rooms"))
+            print(f"catalogue: {args.hotels} hotels in {time.perf_counter() - started:.1f}s")
+
+            city, name = connection.execute(text(
+                "SELECT city, substr(name, 7) FROM hotels ORDER BY created_at DESC, id LIMIT 1"
+            )).one()
+            typo = city[:2] + city[3:]  # пропущенная буква
+            connection.execute(similarity_threshold_statement())
+            cases = {
+                f"city ILIKE '%{city[1:5]}%'": search_statement(schemas.SearchFilters(city=city[1:5], limit=50)),
+                f"q={name!r} (exact word)": search_statement(schemas.SearchFilters(q=name, limit=50)),
+                f"q={typo!r} (typo)": search_statement(schemas.SearchFilters(q=typo, limit=50)),
+                f"autocomplete {city[:3]!r}": destination_autocomplete_statement(city[:3]),
+                f"autocomplete {typo[:5]!r} (typo)": destination_autocomplete_statement(typo[:5]),
+            }
+
+            print(f"{'query':<40} {'trigram index':>14} {'seq scan':>10}")
+            for label, statement in cases.items():
+                indexed = time_query(connection, statement, args.repeat)
+                savepoint = connection.begin_nested()
+                connection.execute(text("SET LOCAL enable_bitmapscan = off"))
+                connection.execute(text("SET LOCAL enable_indexscan = off"))
+                scanned = time_query(connection, statement, max(args.repeat // 4, 3))
+                savepoint.rollback()
+                print(f"{label:<40} {indexed:>11.1f} ms {scanned:>7.1f} ms")
+        finally:
+            transaction.rollback()
+
+if __name__ == "__main__":
+    main()
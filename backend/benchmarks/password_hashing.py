@@ -0,0 +1,72 @@
+"""Пропускная способность проверки паролей для разных настроек KDF.
+
+Для каждой схемы и стоимости меряет проверки пароля в секунду в одном потоке
+и в пуле из --workers потоков (bcrypt, argon2 и pbkdf2 отпускают GIL), то есть
+верхнюю границу входов в секунду на ядро. Запуск из каталога backend (БД не нужна,
+но настройки приложения требуют DATABASE_URL):
+
+    DATABASE_URL=postgresql://localhost/hotel python -m benchmarks.password_hashing
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from passlib.exc import MissingBackendError
+
+from app.modules.auth.passwords import build_password_context, legacy_sha256
+
+# (схема, стоимость); None - стоимость passlib по умолчанию
+SETTINGS = [
+    ("legacy_sha256", None),
+    ("pbkdf2_sha256", 29000),
+    ("pbkdf2_sha256", 200000),
+    ("bcrypt", 10),
+    ("bcrypt", 12),
+    ("argon2", None),
+]
+
+def verifications_per_second(verify, seconds: float, workers: int) -> float:
+    """Число проверок в секунду за seconds секунд при workers параллельных потоках"""
+    deadline = time.perf_counter() + seconds
+
+    def loop() -> int:
+        count = 0
+        while time.perf_counter() < deadline:
+            verify()
+            count += 1
+        return count
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        total = sum(executor.map(lambda _: loop(), range(workers)))
+    return total / (time.perf_counter() - started)
+
+def main():
+    parser = argparse.ArgumentParser(description="Password verification throughput per KDF setting")
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    print(f"{'scheme':<16} {'cost':>7} {'ms/verify':>10} {'1 thread/s':>11} {f'{args.workers} threads/s':>12} {'per core/s':>11}")
+    for scheme, rounds in SETTINGS:
+        if scheme == "legacy_sha256":
+            handler = legacy_sha256
+            password_hash = handler.hash("correct horse battery staple")
+            verify = lambda: handler.verify("correct horse battery staple", password_hash)
+        else:
+            context = build_password_context(scheme, rounds)
+            try:
+                password_hash = context.hash("correct horse battery staple")
+            except MissingBackendError:
+                print(f"{scheme:<16} {'-':>7}  skipped: backend is not installed")
+                continue
+            verify = lambda: context.verify("correct horse battery staple", password_hash)
+
+        single = verifications_per_second(verify, args.seconds, 1)
+        pooled = verifications_per_second(verify, args.seconds, args.workers)
+        cost = "default" if rounds is None else str(rounds)
+        print(f"{scheme:<16} {cost:>7} {1000 / single:>10.2f} {single:>11.0f} {pooled:>12.0f} {pooled / args.workers:>11.0f}")
+
+if __name__ == "__main__":
+    main()
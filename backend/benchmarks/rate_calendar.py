@@ -0,0 +1,112 @@
+"""Бенчмарк загрузки календаря цен (PUT /api/hotels/room-types/pricing).
+
+Создает --room-types типов номеров и загружает по --days ночей на каждый (по умолчанию
+4 x 25000 = 100000 строк pricing) тремя способами:
+
+- executemany: INSERT ... ON CONFLICT со списком строк (multi-VALUES драйвера);
+- unnest: pricing.upsert_rate_calendar - пачки по RATE_CALENDAR_BATCH_SIZE массивами;
+- copy: COPY во временную таблицу и INSERT ... SELECT ON CONFLICT (только psycopg2).
+
+Каждый способ меряется на пустом календаре (вставка) и повторной загрузкой с другими
+ценами (обновление всех строк). Все выполняется в одной транзакции, которая откатывается:
+
+    DATABASE_URL=postgresql://localhost/hotel python -m benchmarks.rate_calendar
+"""
+import argparse
+import io
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import delete, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.database import engine
+from app.modules.auth import models as auth_models  # noqa: F401 - модели для relationship()
+from app.modules.bookings import models as booking_models  # noqa: F401
+from app.modules.hotels import pricing, schemas
+from app.modules.hotels.models import Pricing
+
+def build_upload(room_type_ids, days: int, price_shift: int) -> schemas.RateCalendarUpload:
+    start = date.today()
+    return schemas.RateCalendarUpload(room_types=[
+        schemas.RoomTypeRateCalendar(
+            room_type_id=room_type_id,
+            days=[
+                schemas.PricingCreate(date=start + timedelta(days=offset), price=100 + (offset + price_shift) % 50,
+                                      is_available=offset % 30 != 0)
+                for offset in range(days)
+            ]
+        )
+        for room_type_id in room_type_ids
+    ])
+
+def upsert_executemany(session: Session, upload: schemas.RateCalendarUpload) -> None:
+    statement = pg_insert(Pricing.__table__)
+    statement = statement.on_conflict_do_update(
+        index_elements=["room_type_id", "date"],
+        set_={"price": statement.excluded.price, "is_available": statement.excluded.is_available}
+    )
+    session.execute(statement, pricing.expand_rate_calendar(upload))
+
+def upsert_unnest(session: Session, upload: schemas.RateCalendarUpload) -> None:
+    pricing.upsert_rate_calendar(session, upload)
+
+def upsert_copy(session: Session, upload: schemas.RateCalendarUpload) -> None:
+    buffer = io.StringIO()
+    for row in pricing.expand_rate_calendar(upload):
+        buffer.write(f"{row['room_type_id']}\t{row['date']}\t{row['price']}\t{'t' if row['is_available'] else 'f'}\n")
+    buffer.seek(0)
+    session.execute(text(
+        "CREATE TEMP TABLE IF NOT EXISTS pricing_staging "
+        "(room_type_id uuid, date date, price numeric(10, 2), is_available boolean) ON COMMIT DROP"
+    ))
+    cursor = session.connection().connection.cursor()
+    cursor.copy_expert("COPY pricing_staging FROM STDIN", buffer)
+    session.execute(text(
+        "INSERT INTO pricing (id, room_type_id, date, price, is_available, created_at, updated_at) "
+        "SELECT gen_random_uuid(), room_type_id, date, price, is_available, now(), now() FROM pricing_staging "
+        "ON CONFLICT (room_type_id, date) DO UPDATE "
+        "SET price = excluded.price, is_available = excluded.is_available, updated_at = now()"
+    ))
+    session.execute(text("TRUNCATE pricing_staging"))
+
+METHODS = {"executemany": upsert_executemany, "unnest": upsert_unnest, "copy": upsert_copy}
+
+def main():
+    parser = argparse.ArgumentParser(description="Rate calendar upload throughput")
+    parser.add_argument("--room-types", type=int, default=4)
+    parser.add_argument("--days", type=int, default=25_000)
+    parser.add_argument("--methods", default=",".join(METHODS), help="Comma-separated: " + ", ".join(METHODS))
+    args = parser.parse_args()
+
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        # commit() сервиса фиксирует только savepoint - внешняя транзакция откатывается в конце
+        session = Session(bind=connection, join_transaction_mode="create_savepoint")
+        try:
+            room_type_ids = connection.execute(text(
+                "INSERT INTO room_types (name, base_price, capacity) "
+                "SELECT 'Rate benchmark ' || i, 100, 2 FROM generate_series(1, :count) AS i RETURNING id"
+            ), {"count": args.room_types}).scalars().all()
+            uploads = [build_upload(room_type_ids, args.days, shift) for shift in (0, 7)]
+            rows = args.room_types * args.days
+            print(f"{rows} rows: {args.room_types} room types x {args.days} days")
+            print(f"{'method':<12} {'insert, s':>10} {'rows/s':>9} {'update, s':>10} {'rows/s':>9}")
+
+            for name in args.methods.split(","):
+                method = METHODS[name]
+                timings = []
+                for upload in uploads:
+                    started = time.perf_counter()
+                    method(session, upload)
+                    session.flush()
+                    timings.append(time.perf_counter() - started)
+                print(f"{name:<12} {timings[0]:>10.2f} {rows / timings[0]:>9.0f} {timings[1]:>10.2f} {rows / timings[1]:>9.0f}")
+                session.execute(delete(Pricing).where(Pricing.room_type_id.in_(room_type_ids)))
+        finally:
+            session.close()
+            transaction.rollback()
+
+if __name__ == "__main__":
+    main()
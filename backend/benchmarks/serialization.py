@@ -0,0 +1,128 @@
+"""Микробенчмарк сериализации списка бронирований.
+
+Сравнивает стоимость ответа на 1000 бронирований (с номером, типом номера, отелем,
+гостем и платежами) для стандартного пути FastAPI и для json_response.
+Запуск из каталога backend (данные не читаются из БД, но при импорте приложения
+создается движок, поэтому нужен доступный DATABASE_URL):
+
+    DATABASE_URL=postgresql://localhost/hotel python -m benchmarks.serialization --bookings 1000
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import List
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.core.serialization import dump_json, json_response
+from app.modules.auth.models import User
+from app.modules.bookings.models import Booking, Payment
+from app.modules.bookings.schemas import BookingResponse
+from app.modules.hotels.models import Hotel, Room, RoomType
+
+def build_bookings(count: int) -> List[Booking]:
+    """Несохраненные ORM-объекты того же вида, что загружает booking_load_options()"""
+    now = datetime(2024, 1, 1, 12, 0)
+    hotel = Hotel(id=uuid.uuid4(), name="Гранд Отель", city="Москва", country="Россия", address="Тверская, 1")
+    room_type = RoomType(id=uuid.uuid4(), name="Стандарт", capacity=2, base_price=Decimal("5000.00"))
+    guest = User(id=uuid.uuid4(), first_name="Иван", last_name="Петров", email="ivan@example.com")
+    rooms = [
+        Room(id=uuid.uuid4(), room_number=str(100 + number), hotel=hotel, room_type=room_type)
+        for number in range(50)
+    ]
+    bookings = []
+    for index in range(count):
+        room = rooms[index % len(rooms)]
+        check_in = date(2024, 1, 1) + timedelta(days=index % 300)
+        booking = Booking(
+            id=uuid.uuid4(),
+            guest_id=guest.id,
+            room_id=room.id,
+            check_in_date=check_in,
+            check_out_date=check_in + timedelta(days=3),
+            number_of_guests=2,
+            total_price=Decimal("15000.00"),
+            status="confirmed",
+            special_requests="Поздний заезд" if index % 3 == 0 else None,
+            created_at=now,
+            cancelled_at=None,
+            room=room,
+            guest=guest
+        )
+        booking.payments = [
+            Payment(
+                id=uuid.uuid4(),
+                amount=Decimal("15000.00"),
+                payment_method="card",
+                payment_status="completed",
+                transaction_id=f"tx-{index}",
+                payment_date=now,
+                created_at=now
+            )
+        ]
+        bookings.append(booking)
+    return bookings
+
+async def fastapi_default(field, bookings, response_class) -> bytes:
+    """Путь FastAPI: валидация -> dict -> jsonable-данные -> json.dumps/orjson.dumps"""
+    content = await serialize_response(field=field, response_content=bookings)
+    return response_class(content).body
+
+def measure(name: str, run, repeat: int, count: int) -> float:
+    run()  # прогрев: TypeAdapter, схемы FastAPI
+    started = time.perf_counter()
+    for _ in range(repeat):
+        body = run()
+    elapsed = (time.perf_counter() - started) / repeat
+    per_1k = elapsed * 1000 / count * 1000
+    print(f"{name:<38} {per_1k:8.2f} ms / 1k bookings  ({len(body) / 1024:.0f} KiB)")
+    return per_1k
+
+def main():
+    parser = argparse.ArgumentParser(description="Serialization cost of List[BookingResponse]")
+    parser.add_argument("--bookings", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    bookings = build_bookings(args.bookings)
+    field = create_response_field(name="Response_bookings", type_=List[BookingResponse])
+    loop = asyncio.new_event_loop()
+
+    baseline = measure(
+        "FastAPI default (JSONResponse)",
+        lambda: loop.run_until_complete(fastapi_default(field, bookings, JSONResponse)),
+        args.repeat, args.bookings
+    )
+    results = {
+        "FastAPI default + ORJSONResponse": measure(
+            "FastAPI default + ORJSONResponse",
+            lambda: loop.run_until_complete(fastapi_default(field, bookings, ORJSONResponse)),
+            args.repeat, args.bookings
+        ),
+        "dump_json (validate + pydantic-core)": measure(
+            "dump_json (validate + pydantic-core)",
+            lambda: dump_json(List[BookingResponse], bookings),
+            args.repeat, args.bookings
+        ),
+        "json_response (no validation, orjson)": measure(
+            "json_response (no validation, orjson)",
+            lambda: json_response(List[BookingResponse], bookings).body,
+            args.repeat, args.bookings
+        ),
+    }
+    
+    # Быстрый путь должен отдавать то же, что и стандартный
+    expected = json.loads(loop.run_until_complete(fastapi_default(field, bookings, JSONResponse)))
+    assert json.loads(json_response(List[BookingResponse], bookings).body) == expected
+    for name, per_1k in results.items():
+        print(f"{name}: x{baseline / per_1k:.1f} faster than default")
+    loop.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""Изменяющие эндпоинты в режиме DB_ASYNC: бронирования, платежи, отели, номера и токены"""
+from datetime import date, timedelta
+
+import pytest
+
+from conftest import auth_headers, require_database
+
+require_database()
+
+from app.core.config import settings
+
+if not settings.DB_ASYNC:
+    pytest.skip("the application runs without DB_ASYNC", allow_module_level=True)
+
+PASSWORD = "correct horse battery"
+CHECK_IN = date.today() + timedelta(days=50)
+CHECK_OUT = CHECK_IN + timedelta(days=2)
+
+def _booking(room_id, check_in=CHECK_IN, check_out=CHECK_OUT):
+    return {
+        "room_id": str(room_id),
+        "check_in_date": check_in.isoformat(),
+        "check_out_date": check_out.isoformat(),
+        "number_of_guests": 2
+    }
+
+def test_booking_lifecycle(client, data):
+    manager = data.user("hotel_manager", password=PASSWORD)
+    admin = data.user("admin", password=PASSWORD)
+    guest = data.user(password=PASSWORD)
+    hotel = data.hotel({"Standard": (2, 100, 2)}, manager_id=manager.id)
+    room_id = hotel.rooms["Standard"][0]
+    guest_headers = auth_headers(client, guest)
+
+    response = client.post("/api/bookings/", json=_booking(room_id), headers=guest_headers)
+    assert response.status_code == 200, response.text
+    booking = response.json()
+    assert booking["status"] == "pending"
+    assert booking["total_price"] == 200
+    assert booking["room"]["hotel"]["id"] == str(hotel.id)
+
+    response = client.post("/api/bookings/", json=_booking(room_id, CHECK_IN + timedelta(days=1)), headers=guest_headers)
+    assert response.status_code == 409
+
+    response = client.get("/api/bookings/availability/check", params={
+        "room_id": str(room_id), "check_in": CHECK_IN.isoformat(), "check_out": CHECK_OUT.isoformat()
+    })
+    assert response.json() == {"available": False, "estimated_price": 200.0, "nights": 2}
+
+    response = client.put(f"/api/bookings/{booking['id']}/status", json={"status": "confirmed"},
+                          headers=auth_headers(client, manager))
+    assert response.status_code == 200, response.text
+    assert response.json()["status"] == "confirmed"
+    assert response.json()["room"]["room_type"]["name"] == "Standard"
+
+    response = client.post("/api/bookings/payments/", json={
+        "booking_id": booking["id"], "amount": 200, "payment_method": "card"
+    }, headers=guest_headers)
+    assert response.status_code == 200, response.text
+    payment = response.json()
+    response = client.put(f"/api/bookings/payments/{payment['id']}/status",
+                          params={"status": "completed", "transaction_id": "tx-1"},
+                          headers=auth_headers(client, admin))
+    assert response.status_code == 200, response.text
+    assert response.json()["payment_status"] == "completed"
+    assert response.json()["payment_date"] is not None
+
+    response = client.put(f"/api/bookings/{booking['id']}/cancel", headers=guest_headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["status"] == "cancelled"
+
+    # Ночи освобождены: номер снова можно забронировать
+    response = client.post("/api/bookings/", json=_booking(room_id), headers=guest_headers)
+    assert response.status_code == 200, response.text
+
+def test_group_booking(client, data):
+    guest = data.user(password=PASSWORD)
+    hotel = data.hotel({"Standard": (2, 100, 3), "Suite": (4, 300, 1)})
+    payload = {
+        "hotel_id": str(hotel.id),
+        "check_in_date": CHECK_IN.isoformat(),
+        "check_out_date": CHECK_OUT.isoformat(),
+        "number_of_guests": 2,
+        "rooms": [
+            {"room_type_id": str(hotel.room_types["Standard"]), "count": 2},
+            {"room_type_id": str(hotel.room_types["Suite"]), "count": 1}
+        ]
+    }
+    headers = auth_headers(client, guest)
+
+    response = client.post("/api/bookings/group", json=payload, headers=headers)
+    assert response.status_code == 200, response.text
+    assert len(response.json()) == 3
+
+    response = client.post("/api/bookings/group", json=payload, headers=headers)
+    assert response.status_code == 409
+
+def test_hotel_management(client, data):
+    manager = data.user("hotel_manager", password=PASSWORD)
+    admin = data.user("admin", password=PASSWORD)
+    manager_headers = auth_headers(client, manager)
+    admin_headers = auth_headers(client, admin)
+
+    response = client.post("/api/hotels/room-types/", json={
+        "name": "Test Loft", "base_price": 120, "capacity": 2
+    }, headers=admin_headers)
+    assert response.status_code == 200, response.text
+    room_type = response.json()
+    data.room_type_ids.append(room_type["id"])
+
+    response = client.post("/api/hotels/", json={
+        "name": "Async Test Hotel", "address": "2 Test street", "city": "Testville async", "country": "Testland"
+    }, headers=manager_headers)
+    assert response.status_code == 200, response.text
+    hotel = response.json()
+    assert hotel["rooms"] == []
+    data.cities.append(hotel["city"])
+
+    response = client.put(f"/api/hotels/{hotel['id']}", json={"description": "Updated"}, headers=manager_headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["description"] == "Updated"
+
+    response = client.post(f"/api/hotels/{hotel['id']}/rooms", json={
+        "room_number": "101", "floor": 1, "room_type_id": room_type["id"]
+    }, headers=manager_headers)
+    assert response.status_code == 200, response.text
+    room = response.json()
+    assert room["room_type"]["name"] == "Test Loft"
+
+    response = client.put(f"/api/hotels/rooms/{room['id']}", json={"floor": 2}, headers=manager_headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["floor"] == 2
+    assert response.json()["room_type"]["id"] == room_type["id"]
+
+    response = client.post(f"/api/hotels/{hotel['id']}/rooms/import", json={"rooms": [
+        {"room_number": "102", "room_type": "Test Loft"},
+        {"room_number": "103", "room_type_id": room_type["id"]},
+        {"room_number": "104"}
+    ]}, headers=manager_headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["rooms_created"] == 2
+    assert len(response.json()["errors"]) == 1
+
+    response = client.put("/api/hotels/room-types/pricing", json={"room_types": [{
+        "room_type_id": room_type["id"],
+        "ranges": [{"start_date": CHECK_IN.isoformat(), "end_date": CHECK_OUT.isoformat(), "price": 150}]
+    }]}, headers=admin_headers)
+    assert response.status_code == 200, response.text
+    assert response.json() == {"room_types": 1, "rows": 3}
+
+    response = client.get(f"/api/hotels/availability/{hotel['id']}", params={
+        "check_in": CHECK_IN.isoformat(), "check_out": CHECK_OUT.isoformat()
+    })
+    assert response.json()["total_available_rooms"] == 3
+    assert response.json()["available_rooms"][0]["total_price"] == 300
+
+    other = data.user("hotel_manager", password=PASSWORD)
+    response = client.put(f"/api/hotels/{hotel['id']}", json={"description": "Stolen"},
+                          headers=auth_headers(client, other))
+    assert response.status_code == 403
+
+def test_tokens(client, data):
+    user = data.user(password=PASSWORD)
+    response = client.post("/api/auth/login", data={"username": user.email, "password": PASSWORD})
+    tokens = response.json()
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    response = client.get("/api/auth/me", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["email"] == user.email
+
+    response = client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 200, response.text
+    rotated = response.json()
+    # Повторный обмен того же токена отзывает цепочку
+    assert client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 401
+    assert client.post("/api/auth/refresh", json={"refresh_token": rotated["refresh_token"]}).status_code == 401
+
+    response = client.post("/api/auth/logout-all", headers=headers)
+    assert response.status_code == 204
+    assert client.get("/api/auth/me", headers=headers).status_code == 401
+
+def test_unknown_role_is_rejected(client, data):
+    response = client.post("/api/auth/register", json={
+        "email": "test-role@example.com", "password": PASSWORD,
+        "first_name": "Test", "last_name": "User", "role": "owner"
+    })
+    assert response.status_code == 422
+
+    admin = data.user("admin", password=PASSWORD)
+    guest = data.user()
+    response = client.put(f"/api/users/{guest.id}/role", json={"role": "superuser"},
+                          headers=auth_headers(client, admin))
+    assert response.status_code == 422
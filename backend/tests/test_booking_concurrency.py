@@ -0,0 +1,48 @@
+"""Параллельные бронирования одного номера на одни даты: успешно ровно одно"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from conftest import require_database
+
+require_database()
+
+from app.core.database import SessionLocal
+from app.modules.bookings import schemas, services
+from app.modules.bookings.models import Booking, RoomNight
+
+PARALLEL = 8
+
+def test_parallel_bookings_of_one_room(data):
+    hotel = data.hotel({"Standard": (2, 100, 1)})
+    room_id = hotel.rooms["Standard"][0]
+    guests = [data.user() for _ in range(PARALLEL)]
+    check_in = date.today() + timedelta(days=40)
+    # Пересекающиеся, но разные интервалы: конфликт не только при полном совпадении дат
+    requests = [
+        schemas.BookingCreate(
+            room_id=room_id,
+            check_in_date=check_in + timedelta(days=index % 2),
+            check_out_date=check_in + timedelta(days=3 + index % 2),
+            number_of_guests=1
+        )
+        for index in range(PARALLEL)
+    ]
+    barrier = threading.Barrier(PARALLEL)
+
+    def book(index):
+        with SessionLocal() as db:
+            barrier.wait()
+            try:
+                return services.create_booking(db, requests[index], guests[index].id).id
+            except services.BookingConflictError:
+                return None
+
+    with ThreadPoolExecutor(PARALLEL) as executor:
+        results = list(executor.map(book, range(PARALLEL)))
+
+    created = [booking_id for booking_id in results if booking_id is not None]
+    assert len(created) == 1
+    with SessionLocal() as db:
+        assert db.query(Booking).filter(Booking.room_id == room_id).count() == 1
+        assert db.query(RoomNight).filter(RoomNight.room_id == room_id).count() == 3
@@ -0,0 +1,68 @@
+"""Смена статуса бронирования, загруженного в сессию до блокировки строки"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from conftest import require_database
+
+require_database()
+
+from app.core.database import SessionLocal
+from app.modules.bookings import schemas, services
+from app.modules.hotels.models import DestinationPopularity
+
+CHECK_IN = date.today() + timedelta(days=60)
+
+def _pending_booking(data):
+    hotel = data.hotel({"Standard": (2, 100, 1)})
+    guest = data.user()
+    with SessionLocal() as db:
+        booking = services.create_booking(db, schemas.BookingCreate(
+            room_id=hotel.rooms["Standard"][0],
+            check_in_date=CHECK_IN,
+            check_out_date=CHECK_IN + timedelta(days=2),
+            number_of_guests=1
+        ), guest.id)
+        return hotel, booking.id
+
+def _popularity(city):
+    with SessionLocal() as db:
+        row = db.get(DestinationPopularity, {"city": city, "country": "Testland"})
+        return row.booking_count if row else 0
+
+def _transition_in_parallel(booking_id, statuses):
+    """Каждая сессия сначала читает бронирование (как зависимость эндпоинта), потом меняет статус"""
+    barrier = threading.Barrier(len(statuses))
+
+    def transition(status):
+        with SessionLocal() as db:
+            loaded = services.get_booking(db, booking_id)  # noqa: F841 - держит объект в identity map
+            barrier.wait()
+            return services.update_booking_status(db, booking_id, status).status
+
+    with ThreadPoolExecutor(len(statuses)) as executor:
+        return list(executor.map(transition, statuses))
+
+def test_parallel_confirmations_count_once(data):
+    hotel, booking_id = _pending_booking(data)
+
+    assert _transition_in_parallel(booking_id, ["confirmed", "confirmed"]) == ["confirmed", "confirmed"]
+    assert _popularity(hotel.city) == 1
+
+def test_confirm_and_cancel_in_parallel(data):
+    hotel, booking_id = _pending_booking(data)
+
+    _transition_in_parallel(booking_id, ["confirmed", "cancelled"])
+
+    with SessionLocal() as db:
+        booking = services.get_booking(db, booking_id)
+    # Какой бы переход ни был последним, счетчик соответствует итоговому статусу
+    assert _popularity(hotel.city) == (1 if booking.status == "confirmed" else 0)
+
+def test_transition_sees_status_committed_after_load(data):
+    hotel, booking_id = _pending_booking(data)
+    with SessionLocal() as stale, SessionLocal() as other:
+        loaded = services.get_booking(stale, booking_id)  # noqa: F841 - держит объект в identity map
+        services.update_booking_status(other, booking_id, "confirmed")
+        services.update_booking_status(stale, booking_id, "cancelled")
+    assert _popularity(hotel.city) == 0
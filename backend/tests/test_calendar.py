@@ -0,0 +1,32 @@
+"""Календарь доступности отеля и закрытые для продажи ночи календаря цен"""
+from datetime import date, timedelta
+
+from conftest import auth_headers, require_database
+
+require_database()
+
+START = date.today() + timedelta(days=90)
+
+def _free(client, hotel_id):
+    response = client.get(f"/api/hotels/{hotel_id}/calendar", params={"start": START.isoformat(), "days": 3})
+    assert response.status_code == 200, response.text
+    return {entry["name"]: entry["free"] for entry in response.json()["room_types"]}, response.json()["free"]
+
+def test_closed_night_has_no_free_rooms(client, data):
+    hotel = data.hotel({"Standard": (2, 100, 2), "Suite": (4, 300, 1)})
+    admin = data.user("admin", password="admin-password")
+
+    assert _free(client, hotel.id) == ({"Standard": [2, 2, 2], "Suite": [1, 1, 1]}, [3, 3, 3])
+
+    closed = START + timedelta(days=1)
+    response = client.put("/api/hotels/room-types/pricing", headers=auth_headers(client, admin), json={"room_types": [{
+        "room_type_id": str(hotel.room_types["Standard"]),
+        "days": [
+            {"date": START.isoformat(), "price": 120, "is_available": True},
+            {"date": closed.isoformat(), "price": 120, "is_available": False}
+        ]
+    }]})
+    assert response.status_code == 200, response.text
+
+    # Загрузка цен сбрасывает закешированный календарь
+    assert _free(client, hotel.id) == ({"Standard": [2, 0, 2], "Suite": [1, 1, 1]}, [3, 1, 3])
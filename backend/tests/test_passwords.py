@@ -0,0 +1,62 @@
+"""Регистрация и вход через пул хеширования паролей"""
+import asyncio
+import threading
+import uuid
+
+import pytest
+
+from conftest import require_database
+
+require_database()
+
+from app.core.database import SessionLocal
+from app.modules.auth import passwords
+from app.modules.auth.models import User
+
+PASSWORD = "correct horse battery"
+
+def test_cancelled_check_keeps_its_slot_until_hashing_ends(monkeypatch):
+    pending = threading.BoundedSemaphore(1)
+    monkeypatch.setattr(passwords, "_pending", pending)
+    started, hashing = threading.Event(), threading.Event()
+
+    def hash_slowly():
+        started.set()
+        hashing.wait()
+
+    async def cancel_check():
+        waiter = asyncio.ensure_future(passwords.run_bounded_async(hash_slowly))
+        # Отменяем, когда хеширование уже идет (задачу из очереди пул отменил бы сам)
+        while not started.is_set():
+            await asyncio.sleep(0.001)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+    try:
+        asyncio.run(cancel_check())
+        # Запрос отменен, но хеширование еще занимает поток пула
+        assert not pending.acquire(blocking=False)
+    finally:
+        hashing.set()
+    assert pending.acquire(timeout=5)
+
+def test_register_and_login_rehash_legacy_password(client, data):
+    email = f"test-{uuid.uuid4().hex[:12]}@example.com"
+    response = client.post("/api/auth/register", json={
+        "email": email, "password": PASSWORD, "first_name": "Test", "last_name": "User"
+    })
+    assert response.status_code == 200, response.text
+    user_id = uuid.UUID(response.json()["id"])
+    data.user_ids.append(user_id)
+
+    with SessionLocal() as db:
+        db.get(User, user_id).password_hash = passwords.legacy_sha256.hash(PASSWORD)
+        db.commit()
+
+    assert client.post("/api/auth/login", data={"username": email, "password": "wrong"}).status_code == 401
+    response = client.post("/api/auth/login", data={"username": email, "password": PASSWORD})
+    assert response.status_code == 200, response.text
+
+    with SessionLocal() as db:
+        assert passwords.password_context.identify(db.get(User, user_id).password_hash) == "bcrypt"
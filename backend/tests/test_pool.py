@@ -0,0 +1,27 @@
+"""Сессия запроса берет соединение из пула только при первом обращении к БД"""
+from sqlalchemy import text
+
+from conftest import require_database
+
+require_database()
+
+from app.core.database import engine, get_db, pool_metrics
+
+def test_connection_is_checked_out_on_first_query():
+    checked_out = engine.pool.checkedout()
+    waits = pool_metrics["sync"].checkout_wait.snapshot()["count"]
+
+    dependency = get_db()
+    db = next(dependency)
+    assert engine.pool.checkedout() == checked_out
+
+    db.execute(text("SELECT 1"))
+    assert engine.pool.checkedout() == checked_out + 1
+    # Ожидание в пуле измеряется при фактической выдаче соединения
+    assert pool_metrics["sync"].checkout_wait.snapshot()["count"] == waits + 1
+
+    dependency.close()
+    assert engine.pool.checkedout() == checked_out
+
+def test_pool_class_keeps_its_name():
+    assert type(engine.pool).__name__ == "QueuePool"
@@ -0,0 +1,81 @@
+"""Число SQL-запросов горячих путей отелей не зависит от числа отелей, номеров и бронирований"""
+from datetime import date, timedelta
+
+from conftest import require_database
+
+require_database()
+
+from app.core.serialization import dump_json
+from app.modules.bookings import schemas as booking_schemas
+from app.modules.bookings import services as booking_services
+from app.modules.hotels import schemas, services
+
+CHECK_IN = date.today() + timedelta(days=30)
+CHECK_OUT = CHECK_IN + timedelta(days=3)
+
+def _book(db, guest_id, room_id):
+    booking_services.create_booking(db, booking_schemas.BookingCreate(
+        room_id=room_id, check_in_date=CHECK_IN, check_out_date=CHECK_OUT, number_of_guests=1
+    ), guest_id)
+
+def test_availability_is_two_statements(data, db, statements):
+    hotel = data.hotel({"Standard": (2, 100, 15), "Suite": (4, 250, 10)})
+    guest = data.user()
+    for room_id in hotel.rooms["Standard"][:5]:
+        _book(db, guest.id, room_id)
+    db.expunge_all()
+
+    with statements() as stats:
+        result = services.get_hotel_availability(db, hotel.id, CHECK_IN, CHECK_OUT, 2)
+        dump_json(schemas.HotelAvailabilityResponse, result)
+
+    # Отель и свободные номера вместе с типами и ценами
+    assert stats.queries == 2
+    assert result["total_available_rooms"] == 20
+    assert result["room_types_available"]["Standard"]["total_available"] == 10
+
+def test_search_is_one_statement(data, db, statements):
+    hotels = [data.hotel({"Standard": (2, 100 + index, 3), "Suite": (4, 300, 2)}) for index in range(3)]
+    filters = [
+        schemas.SearchFilters(city=hotel.city, check_in=CHECK_IN, check_out=CHECK_OUT, guests=2)
+        for hotel in hotels
+    ]
+
+    for hotel_filters in filters:
+        with statements() as stats:
+            results = services.search_hotels(db, hotel_filters)
+            dump_json(list[schemas.HotelSearchResult], results)
+        assert stats.queries == 1
+        assert len(results) == 1
+        assert results[0]["available_rooms"] == 5
+
+def test_hotel_detail_statement_count(data, db, statements):
+    hotel = data.hotel({"Standard": (2, 100, 30), "Suite": (4, 250, 20)})
+
+    with statements() as stats:
+        found = services.get_hotel(db, hotel.id)
+        details = services.hotel_details_result(found)
+        dump_json(schemas.HotelDetailResponse, details)
+    assert stats.queries == 1
+
+    db.expunge_all()
+    with statements() as stats:
+        found = services.get_hotel(db, hotel.id)
+        details = services.hotel_details_result(found, services.get_hotel_rooms_page(db, hotel.id, 0, 40))
+        dump_json(schemas.HotelDetailResponse, details)
+    # Отель, страница номеров, их типы (selectinload) и общее число номеров
+    assert stats.queries == 4
+    assert details["rooms_total"] == 50
+    assert len(details["rooms"]) == 40
+
+def test_manager_hotels_statement_count(data, db, statements):
+    manager = data.user("hotel_manager")
+    for _ in range(3):
+        data.hotel({"Standard": (2, 100, 5), "Suite": (4, 250, 5)}, manager_id=manager.id)
+
+    with statements() as stats:
+        hotels = services.get_user_hotels(db, manager.id)
+        dump_json(list[schemas.HotelResponse], hotels)
+    # Отели, их номера и типы номеров
+    assert stats.queries == 3
+    assert len(hotels) == 3
@@ -0,0 +1,48 @@
+"""Метрики маршрутов: запросы потоковых ответов учитываются после отправки тела"""
+from datetime import date, timedelta
+
+from sqlalchemy import event
+
+from conftest import auth_headers, require_database
+
+require_database()
+
+from app.core.database import SessionLocal, async_engine, engine
+from app.core.metrics import request_metrics
+from app.modules.bookings import schemas, services
+
+EXPORT_ROUTE = "/api/bookings/hotel/{hotel_id}/bookings/export"
+
+def _route_queries(route: str) -> float:
+    prefix = f'http_request_db_queries_sum{{method="GET",route="{route}",status="200"}} '
+    for line in request_metrics.prometheus_lines():
+        if line.startswith(prefix):
+            return float(line[len(prefix):])
+    return 0.0
+
+def test_streamed_export_queries_are_counted(client, data):
+    manager = data.user("hotel_manager", password="manager-password")
+    hotel = data.hotel({"Standard": (2, 100, 1)}, manager_id=manager.id)
+    check_in = date.today() + timedelta(days=150)
+    with SessionLocal() as db:
+        services.create_booking(db, schemas.BookingCreate(
+            room_id=hotel.rooms["Standard"][0], check_in_date=check_in,
+            check_out_date=check_in + timedelta(days=2), number_of_guests=1
+        ), data.user().id)
+    headers = auth_headers(client, manager)
+
+    executed = []
+    def count(*args):
+        executed.append(args[2])
+    target = async_engine.sync_engine if async_engine is not None else engine
+    before = _route_queries(EXPORT_ROUTE)
+    event.listen(target, "after_cursor_execute", count)
+    try:
+        response = client.get(f"/api/bookings/hotel/{hotel.id}/bookings/export", headers=headers)
+    finally:
+        event.remove(target, "after_cursor_execute", count)
+
+    assert response.status_code == 200, response.text
+    assert len(response.text.splitlines()) == 1
+    # Выгрузка читает бронирования во время отправки тела
+    assert _route_queries(EXPORT_ROUTE) - before == len(executed)
@@ -0,0 +1,126 @@
+"""Кеш ответов: попадания, 304 по If-None-Match, инвалидация при записи и TTL"""
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+from starlette.requests import Request
+
+from conftest import auth_headers, require_database
+
+require_database()
+
+from app.core import cache
+from app.core.response_cache import MemoryCacheBackend, RedisCacheBackend, ResponseCache, response_cache
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+class FakeRedis:
+    """Подмножество команд redis-py, которое использует RedisCacheBackend"""
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.data = {}
+
+    def get(self, key):
+        value, expires_at = self.data.get(key, (None, None))
+        if expires_at is not None and expires_at <= self.clock():
+            del self.data[key]
+            return None
+        return value
+
+    def set(self, key, value, ex=None):
+        self.data[key] = (value, self.clock() + ex if ex else None)
+
+    def incr(self, key):
+        value = int(self.get(key) or 0) + 1
+        self.data[key] = (str(value).encode(), None)
+        return value
+
+def _backend(name, clock=time.monotonic):
+    if name == "memory":
+        return MemoryCacheBackend(max_entries=100)
+    return RedisCacheBackend("redis://fake", client=FakeRedis(clock))
+
+@pytest.fixture(params=["memory", "redis"])
+def backend(request):
+    return _backend(request.param)
+
+def _request(if_none_match=None) -> Request:
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+def test_hit_and_not_modified(backend):
+    responses = ResponseCache(backend, ttl=60)
+    cached, slot = responses.get("hotel:1", "detail")
+    assert cached is None
+    stored = responses.set(slot, b'{"name": "Hotel"}')
+
+    cached, _ = responses.get("hotel:1", "detail")
+    assert (cached.etag, cached.body) == (stored.etag, b'{"name": "Hotel"}')
+    response = cached.to_response(_request())
+    assert (response.status_code, response.body, response.headers["etag"]) == (200, b'{"name": "Hotel"}', stored.etag)
+    assert cached.to_response(_request(stored.etag)).status_code == 304
+    assert cached.to_response(_request(f'"other", W/{stored.etag}')).status_code == 304
+    assert cached.to_response(_request('"other"')).status_code == 200
+
+def test_invalidate_namespace(backend):
+    responses = ResponseCache(backend, ttl=60)
+    for namespace in ("hotel:1", "hotel:2"):
+        responses.set(responses.get(namespace, "detail")[1], namespace.encode())
+
+    responses.invalidate("hotel:1")
+
+    assert responses.get("hotel:1", "detail")[0] is None
+    assert responses.get("hotel:2", "detail")[0].body == b"hotel:2"
+
+@pytest.mark.parametrize("name", ["memory", "redis"])
+def test_entries_expire_after_ttl(name, monkeypatch):
+    clock = FakeClock()
+    # Часы TTLCache (memory) и фейкового Redis
+    monkeypatch.setattr(cache, "time", SimpleNamespace(monotonic=clock))
+    responses = ResponseCache(_backend(name, clock), ttl=60)
+    responses.set(responses.get("room-types", "all")[1], b"[]")
+
+    clock.now += 59
+    assert responses.get("room-types", "all")[0] is not None
+    clock.now += 2
+    assert responses.get("room-types", "all")[0] is None
+
+def test_redis_backend_requires_package(monkeypatch):
+    monkeypatch.setitem(sys.modules, "redis", None)
+    with pytest.raises(RuntimeError, match="requires the redis package"):
+        RedisCacheBackend("redis://localhost:6379/0")
+
+def test_hotel_writes_invalidate_cached_detail(client, data, backend, monkeypatch):
+    monkeypatch.setattr(response_cache, "backend", backend)
+    manager = data.user("hotel_manager", password="manager-password")
+    hotel = data.hotel({"Standard": (2, 100, 1)}, manager_id=manager.id)
+    headers = auth_headers(client, manager)
+    url = f"/api/hotels/{hotel.id}"
+
+    first = client.get(url)
+    assert first.status_code == 200, first.text
+    etag = first.headers["etag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    response = client.put(url, json={"name": "Renamed Hotel"}, headers=headers)
+    assert response.status_code == 200, response.text
+    updated = client.get(url, headers={"If-None-Match": etag})
+    assert updated.status_code == 200
+    assert updated.json()["name"] == "Renamed Hotel"
+
+    rooms = client.get(url, params={"expand": "rooms"})
+    assert rooms.json()["rooms_total"] == 1
+    response = client.post(f"{url}/rooms", headers=headers, json={
+        "room_number": "S999", "floor": 9, "room_type_id": str(hotel.room_types["Standard"])
+    })
+    assert response.status_code == 200, response.text
+    after = client.get(url, params={"expand": "rooms"}, headers={"If-None-Match": rooms.headers["etag"]})
+    assert after.status_code == 200
+    assert after.json()["rooms_total"] == 2
@@ -0,0 +1,110 @@
+"""Обновление схемы существующей базы (app.core.schema)"""
+import logging
+import uuid
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import text
+
+from conftest import auth_headers, require_database
+
+require_database()
+
+from app.core.database import SessionLocal, engine
+from app.core.schema import upgrade_schema
+from app.modules.bookings import schemas, services
+from app.modules.hotels.models import DestinationDailyPopularity, DestinationPopularity
+
+CHECK_IN = date.today() + timedelta(days=120)
+
+def _is_nullable(connection, table, column):
+    return connection.execute(text(
+        "SELECT is_nullable = 'YES' FROM information_schema.columns "
+        "WHERE table_schema = current_schema() AND table_name = :table AND column_name = :column"
+    ), {"table": table, "column": column}).scalar()
+
+def test_upgrade_restores_created_at_and_indexes(data, caplog):
+    user_id = uuid.uuid4()
+    with engine.begin() as connection:
+        # Схема базы, созданной до изменений
+        connection.execute(text("ALTER TABLE users ALTER COLUMN created_at DROP NOT NULL, ALTER COLUMN created_at DROP DEFAULT"))
+        connection.execute(text("DROP INDEX idx_bookings_room_created"))
+        connection.execute(text(
+            "INSERT INTO users (id, email, password_hash, first_name, last_name, role, created_at, updated_at) "
+            "VALUES (:id, :email, '!', 'Old', 'User', 'guest', NULL, NULL)"
+        ), {"id": user_id, "email": f"old-{user_id.hex[:12]}@example.com"})
+    data.user_ids.append(user_id)
+
+    with caplog.at_level(logging.INFO, logger="app.core.schema"):
+        upgrade_schema(engine)
+    assert "users.created_at NOT NULL" in caplog.text
+    assert "idx_bookings_room_created" in caplog.text
+
+    with engine.connect() as connection:
+        assert _is_nullable(connection, "users", "created_at") is False
+        assert connection.execute(text("SELECT created_at FROM users WHERE id = :id"), {"id": user_id}).scalar() is not None
+        assert connection.execute(text("SELECT to_regclass('idx_bookings_room_created')")).scalar() is not None
+
+def test_upgrade_adds_token_version(caplog):
+    with engine.begin() as connection:
+        connection.execute(text("ALTER TABLE users DROP COLUMN token_version"))
+
+    with caplog.at_level(logging.INFO, logger="app.core.schema"):
+        upgrade_schema(engine)
+    assert "users.token_version" in caplog.text
+
+    with engine.connect() as connection:
+        assert _is_nullable(connection, "users", "token_version") is False
+        assert connection.execute(text("SELECT count(*) FROM users WHERE token_version <> 0")).scalar() == 0
+
+def _book(guest, room_id):
+    with SessionLocal() as db:
+        return services.create_booking(db, schemas.BookingCreate(
+            room_id=room_id, check_in_date=CHECK_IN, check_out_date=CHECK_IN + timedelta(days=3), number_of_guests=1
+        ), guest.id).id
+
+def test_upgrade_backfills_occupancy_of_existing_bookings(client, data, caplog):
+    hotel = data.hotel({"Standard": (2, 100, 1)})
+    guest = data.user(password="guest-password")
+    room_id = hotel.rooms["Standard"][0]
+    _book(guest, room_id)
+    with engine.begin() as connection:
+        # Бронирования базы, созданной до индекса занятости
+        connection.execute(text("DELETE FROM room_nights"))
+
+    with caplog.at_level(logging.INFO, logger="app.core.schema"):
+        upgrade_schema(engine)
+    assert "backfill room_nights" in caplog.text
+
+    response = client.post("/api/bookings/", headers=auth_headers(client, guest), json={
+        "room_id": str(room_id),
+        "check_in_date": (CHECK_IN + timedelta(days=1)).isoformat(),
+        "check_out_date": (CHECK_IN + timedelta(days=4)).isoformat(),
+        "number_of_guests": 1
+    })
+    assert response.status_code == 409, response.text
+
+def test_upgrade_seeds_destination_popularity(data, caplog):
+    hotel = data.hotel({"Standard": (2, 100, 1)})
+    guest = data.user()
+    booking_id = _book(guest, hotel.rooms["Standard"][0])
+    with SessionLocal() as db:
+        services.update_booking_status(db, booking_id, "confirmed")
+    with engine.begin() as connection:
+        # Бронирования базы, созданной до счетчиков популярности
+        connection.execute(text("DELETE FROM destination_daily_popularity"))
+        connection.execute(text("DELETE FROM destination_popularity"))
+
+    with caplog.at_level(logging.INFO, logger="app.core.schema"):
+        upgrade_schema(engine)
+    assert "backfill destination_popularity" in caplog.text
+
+    key = {"city": hotel.city, "country": "Testland"}
+    with SessionLocal() as db:
+        assert db.get(DestinationPopularity, key).booking_count == 1
+        assert db.get(DestinationDailyPopularity, {**key, "day": datetime.utcnow().date()}).booking_count == 1
+
+def test_upgrade_of_current_schema_does_nothing(caplog):
+    upgrade_schema(engine)
+    with caplog.at_level(logging.INFO, logger="app.core.schema"):
+        upgrade_schema(engine)
+    assert "Upgrading schema" not in caplog.text
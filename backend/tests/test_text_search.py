@@ -0,0 +1,47 @@
+"""Поиск с опечатками и автодополнение направлений на pg_trgm"""
+import logging
+
+import pytest
+from sqlalchemy import text
+
+from conftest import require_database
+
+require_database()
+
+from app.core.database import engine
+from app.core.schema import upgrade_schema
+from app.modules.hotels import schemas, services
+
+with engine.connect() as _connection:
+    if not _connection.execute(text("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')")).scalar():
+        pytest.skip("pg_trgm is not installed", allow_module_level=True)
+
+def test_search_finds_hotel_by_misspelled_name(data, db):
+    hotel = data.hotel({"Standard": (2, 100, 1)}, name="Zanzibarova Palace")
+    data.hotel({"Standard": (2, 100, 1)}, name="Quillmoor Lodge")
+
+    results = services.search_hotels(db, schemas.SearchFilters(q="Zanzibrova"))
+
+    assert [result["id"] for result in results if result["name"].endswith(("Palace", "Lodge"))] == [hotel.id]
+
+def test_autocomplete_suggests_misspelled_city(data, db):
+    hotel = data.hotel({"Standard": (2, 100, 1)})
+    # "Testville 1a2b3c4d" -> "Testvile 1a2b3c4d"
+    misspelled = hotel.city.replace("Testville", "Testvile")
+
+    suggestions = services.autocomplete_destinations(db, misspelled, limit=50)
+
+    assert {"city": hotel.city, "country": "Testland"} in [
+        {"city": row["city"], "country": row["country"]} for row in suggestions
+    ]
+
+def test_upgrade_restores_trigram_index(caplog):
+    with engine.begin() as connection:
+        connection.execute(text("DROP INDEX idx_hotels_name_trgm"))
+
+    with caplog.at_level(logging.INFO, logger="app.core.schema"):
+        upgrade_schema(engine)
+
+    assert "idx_hotels_name_trgm" in caplog.text
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT to_regclass('idx_hotels_name_trgm')")).scalar() is not None
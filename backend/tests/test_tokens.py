@@ -0,0 +1,51 @@
+"""Удаление просроченных refresh-токенов: при обмене и периодической очисткой"""
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from conftest import require_database
+
+require_database()
+
+from app.core.database import SessionLocal
+from app.modules.auth import services, tokens
+from app.modules.auth.models import RefreshToken, User
+
+def _expired_token(db, user_id):
+    _, row = tokens.new_refresh_token(user_id)
+    row["expires_at"] = datetime.utcnow() - timedelta(days=1)
+    db.execute(tokens.insert_refresh_token_statement(row))
+    db.commit()
+    return row["id"]
+
+def _token_ids(db, user_id):
+    return set(db.execute(select(RefreshToken.id).where(RefreshToken.user_id == user_id)).scalars())
+
+def test_rotation_deletes_expired_tokens(data):
+    user = data.user()
+    with SessionLocal() as db:
+        issued = services.issue_tokens(db, db.get(User, user.id))
+        expired_id = _expired_token(db, user.id)
+
+        services.rotate_refresh_token(db, issued["refresh_token"])
+
+        remaining = _token_ids(db, user.id)
+    assert expired_id not in remaining
+    assert len(remaining) == 2  # Обмененный токен и новый
+
+def test_purge_deletes_expired_tokens_of_all_users(data, capsys):
+    first, second = data.user(), data.user()
+    with SessionLocal() as db:
+        services.issue_tokens(db, db.get(User, first.id))
+        active = _token_ids(db, first.id)
+        for user in (first, second):
+            _expired_token(db, user.id)
+
+    assert tokens.main(["purge"]) == 0
+    assert "Expired refresh tokens purged" in capsys.readouterr().out
+
+    with SessionLocal() as db:
+        assert _token_ids(db, first.id) == active
+        assert _token_ids(db, second.id) == set()
+        expired = db.execute(select(func.count()).where(RefreshToken.expires_at <= datetime.utcnow())).scalar()
+    assert expired == 0
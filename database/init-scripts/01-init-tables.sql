@@ -1,3 +1,5 @@
+-- Расширения: триграммный поиск отелей
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
 -- Создание enum типов
 CREATE TYPE user_role AS ENUM ('guest', 'hotel_manager', 'admin');
 CREATE TYPE booking_status AS ENUM ('pending', 'confirmed', 'cancelled', 'completed');
@@ -12,9 +14,20 @@ CREATE TABLE users (
   phone VARCHAR(20),
   role user_role NOT NULL DEFAULT 'guest',
   is_active BOOLEAN NOT NULL DEFAULT TRUE,
-  created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+  token_version INTEGER NOT NULL DEFAULT 0,
+  created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
   updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
+-- Refresh-токены: sha256 секрета, цепочка ротаций (family_id) и отметка об обмене
+CREATE TABLE refresh_tokens (
+  id UUID PRIMARY KEY,
+  user_id UUID NOT NULL,
+  family_id UUID NOT NULL,
+  token_hash BYTEA NOT NULL,
+  expires_at TIMESTAMP NOT NULL,
+  used_at TIMESTAMP,
+  FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
 -- Таблица отелей
 CREATE TABLE hotels (
   id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -35,7 +48,7 @@ CREATE TABLE hotels (
   images JSONB DEFAULT '[]',
   manager_id UUID NOT NULL,
   is_active BOOLEAN NOT NULL DEFAULT TRUE,
-  created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+  created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
   updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
   -- Добавляем
   FOREIGN KEY (manager_id) REFERENCES users(id) ON DELETE RESTRICT
@@ -50,7 +63,7 @@ CREATE TABLE room_types (
   amenities JSONB DEFAULT '[]',
   size_sqm INTEGER CHECK (size_sqm > 0),
   bed_type VARCHAR(50),
-  created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+  created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
   updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP -- Добавляем
 );
 -- Таблица номеров
@@ -62,7 +75,7 @@ CREATE TABLE rooms (
   images JSONB DEFAULT '[]',
   hotel_id UUID NOT NULL,
   room_type_id UUID NOT NULL,
-  created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+  created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
   updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
   -- Добавляем
   FOREIGN KEY (hotel_id) REFERENCES hotels(id) ON DELETE CASCADE,
@@ -79,7 +92,7 @@ CREATE TABLE bookings (
   special_requests TEXT,
   guest_id UUID NOT NULL,
   room_id UUID NOT NULL,
-  created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+  created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
   updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
   cancelled_at TIMESTAMP WITH TIME ZONE,
   FOREIGN KEY (guest_id) REFERENCES users(id) ON DELETE RESTRICT,
@@ -87,6 +100,29 @@ CREATE TABLE bookings (
   -- Проверка, что дата выезда после даты заезда
   CONSTRAINT valid_dates_check CHECK (check_out_date > check_in_date)
 );
+-- Индекс занятости: одна строка на каждую ночь активного бронирования номера
+CREATE TABLE room_nights (
+  room_id UUID NOT NULL,
+  night DATE NOT NULL,
+  booking_id UUID NOT NULL,
+  PRIMARY KEY (room_id, night),
+  FOREIGN KEY (room_id) REFERENCES rooms(id) ON DELETE CASCADE,
+  FOREIGN KEY (booking_id) REFERENCES bookings(id) ON DELETE CASCADE
+);
+-- Счетчики подтвержденных бронирований по направлениям (за все время и по дням)
+CREATE TABLE destination_popularity (
+  city VARCHAR(100) NOT NULL,
+  country VARCHAR(100) NOT NULL,
+  booking_count INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (city, country)
+);
+CREATE TABLE destination_daily_popularity (
+  city VARCHAR(100) NOT NULL,
+  country VARCHAR(100) NOT NULL,
+  day DATE NOT NULL,
+  booking_count INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (city, country, day)
+);
 -- Таблица ценообразования
 CREATE TABLE pricing (
   id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -94,7 +130,7 @@ CREATE TABLE pricing (
   price DECIMAL(10, 2) NOT NULL CHECK (price >= 0),
   is_available BOOLEAN NOT NULL DEFAULT TRUE,
   room_type_id UUID NOT NULL,
-  created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+  created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
   updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
   -- Добавляем
   FOREIGN KEY (room_type_id) REFERENCES room_types(id) ON DELETE CASCADE,
@@ -109,7 +145,7 @@ CREATE TABLE payments (
   transaction_id VARCHAR(255),
   payment_date TIMESTAMP WITH TIME ZONE,
   booking_id UUID NOT NULL,
-  created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+  created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
   updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
   FOREIGN KEY (booking_id) REFERENCES bookings(id) ON DELETE RESTRICT
 );
@@ -146,11 +182,23 @@ CREATE TABLE reviews (
 -- Индексы для пользователей
 CREATE INDEX idx_users_email ON users(email);
 CREATE INDEX idx_users_role ON users(role);
+-- Для постраничной выдачи по (created_at, id)
+CREATE INDEX idx_users_created ON users(created_at, id);
 -- Индексы для отелей
 CREATE INDEX idx_hotels_city ON hotels(city);
 CREATE INDEX idx_hotels_country ON hotels(country);
 CREATE INDEX idx_hotels_manager ON hotels(manager_id);
 CREATE INDEX idx_hotels_location ON hotels(latitude, longitude);
+-- Поиск рядом с точкой: отбор по прямоугольнику point(longitude, latitude) <@ box(...)
+CREATE INDEX idx_hotels_location_gist ON hotels USING gist (point(longitude, latitude));
+-- Триграммные индексы: ILIKE '%...%' и поиск с опечатками по названию, городу, стране и описанию
+CREATE INDEX idx_hotels_name_trgm ON hotels USING gin (name gin_trgm_ops);
+CREATE INDEX idx_hotels_city_trgm ON hotels USING gin (city gin_trgm_ops);
+CREATE INDEX idx_hotels_country_trgm ON hotels USING gin (country gin_trgm_ops);
+CREATE INDEX idx_hotels_description_trgm ON hotels USING gin (description gin_trgm_ops);
+-- Фильтр удобств @> (jsonb_path_ops: компактнее, поддерживает только @>)
+CREATE INDEX idx_hotels_amenities ON hotels USING gin (amenities jsonb_path_ops);
+CREATE INDEX idx_room_types_amenities ON room_types USING gin (amenities jsonb_path_ops);
 -- Индексы для номеров
 CREATE INDEX idx_rooms_hotel ON rooms(hotel_id);
 CREATE INDEX idx_rooms_room_type ON rooms(room_type_id);
@@ -161,6 +209,15 @@ CREATE INDEX idx_bookings_guest ON bookings(guest_id);
 CREATE INDEX idx_bookings_room ON bookings(room_id);
 CREATE INDEX idx_bookings_dates ON bookings(check_in_date, check_out_date);
 CREATE INDEX idx_bookings_status ON bookings(status);
+-- Для постраничной выдачи по (created_at, id) у гостя и по номерам отеля
+CREATE INDEX idx_bookings_guest_created ON bookings(guest_id, created_at, id);
+CREATE INDEX idx_bookings_room_created ON bookings(room_id, created_at, id);
+-- Индексы для refresh-токенов
+CREATE INDEX idx_refresh_tokens_user ON refresh_tokens(user_id);
+CREATE INDEX idx_refresh_tokens_family ON refresh_tokens(family_id);
+-- Индексы для занятости номеров
+CREATE INDEX idx_room_nights_booking ON room_nights(booking_id);
+CREATE INDEX idx_destination_daily_popularity_day ON destination_daily_popularity(day);
 -- Индексы для ценообразования
 CREATE INDEX idx_pricing_date ON pricing(date);
 CREATE INDEX idx_pricing_room_type ON pricing(room_type_id);
@@ -156,6 +156,33 @@ WHERE email = 'guest@example.com'
     FROM bookings
     WHERE id = 'aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa'
   );
+-- Заполняем индекс занятости для активных бронирований
+INSERT INTO room_nights (room_id, night, booking_id)
+SELECT room_id,
+  generate_series(check_in_date, check_out_date - 1, interval '1 day')::date,
+  id
+FROM bookings
+WHERE status IN ('pending', 'confirmed') ON CONFLICT DO NOTHING;
+-- Заполняем счетчики популярности направлений
+INSERT INTO destination_daily_popularity (city, country, day, booking_count)
+SELECT h.city,
+  h.country,
+  b.created_at::date,
+  count(*)
+FROM bookings b
+  JOIN rooms r ON r.id = b.room_id
+  JOIN hotels h ON h.id = r.hotel_id
+WHERE b.status IN ('confirmed', 'completed')
+GROUP BY h.city,
+  h.country,
+  b.created_at::date ON CONFLICT DO NOTHING;
+INSERT INTO destination_popularity (city, country, booking_count)
+SELECT city,
+  country,
+  sum(booking_count)
+FROM destination_daily_popularity
+GROUP BY city,
+  country ON CONFLICT DO NOTHING;
 -- Пример платежа
 INSERT INTO payments (
     id,